@@ -2,6 +2,7 @@
 
 このモジュールはメインメニューの画面やボタンを表示するメソッドやサブフローメニューの画面の表示、操作を行えるメソッドなどがあります。
 """
+import asyncio
 import datetime
 import json
 import os
@@ -397,7 +398,7 @@ class MainMenu(TaskLog):
         self.project_id_input.value = ''
         self.apply_govsheet_button.set_looks_processing()
         try:
-            token = utils.get_token()
+            token = await asyncio.to_thread(utils.get_token)
             project_id = utils.get_project_id()
 
             if project_id is None and token is None:
@@ -410,8 +411,11 @@ class MainMenu(TaskLog):
                 self.project_id_input.visible = True
                 self.token = token
             else:
-                if utils.check_grdm_token(self.grdm_url, token):
-                    if utils.check_grdm_access(self.grdm_url, token, project_id):
+                is_valid_token, has_access = await utils.check_grdm_token_and_access(
+                    self.grdm_url, token, project_id
+                )
+                if is_valid_token:
+                    if has_access:
                         self.token = token
                         self.project_id = project_id
                         await self.operation_file()
@@ -501,9 +505,12 @@ class MainMenu(TaskLog):
             vault = Vault()
             if self.token_input.value_input and self.project_id_input.value_input:
                 self.tmp_project_id = self.project_id_input.value_input
-                if utils.check_grdm_token(self.grdm_url, self.token_input.value_input):
+                is_valid_token, has_access = await utils.check_grdm_token_and_access(
+                    self.grdm_url, self.token_input.value_input, self.tmp_project_id
+                )
+                if is_valid_token:
                     vault.set_value('grdm_token', self.token_input.value_input)
-                    if utils.check_grdm_access(self.grdm_url, self.token_input.value_input, self.tmp_project_id):
+                    if has_access:
                         self.token = self.token_input.value_input
                         self.project_id = self.tmp_project_id
                         self.token_input.visible = False
@@ -518,9 +525,12 @@ class MainMenu(TaskLog):
                     self.display_input_box()
                     return
             elif self.token_input.value_input:
-                if utils.check_grdm_token(self.grdm_url, self.token_input.value_input):
+                is_valid_token, has_access = await utils.check_grdm_token_and_access(
+                    self.grdm_url, self.token_input.value_input, self.tmp_project_id
+                )
+                if is_valid_token:
                     vault.set_value('grdm_token', self.token_input.value_input)
-                    if utils.check_grdm_access(self.grdm_url, self.token_input.value_input, self.tmp_project_id):
+                    if has_access:
                         self.token = self.token_input.value_input
                         self.project_id = self.tmp_project_id
                         await self.operation_file()
@@ -534,7 +544,7 @@ class MainMenu(TaskLog):
                     return
             else:
                 self.tmp_project_id = self.project_id_input.value_input
-                if utils.check_grdm_access(self.grdm_url, self.token, self.tmp_project_id):
+                if await utils.check_grdm_access_async(self.grdm_url, self.token, self.tmp_project_id):
                     self.project_id = self.tmp_project_id
                     await self.operation_file()
                 else:
@@ -631,8 +641,9 @@ class MainMenu(TaskLog):
         self.research_flow_message.update_info(msg_config.get('save', 'doing'))
         try:
             sync_path_list = utils.get_sync_path(self.abs_root)
-            for sync_path in sync_path_list:
-                await self.grdm.sync(self.token, self.grdm_url, self.project_id, sync_path, self.abs_root)
+            await self.grdm.sync_all(
+                self.token, self.grdm_url, self.project_id, sync_path_list, self.abs_root
+            )
         except UnauthorizedError:
             message = msg_config.get('form', 'token_unauthorized')
             self.research_flow_message.update_warning(message)
@@ -674,7 +685,9 @@ class MainMenu(TaskLog):
             schema = utils.get_schema()
             data = utils.get_default_govsheet(schema)
             govsheet_file.write(data)
-            self.grdm.sync(self.token, self.grdm_url, self.project_id, govsheet_path, self.abs_root)
+            await self.grdm.sync(
+                self.token, self.grdm_url, self.project_id, govsheet_path, self.abs_root
+            )
         except UnauthorizedError:
             message = msg_config.get('form', 'token_unauthorized')
             self.research_flow_message.update_warning(message)
@@ -707,8 +720,9 @@ class MainMenu(TaskLog):
         self.research_flow_message.update_info(msg_config.get('save', 'doing'))
         try:
             sync_path_list = utils.get_sync_path(self.abs_root)
-            for sync_path in sync_path_list:
-                await self.grdm.sync(self.token, self.grdm_url, self.project_id, sync_path, self.abs_root)
+            await self.grdm.sync_all(
+                self.token, self.grdm_url, self.project_id, sync_path_list, self.abs_root
+            )
         except UnauthorizedError:
             message = msg_config.get('form', 'token_unauthorized')
             self.research_flow_message.update_warning(message)
@@ -192,7 +192,9 @@ class CreateSubflowForm(BaseSubflowForm):
             schema = utils.get_schema()
             data = utils.get_default_govsheet(schema)
             govsheet_file.write(data)
-            self.grdm.sync(self.token, self.grdm_url, self.project_id, govsheet_path, self.abs_root)
+            await self.grdm.sync(
+                self.token, self.grdm_url, self.project_id, govsheet_path, self.abs_root
+            )
         except UnauthorizedError:
             message = msg_config.get('form', 'token_unauthorized')
             self._err_output.update_warning(message)
@@ -231,8 +233,9 @@ class CreateSubflowForm(BaseSubflowForm):
         self._err_output.update_info(msg_config.get('save', 'doing'))
         try:
             sync_path_list = utils.get_sync_path(self.abs_root)
-            for sync_path in sync_path_list:
-                await self.grdm.sync(self.token, self.grdm_url, self.project_id, sync_path, self.abs_root)
+            await self.grdm.sync_all(
+                self.token, self.grdm_url, self.project_id, sync_path_list, self.abs_root
+            )
         except UnauthorizedError:
             message = msg_config.get('form', 'token_unauthorized')
             self._err_output.update_warning(message)
@@ -422,9 +425,12 @@ class CreateSubflowForm(BaseSubflowForm):
             vault = Vault()
             if self.token_input.visible and self.project_id_input.visible:
                 self.tmp_project_id = project_id
-                if utils.check_grdm_token(self.grdm_url, token):
+                is_valid_token, has_access = await utils.check_grdm_token_and_access(
+                    self.grdm_url, token, self.tmp_project_id
+                )
+                if is_valid_token:
                     vault.set_value('grdm_token', token)
-                    if utils.check_grdm_access(self.grdm_url, token, self.tmp_project_id):
+                    if has_access:
                         self.token = token
                         self.project_id = self.tmp_project_id
                     else:
@@ -436,9 +442,12 @@ class CreateSubflowForm(BaseSubflowForm):
                     self.change_submit_button_warning(msg_config.get('main_menu', 're_enter_token'))
                     return
             elif self.token_input.visible:
-                if utils.check_grdm_token(self.grdm_url, token):
+                is_valid_token, has_access = await utils.check_grdm_token_and_access(
+                    self.grdm_url, token, self.tmp_project_id
+                )
+                if is_valid_token:
                     vault.set_value('grdm_token', token)
-                    if utils.check_grdm_access(self.grdm_url, token, self.tmp_project_id):
+                    if has_access:
                         self.token = token
                         self.project_id = self.tmp_project_id
                     else:
@@ -451,7 +460,7 @@ class CreateSubflowForm(BaseSubflowForm):
                     return
             elif self.project_id_input.visible:
                 self.tmp_project_id = project_id
-                if utils.check_grdm_access(self.grdm_url, self.token, self.tmp_project_id):
+                if await utils.check_grdm_access_async(self.grdm_url, self.token, self.tmp_project_id):
                     self.project_id = self.tmp_project_id
                 else:
                     self.reset_form()
@@ -526,8 +535,9 @@ class CreateSubflowForm(BaseSubflowForm):
         self._err_output.update_info(msg_config.get('save', 'doing'))
         try:
             sync_path_list = utils.get_sync_path(self.abs_root)
-            for sync_path in sync_path_list:
-                await self.grdm.sync(self.token, self.grdm_url, self.project_id, sync_path, self.abs_root)
+            await self.grdm.sync_all(
+                self.token, self.grdm_url, self.project_id, sync_path_list, self.abs_root
+            )
         except UnauthorizedError:
             message = msg_config.get('form', 'token_unauthorized')
             self._err_output.update_warning(message)
@@ -3,6 +3,7 @@
 このモジュールはガバナンスシートを適用するのに必要になる入力欄の設定、値の確認、
 ガバナンスシートを適用した後のファイル操作を行う関数があります。
 """
+import asyncio
 import datetime
 import json
 import os
@@ -365,6 +366,55 @@ def check_grdm_token(base_url: str, token: str) -> bool:
     return grdm_connect.check_authorization(base_url, token)
 
 
+async def check_grdm_access_async(base_url: str, token: str, project_id: str) -> bool:
+    """アクセス権限のチェックをイベントループを止めずに行う関数です。
+
+    Args:
+        base_url (str): GRDMのURL
+        token (str): パーソナルアクセストークン
+        project_id (str): プロジェクトID
+
+    Returns:
+        bool: 問題が無ければTrue、問題があればFalseを返す。
+    """
+    grdm_connect = grdm.Grdm()
+    return await grdm_connect.check_permission_async(base_url, token, project_id)
+
+
+async def check_grdm_token_and_access(base_url: str, token: str, project_id: str) -> tuple[bool, bool]:
+    """パーソナルアクセストークンとアクセス権限のチェックを並行して行う関数です。
+
+    アクセス権限のチェックはトークンのチェック結果を待たずに送信するため、トークンに問題がある場合でもリクエストは送信されます。
+    その場合、アクセス権限のチェック結果(エラーを含む)は用いず、(False, False)を返します。
+
+    Args:
+        base_url (str): GRDMのURL
+        token (str): パーソナルアクセストークン
+        project_id (str): プロジェクトID
+
+    Returns:
+        tuple[bool, bool]: (トークンのチェック結果, アクセス権限のチェック結果)を返す。
+
+    Raises:
+        UnauthorizedError: 認証が通らない
+        ProjectNotExist: 指定されたプロジェクトIDが存在しない
+        requests.exceptions.RequestException: その他の通信エラー
+    """
+    grdm_connect = grdm.Grdm()
+    token_result, access_result = await asyncio.gather(
+        grdm_connect.check_authorization_async(base_url, token),
+        grdm_connect.check_permission_async(base_url, token, project_id),
+        return_exceptions=True
+    )
+    if isinstance(token_result, BaseException):
+        raise token_result
+    if not token_result:
+        return False, False
+    if isinstance(access_result, BaseException):
+        raise access_result
+    return True, access_result
+
+
 def backup_zipfile(abs_root: str, research_flow_dict: dict, current_time: str):
     """サブフローのファイル群をzip化する関数です。
 
@@ -1,7 +1,10 @@
 """ サブフローを管理するモジュールです。"""
+import hashlib
 from itertools import chain, zip_longest
+import json
 import os
 from pathlib import Path
+from typing import Optional
 
 from nbformat import NO_CONVERT, read
 
@@ -12,6 +15,38 @@ from library.main_menu.subflow_controller import utils
 from .diag import DiagManager
 
 
+def read_notebook_title(nb_path: str) -> str:
+    """ ノートブックの最初の見出しからタスクタイトルを取得する関数です。
+
+    Args:
+        nb_path (str): ノートブックのパス
+
+    Returns:
+        str: タスクのタイトル
+
+    """
+    nb = read(nb_path, as_version=NO_CONVERT)
+    lines = [
+        line.strip()
+        for line in chain.from_iterable(
+            cell['source'].split('\n')
+            for cell in nb.cells
+            if cell['cell_type'] == 'markdown'
+        )
+        if len(line.strip()) > 0 and not line.startswith('---')
+    ]
+    # h1, h2 の行とその次行の最初の１文を取り出す
+    headers = [
+        (' '.join(line0.split()[1:]),
+            line1.split("。")[0] if line1 is not None else '')
+        for (line0, line1) in zip_longest(lines, lines[1:])
+        if line0.startswith('# ') or line0.startswith('## ')
+    ]
+
+    return headers[0][0] if not headers[0][0].startswith(
+        'About:') else headers[0][0][6:]
+
+
 class SubFlowManager:
     """ サブフローを管理するクラスです。
 
@@ -21,6 +56,9 @@ class SubFlowManager:
             tasks(list[SubflowTask]): サブフローのタスクの設定値
             order(dict): サブフローのタスクの順序情報
             task_dir(str): タスクが格納されているディレクトリ
+            _nb_paths(Optional[list[Path]]): タスクディレクトリ配下のノートブックのパス
+            _header_index(Optional[dict]): ノートブックの相対パスをキーとした更新日時とタイトルの辞書
+            _header_index_updated(bool): 索引ファイルを読み込んでから索引を更新したかどうか
 
     """
 
@@ -37,6 +75,9 @@ class SubFlowManager:
         self.tasks = SubflowStatusFile(status_file).read().tasks
         self.order = SubflowStatusFile(status_file).read().order
         self.task_dir = using_task_dir
+        self._nb_paths = None
+        self._header_index = None
+        self._header_index_updated = False
 
     def setup_tasks(self, souce_task_dir: str):
         """ タスクの原本があるディレクトリからタスクファイルをコピーするメソッドです。
@@ -50,14 +91,47 @@ class SubFlowManager:
                 if task.active:
                     utils._copy_file_by_name(task.name, souce_task_dir, self.task_dir)
 
+    @property
+    def diagram_cache_path(self) -> str:
+        """ ダイアグラムのキャッシュファイルのパスを返すプロパティです。
+
+        同期対象外の作業フォルダにあるサブフローのディレクトリに保存します。
+        """
+        return os.path.join(os.path.dirname(self.task_dir), path_config.DIAGRAM_CACHE)
+
+    def _build_diagram_key(self, node_config: dict) -> str:
+        """ ダイアグラムの内容を決める値からキャッシュのキーを作成するメソッドです。
+
+        Args:
+            node_config(dict): ダイアグラムのノード設定用の辞書
+
+        Returns:
+            str: タスクの状態、順序情報、ノードの設定とダイアグラムの見た目の設定のハッシュ値を返す。
+
+        """
+        content = {
+            'current_dir': self.current_dir,
+            'tasks': [task.to_dict() for task in self.tasks],
+            'order': self.order,
+            'node_config': node_config,
+            'style': [
+                DiagManager.rank_sep, DiagManager.node_attr,
+                DiagManager.left_group_status, DiagManager.unfeasible_status
+            ],
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+
     def generate(self) -> str:
         """ ダイアグラムを生成するメソッドです。
 
+        タスクの状態、順序情報、ノードの設定が前回から変わっていない場合は、
+        Graphvizを実行せずにキャッシュしたダイアグラムを返します。
+        タスクタイトルの索引は、全てのタイトルを取得した後に更新があった場合のみ1度書き込みます。
+
         Returns:
             str: svg形式で書かれたダイアグラムデータの文字列
 
         """
-        diag = DiagManager()
         node_config = {}
         for task in self.tasks:
             if task.active:
@@ -66,13 +140,27 @@ class SubFlowManager:
                     'path': nb_path,
                     'text': title
                 }
+        if self._header_index_updated:
+            self._save_header_index()
+
+        key = self._build_diagram_key(node_config)
+        cache = file.load_cache_file(self.diagram_cache_path)
+        if cache.get('key') == key and isinstance(cache.get('svg'), str):
+            return cache['svg']
+
+        diag = DiagManager()
         svg_data = diag.generate_diagram(self.current_dir, self.tasks, node_config, self.order)
+        file.save_cache_file(self.diagram_cache_path, {'key': key, 'svg': svg_data})
 
         return svg_data
 
     def parse_headers(self, task_name: str) -> tuple[str, str]:
         """ タスクタイトルとパスを取得するメソッドです。
 
+        ノートブックの一覧は最初の呼び出しで1度だけ取得し、タイトルは更新日時で無効化する索引ファイルから取得します。
+        索引に無いか更新されたノートブックのみを読み込みます。
+        更新した索引はメモリ上に保持し、generateで全てのタイトルを取得した後に索引ファイルへ書き込みます。
+
         Args:
             task_name (str): 対象とするタスクの名前
             node_config(dict): ノードに設定する情報の辞書
@@ -82,27 +170,60 @@ class SubFlowManager:
             str: タスク実行時に遷移するノートブックのパス
 
         """
-        nb_dir = Path(self.task_dir)
-        for nb_path in nb_dir.glob("**/*.ipynb"):
-            nb = read(str(nb_path), as_version=NO_CONVERT)
-            lines = [
-                line.strip()
-                for line in chain.from_iterable(
-                    cell['source'].split('\n')
-                    for cell in nb.cells
-                    if cell['cell_type'] == 'markdown'
-                )
-                if len(line.strip()) > 0 and not line.startswith('---')
-            ]
-            # h1, h2 の行とその次行の最初の１文を取り出す
-            headers = [
-                (' '.join(line0.split()[1:]),
-                    line1.split("。")[0] if line1 is not None else '')
-                for (line0, line1) in zip_longest(lines, lines[1:])
-                if line0.startswith('# ') or line0.startswith('## ')
-            ]
-
-            title = headers[0][0] if not headers[0][0].startswith(
-                'About:') else headers[0][0][6:]
+        if self._nb_paths is None:
+            self._nb_paths = list(Path(self.task_dir).glob("**/*.ipynb"))
+            self._header_index = self._load_header_index()
+
+        for nb_path in self._nb_paths:
             if task_name in str(nb_path):
-                return title, str(nb_path)
+                return self._get_title(nb_path), str(nb_path)
+
+    @property
+    def header_index_path(self) -> str:
+        """ タスクタイトルの索引ファイルのパスを返すプロパティです。"""
+        return os.path.join(self.task_dir, path_config.TASK_HEADER_INDEX)
+
+    def _load_header_index(self) -> dict:
+        """ タスクタイトルの索引ファイルを読み込むメソッドです。
+
+        Returns:
+            dict: ノートブックの相対パスをキーとした更新日時とタイトルの辞書を返す。
+
+        """
+        return file.load_cache_file(self.header_index_path)
+
+    def _save_header_index(self) -> None:
+        """ タスクタイトルの索引ファイルを書き込むメソッドです。
+
+        存在しなくなったノートブックの情報は取り除きます。
+
+        """
+        self._header_index_updated = False
+        rel_paths = {os.path.relpath(nb_path, self.task_dir) for nb_path in self._nb_paths}
+        header_index = {
+            rel_path: entry for rel_path, entry in self._header_index.items() if rel_path in rel_paths
+        }
+        file.save_cache_file(self.header_index_path, header_index)
+
+    def _get_title(self, nb_path: Path) -> str:
+        """ 索引を用いてノートブックのタスクタイトルを取得するメソッドです。
+
+        ノートブックの更新日時が索引と一致する場合はノートブックを読み込みません。
+
+        Args:
+            nb_path (Path): ノートブックのパス
+
+        Returns:
+            str: タスクのタイトル
+
+        """
+        rel_path = os.path.relpath(nb_path, self.task_dir)
+        mtime = os.stat(nb_path).st_mtime_ns
+        entry = self._header_index.get(rel_path)
+        if entry is not None and entry.get('mtime') == mtime:
+            return entry['title']
+
+        title = read_notebook_title(str(nb_path))
+        self._header_index[rel_path] = {'mtime': mtime, 'title': title}
+        self._header_index_updated = True
+        return title
@@ -4,6 +4,7 @@
 """
 from __future__ import annotations
 import configparser
+import threading
 
 class ConfigParserBase:
     """ 設定ファイルを保持するシングルトンクラスです。
@@ -11,20 +12,28 @@ class ConfigParserBase:
     Args:
         class:
             _instance (ConfigParserBase): シングルトンインスタンスを格納する
+            _lock (threading.Lock): 複数のスレッドから同時に初期化されることを防ぐロック
         instance:
             _config_file (ConfigParser): 設定ファイルの情報を保持するインスタンス
     """
     _instance = None
+    _lock = threading.Lock()
 
     def __new__(cls, *args, **kwargs) -> ConfigParserBase:
         """ 新しいインスタンス作成時に既存のインスタンスを返すメソッドです。
 
+        設定ファイルを読み込み終えてからインスタンスを公開するため、
+        他のスレッドが読み込み途中のインスタンスを参照することはありません。
+
         Returns:
             ConfigParserBase: このクラスのシングルトンインスタンスを返す。
         """
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.initialize(*args, **kwargs)
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance.initialize(*args, **kwargs)
+                    cls._instance = instance
         return cls._instance
 
     def initialize(self, config_path: str, encoding: str = 'utf-8'):
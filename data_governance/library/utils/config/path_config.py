@@ -115,6 +115,8 @@ MENU_NOTEBOOK = 'menu.ipynb'
 STATUS_JSON = 'status.json'
 PLAN_JSON = 'plan.json'
 FLOW_DIAG = 'flow.diag'
+TASK_HEADER_INDEX = 'task_header_index.json'
+DIAGRAM_CACHE = 'diagram_cache.json'
 ## config file
 TOKEN = 'token.json'
 USER_INFO = 'user_info.json'
@@ -128,6 +130,18 @@ SETUP_COMPLETED_TEXT_PATH = os.path.join(DG_WORKING_FOLDER, 'setup_completed.txt
 ## config file
 TOKEN_JSON_PAHT = os.path.join(DG_WORKING_FOLDER, TOKEN)
 USER_INFO_PATH = os.path.join(DG_WORKING_FOLDER, USER_INFO)
+## GRDMへの同期済みファイルのマニフェスト
+GRDM_SYNC_MANIFEST_PATH = os.path.join(DG_WORKING_FOLDER, 'grdm_sync_manifest.json')
+## GRDMの権限チェック結果のキャッシュ
+GRDM_AUTH_CACHE_PATH = os.path.join(DG_WORKING_FOLDER, 'grdm_auth_cache.json')
+## GRDMのメタデータのスキーマのキャッシュ
+GRDM_SCHEMA_CACHE_FOLDER = os.path.join(DG_WORKING_FOLDER, 'grdm_schema_cache')
+## GRDMへ同期するアーカイブの作業フォルダ
+GRDM_BUNDLE_FOLDER = os.path.join(DG_WORKING_FOLDER, 'grdm_bundle')
+## リサーチフローイメージのキャッシュ
+RESEARCH_FLOW_DIAGRAM_CACHE_PATH = os.path.join(DG_WORKING_FOLDER, 'research_flow_diagram_cache.json')
+## AWS S3からミラーリングしたファイルのマニフェスト
+S3_MIRROR_MANIFEST_PATH = os.path.join(DG_WORKING_FOLDER, 's3_mirror_manifest.json')
 ## data_governance/researchflow/plan/status.json
 PLAN_TASK_STATUS_FILE_PATH = os.path.join(DG_RESEARCHFLOW_FOLDER, PLAN, STATUS_JSON)
 PLAN_FILE_PATH = os.path.join(DG_RESEARCHFLOW_FOLDER, PLAN, PLAN_JSON)
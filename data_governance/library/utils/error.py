@@ -36,6 +36,10 @@ class NotFoundContentsError(Exception):
     """取得したいコンテンツが存在しなかったエラーのクラスです。"""
 
 
+class ChecksumMismatchError(Exception):
+    """転送したファイルのチェックサムが転送元と一致しないエラーのクラスです。"""
+
+
 # GINに対してのみのエラー
 class RepositoryNotExist(Exception):
     """リモートリポジトリの情報が取得できない時のエラーのクラスです。"""
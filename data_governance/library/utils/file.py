@@ -93,6 +93,48 @@ def relative_path(target_path: str, start_dir: str) -> str:
         return ""
 
 
+def load_cache_file(cache_path: str) -> dict:
+    """ キャッシュファイルを読み込む関数です。
+
+    キャッシュファイルが存在しない、または読み込めない場合は空のキャッシュとして扱います。
+
+    Args:
+        cache_path (str): キャッシュファイルのパス
+
+    Returns:
+        dict: キャッシュファイルの内容を返す。
+
+    """
+    try:
+        with open(cache_path, 'r') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    return data
+
+
+def save_cache_file(cache_path: str, data: dict) -> None:
+    """ キャッシュファイルを書き込む関数です。
+
+    一時ファイルに書き込んでから置き換えます。キャッシュは再作成できるため、書き込めない場合も処理を続けます。
+
+    Args:
+        cache_path (str): キャッシュファイルのパス
+        data (dict): キャッシュファイルの内容
+
+    """
+    tmp_path = f'{cache_path}.tmp'
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
 class File:
     """ ファイル操作のクラスです。
 
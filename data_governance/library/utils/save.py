@@ -13,6 +13,7 @@ from .error import UnusableVault, ProjectNotExist, UnauthorizedError, RepoPermis
 from .input import get_grdm_connection_parameters
 from .log import TaskLog
 from .storage_provider import grdm
+from .storage_provider.stats import TransferStats
 from .time_tracker import TimeDiff
 from .widgets import Button, MessageBox
 
@@ -153,7 +154,6 @@ class TaskSave(TaskLog):
 
     async def _save(self) -> None:
         """ 保存を実行するメソッドです。"""
-        size = len(self._source)
         timediff = TimeDiff()
 
         # start
@@ -161,17 +161,25 @@ class TaskSave(TaskLog):
         msg = msg_config.get('save', 'doing')
         timediff.start()
         grdm_connect = grdm.Grdm()
+        stats = TransferStats()
+
+        def progress(done: int, total: int) -> None:
+            """ ファイル単位の進捗と転送速度を表示する関数です。"""
+            self.save_msg_output.update_info(
+                f'{msg} {done}/{total} ({stats.bytes_per_second / 1024 / 1024:.2f} MiB/s)'
+            )
 
         try:
-            for i, path in enumerate(self._source):
-                self.save_msg_output.update_info(f'{msg} {i+1}/{size}')
-                await grdm_connect.sync(
-                    token=self.token,
-                    base_url=self.grdm_url,
-                    project_id=self.project_id,
-                    abs_source=path,
-                    abs_root=self._abs_root_path
-                )
+            self.save_msg_output.update_info(msg)
+            await grdm_connect.sync_all(
+                token=self.token,
+                base_url=self.grdm_url,
+                project_id=self.project_id,
+                abs_sources=self._source,
+                abs_root=self._abs_root_path,
+                progress=progress,
+                stats=stats
+            )
         except UnauthorizedError:
             message = msg_config.get('form', 'token_unauthorized')
             self.save_msg_output.update_warning(message)
@@ -183,6 +191,7 @@ class TaskSave(TaskLog):
             error_summary = traceback.format_exception_only(type(e), e)[0].rstrip('\\n')
             error_msg = msg_config.get('save', 'connection_error') + "\n" + error_summary
             self.log.error(f'{error_msg}\n{traceback.format_exc()}')
+            self.log.info(f'transfer stats: {stats}')
             self.save_msg_output.add_error(f'経過時間: {minutes}m {seconds}s\n {error_msg}')
             return
         except Exception as e:
@@ -192,9 +201,26 @@ class TaskSave(TaskLog):
             error_msg = f'## [INTERNAL ERROR] : {error_summary}\n{traceback.format_exc()}'
             self.save_msg_output.add_error(f'経過時間: {minutes}m {seconds}s\n {error_msg}')
             self.log.error(f'{error_msg}\n{traceback.format_exc()}')
+            self.log.info(f'transfer stats: {stats}')
             return
         # end
         timediff.end()
         minutes, seconds = timediff.get_diff_minute()
         message = msg_config.get('save', 'success')
-        self.save_msg_output.update_success(f'{message}（{minutes}m {seconds}s）')
+        self.log.info(f'transfer stats: {stats}')
+        self.save_msg_output.update_success(f"{message}（{minutes}m {seconds}s）\n{self._format_stats(stats)}")
+
+    @staticmethod
+    def _format_stats(stats: TransferStats) -> str:
+        """ 転送の計測値を画面に表示する文字列に整形するメソッドです。
+
+        Args:
+            stats (TransferStats): 転送の計測値
+
+        Returns:
+            str: message.iniの書式で整形した文字列を返す。
+        """
+        return msg_config.get('save', 'transfer_stats').format(
+            stats.files, f'{stats.bytes / 1024 / 1024:.1f}', f'{stats.seconds:.1f}',
+            f'{stats.bytes_per_second / 1024 / 1024:.2f}', stats.requests, stats.retries
+        )
@@ -1,13 +1,17 @@
 """リサーチフローステータス関連の処理を行う関数やクラスが記載されたモジュールです。"""
+from collections import Counter
+import copy
 from datetime import datetime
+import hashlib
 import os
+from typing import Optional
 import uuid
 
 from dg_drawer.research_flow import ResearchFlowStatus, PhaseStatus, SubFlowStatus, FlowDrawer
 
 from library.utils.config import message as msg_config, path_config
 from library.utils.error import NotFoundSubflowDataError
-from library.utils.file import JsonFile
+from library.utils.file import JsonFile, load_cache_file, save_cache_file
 from library.utils.html.security import escape_html_text
 
 
@@ -83,8 +87,298 @@ def get_data_dir(working_file_path: str) -> str:
     return path_config.get_task_data_dir(abs_root, subflow_type, data_dir_name)
 
 
+class ResearchFlowStatusModel:
+    """読み込んだリサーチフローステータス管理情報を保持するクラスです。
+
+    フェーズとサブフローデータをフェーズ名、フェーズシーケンス番号、サブフローID、親サブフローIDで参照できるようにし、
+    フェーズごとのサブフロー名とデータフォルダ名の重複を一覧を走査せずに確認できるようにします。
+    サブフローデータの追加、削除、名前と親サブフローの変更は索引を保つため、このクラスのメソッドで行います。
+
+    Attributes:
+        instance:
+            phases(list[PhaseStatus]):リサーチフローステータス管理情報
+            signature(Optional[tuple[int, int, int]]):読み込んだ時点のファイルのinode番号、更新日時、サイズ
+            _phase_by_name(dict[str, PhaseStatus]):フェーズ名をキーとしたフェーズの辞書
+            _phase_by_seq_number(dict[int, PhaseStatus]):フェーズシーケンス番号をキーとしたフェーズの辞書
+            _sub_flow_by_id(dict[str, tuple[PhaseStatus, SubFlowStatus]]):サブフローIDをキーとしたフェーズとサブフローデータの辞書
+            _children(dict[str, list[tuple[PhaseStatus, SubFlowStatus]]]):親サブフローIDをキーとした子サブフローのフェーズとサブフローデータのリスト
+            _names(dict[int, Counter]):フェーズシーケンス番号ごとのサブフロー名の数
+            _data_dirs(dict[int, Counter]):フェーズシーケンス番号ごとのデータフォルダ名の数
+    """
+
+    def __init__(self, phases: list[PhaseStatus], signature: Optional[tuple[int, int, int]] = None):
+        """クラスのインスタンスの初期化を行うメソッドです。
+
+        Args:
+            phases (list[PhaseStatus]):リサーチフローステータス管理情報
+            signature (Optional[tuple[int, int, int]]):ファイルのinode番号、更新日時、サイズ. Defaults to None.
+
+        """
+        self.phases = phases
+        self.signature = signature
+        self._phase_by_name = {}
+        self._phase_by_seq_number = {}
+        self._sub_flow_by_id = {}
+        self._children = {}
+        self._names = {}
+        self._data_dirs = {}
+        for phase in phases:
+            # 同じキーが複数ある場合は、先頭から探索していた従来の処理に合わせて最初のものを用いる
+            self._phase_by_name.setdefault(phase._name, phase)
+            self._phase_by_seq_number.setdefault(phase._seq_number, phase)
+            self._names.setdefault(phase._seq_number, Counter())
+            self._data_dirs.setdefault(phase._seq_number, Counter())
+            for sub_flow in phase._sub_flow_data:
+                self._add_index(phase, sub_flow)
+                self._add_children_index(phase, sub_flow, sub_flow._parent_ids)
+
+    def _add_index(self, phase: PhaseStatus, sub_flow: SubFlowStatus):
+        """サブフローデータを索引に追加するメソッドです。
+
+        Args:
+            phase (PhaseStatus):サブフローデータが属するフェーズ
+            sub_flow (SubFlowStatus):サブフローデータ
+
+        """
+        self._sub_flow_by_id.setdefault(sub_flow._id, (phase, sub_flow))
+        self._names[phase._seq_number][sub_flow._name] += 1
+        self._data_dirs[phase._seq_number][sub_flow._data_dir] += 1
+
+    def _remove_index(self, phase: PhaseStatus, sub_flow: SubFlowStatus):
+        """サブフローデータを索引から取り除くメソッドです。
+
+        Args:
+            phase (PhaseStatus):サブフローデータが属するフェーズ
+            sub_flow (SubFlowStatus):サブフローデータ
+
+        """
+        if self._sub_flow_by_id.get(sub_flow._id, (None, None))[1] is sub_flow:
+            del self._sub_flow_by_id[sub_flow._id]
+        self._names[phase._seq_number][sub_flow._name] -= 1
+        self._data_dirs[phase._seq_number][sub_flow._data_dir] -= 1
+
+    def _add_children_index(self, phase: PhaseStatus, sub_flow: SubFlowStatus, parent_ids: list[str]):
+        """サブフローデータを親サブフローIDの索引に追加するメソッドです。
+
+        Args:
+            phase (PhaseStatus):サブフローデータが属するフェーズ
+            sub_flow (SubFlowStatus):サブフローデータ
+            parent_ids (list[str]):追加する親サブフローID
+
+        """
+        for parent_id in parent_ids:
+            self._children.setdefault(parent_id, []).append((phase, sub_flow))
+
+    def _remove_children_index(self, sub_flow: SubFlowStatus, parent_ids: list[str]):
+        """サブフローデータを親サブフローIDの索引から取り除くメソッドです。
+
+        Args:
+            sub_flow (SubFlowStatus):サブフローデータ
+            parent_ids (list[str]):取り除く親サブフローID
+
+        """
+        for parent_id in parent_ids:
+            children = self._children.get(parent_id, [])
+            children[:] = [child for child in children if child[1] is not sub_flow]
+
+    def copy(self) -> 'ResearchFlowStatusModel':
+        """変更に用いるため、管理情報を複製したインスタンスを作成するメソッドです。
+
+        Returns:
+            ResearchFlowStatusModel:複製した管理情報を保持するインスタンスを返す。
+
+        """
+        return ResearchFlowStatusModel(copy.deepcopy(self.phases))
+
+    def get_phase_by_name(self, phase_name: str) -> Optional[PhaseStatus]:
+        """フェーズ名からフェーズを取得するメソッドです。
+
+        Args:
+            phase_name (str):フェーズ名
+
+        Returns:
+            Optional[PhaseStatus]:フェーズ、存在しない場合はNoneを返す。
+
+        """
+        return self._phase_by_name.get(phase_name)
+
+    def get_phase_by_seq_number(self, phase_seq_number: int) -> Optional[PhaseStatus]:
+        """フェーズシーケンス番号からフェーズを取得するメソッドです。
+
+        Args:
+            phase_seq_number (int):フェーズシーケンス番号
+
+        Returns:
+            Optional[PhaseStatus]:フェーズ、存在しない場合はNoneを返す。
+
+        """
+        return self._phase_by_seq_number.get(phase_seq_number)
+
+    def find_sub_flow(self, sub_flow_id: str) -> Optional[tuple[PhaseStatus, SubFlowStatus]]:
+        """サブフローIDからサブフローデータとその属するフェーズを取得するメソッドです。
+
+        Args:
+            sub_flow_id (str):サブフローID
+
+        Returns:
+            Optional[tuple[PhaseStatus, SubFlowStatus]]:フェーズとサブフローデータ、存在しない場合はNoneを返す。
+
+        """
+        return self._sub_flow_by_id.get(sub_flow_id)
+
+    def get_sub_flow(self, phase_name: str, sub_flow_id: str) -> Optional[SubFlowStatus]:
+        """フェーズ名とサブフローIDからサブフローデータを取得するメソッドです。
+
+        Args:
+            phase_name (str):フェーズ名
+            sub_flow_id (str):サブフローID
+
+        Returns:
+            Optional[SubFlowStatus]:サブフローデータ、存在しない場合はNoneを返す。
+
+        """
+        found = self.find_sub_flow(sub_flow_id)
+        if found is None or found[0]._name != phase_name:
+            return None
+        return found[1]
+
+    def get_sub_flow_by_seq_number(self, phase_seq_number: int, sub_flow_id: str) -> Optional[SubFlowStatus]:
+        """フェーズシーケンス番号とサブフローIDからサブフローデータを取得するメソッドです。
+
+        Args:
+            phase_seq_number (int):フェーズシーケンス番号
+            sub_flow_id (str):サブフローID
+
+        Returns:
+            Optional[SubFlowStatus]:サブフローデータ、存在しない場合はNoneを返す。
+
+        """
+        found = self.find_sub_flow(sub_flow_id)
+        if found is None or found[0]._seq_number != phase_seq_number:
+            return None
+        return found[1]
+
+    def get_children(self, phase_seq_number: int, parent_id: str) -> list[SubFlowStatus]:
+        """指定したサブフローを親とする、指定したフェーズのサブフローデータを取得するメソッドです。
+
+        Args:
+            phase_seq_number (int):フェーズシーケンス番号
+            parent_id (str):親サブフローID
+
+        Returns:
+            list[SubFlowStatus]:子サブフローデータのリスト
+
+        """
+        return [
+            sub_flow for phase, sub_flow in self._children.get(parent_id, [])
+            if phase._seq_number == phase_seq_number
+        ]
+
+    def has_sub_flow_name(self, phase_seq_number: int, sub_flow_name: str) -> bool:
+        """フェーズ内に同じ名前のサブフローが存在するかを確認するメソッドです。
+
+        Args:
+            phase_seq_number (int):フェーズシーケンス番号
+            sub_flow_name (str):サブフロー名
+
+        Returns:
+            bool:同じ名前のサブフローが存在すればTrueを返す。
+
+        Raises:
+            KeyError:引数で指定したフェーズが存在しない
+
+        """
+        return self._names[phase_seq_number][sub_flow_name] > 0
+
+    def has_data_dir(self, phase_seq_number: int, data_dir_name: str) -> bool:
+        """フェーズ内に同じ名前のデータフォルダが存在するかを確認するメソッドです。
+
+        Args:
+            phase_seq_number (int):フェーズシーケンス番号
+            data_dir_name (str):データフォルダ名
+
+        Returns:
+            bool:同じ名前のデータフォルダが存在すればTrueを返す。
+
+        Raises:
+            KeyError:引数で指定したフェーズが存在しない
+
+        """
+        return self._data_dirs[phase_seq_number][data_dir_name] > 0
+
+    def add_sub_flow(self, phase: PhaseStatus, sub_flow: SubFlowStatus):
+        """フェーズにサブフローデータを追加するメソッドです。
+
+        Args:
+            phase (PhaseStatus):追加先のフェーズ
+            sub_flow (SubFlowStatus):追加するサブフローデータ
+
+        """
+        phase._sub_flow_data.append(sub_flow)
+        self._add_index(phase, sub_flow)
+        self._add_children_index(phase, sub_flow, sub_flow._parent_ids)
+
+    def remove_sub_flow(self, sub_flow_id: str) -> bool:
+        """サブフローデータを削除するメソッドです。
+
+        Args:
+            sub_flow_id (str):削除するサブフローID
+
+        Returns:
+            bool:削除した場合はTrue、サブフローデータが存在しない場合はFalseを返す。
+
+        """
+        found = self.find_sub_flow(sub_flow_id)
+        if found is None:
+            return False
+        phase, sub_flow = found
+        phase._sub_flow_data.remove(sub_flow)
+        self._remove_index(phase, sub_flow)
+        self._remove_children_index(sub_flow, sub_flow._parent_ids)
+        return True
+
+    def rename_sub_flow(self, sub_flow: SubFlowStatus, sub_flow_name: str, data_dir_name: str):
+        """サブフロー名とデータフォルダ名を変更するメソッドです。
+
+        Args:
+            sub_flow (SubFlowStatus):変更するサブフローデータ
+            sub_flow_name (str):変更後のサブフロー名
+            data_dir_name (str):変更後のデータフォルダ名
+
+        """
+        phase, _ = self.find_sub_flow(sub_flow._id)
+        self._remove_index(phase, sub_flow)
+        sub_flow._name = sub_flow_name
+        sub_flow._data_dir = data_dir_name
+        self._add_index(phase, sub_flow)
+
+    def relink_sub_flow(self, sub_flow: SubFlowStatus, parent_ids: list[str]):
+        """親サブフローを変更するメソッドです。
+
+        変更前後の両方で親となるサブフローについては、子サブフローの並び順を変えません。
+
+        Args:
+            sub_flow (SubFlowStatus):変更するサブフローデータ
+            parent_ids (list[str]):変更後の親サブフローID
+
+        """
+        phase, _ = self.find_sub_flow(sub_flow._id)
+        self._remove_children_index(sub_flow, [i for i in sub_flow._parent_ids if i not in parent_ids])
+        self._add_children_index(phase, sub_flow, [i for i in parent_ids if i not in sub_flow._parent_ids])
+        sub_flow._parent_ids = parent_ids
+
+
 class ResearchFlowStatusFile(JsonFile):
-    """リサーチフローステータスの参照や操作を行うクラスです。"""
+    """リサーチフローステータスの参照や操作を行うクラスです。
+
+    読み込んだリサーチフローステータス管理情報はファイルパスごとにプロセス内で共有し、
+    ファイルのinode番号、更新日時、サイズが変わった場合のみ読み込み直します。
+
+    Attributes:
+        class:
+            _models(dict[str, ResearchFlowStatusModel]):ファイルの絶対パスをキーとした読み込み済みの管理情報
+    """
+    _models = {}
 
     def __init__(self, file_path: str):
         """クラスのインスタンスの初期化を行うメソッドです。コンストラクタ
@@ -101,20 +395,54 @@ class ResearchFlowStatusFile(JsonFile):
         else:
             raise FileNotFoundError(f'[ERROR] : Not Found File. File Path : {file_path}')
 
+    def _get_signature(self) -> tuple[int, int, int]:
+        """ファイルが変更されたかの判定に用いる値を取得するメソッドです。
+
+        Returns:
+            tuple[int, int, int]:ファイルのinode番号、更新日時、サイズを返す。
+
+        """
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def get_model(self) -> ResearchFlowStatusModel:
+        """読み込み済みのリサーチフローステータス管理情報を取得するメソッドです。
+
+        ファイルが前回の読み込みから変更されている場合のみ、リサーチフローステータス管理JSONを読み込み直します。
+        返り値は共有しているため、変更する場合はload_research_flow_statusを用います。
+
+        Returns:
+            ResearchFlowStatusModel:リサーチフローステータス管理情報
+
+        """
+        key = os.path.abspath(self.path)
+        signature = self._get_signature()
+        model = self._models.get(key)
+        if model is None or model.signature != signature:
+            model = ResearchFlowStatusModel(ResearchFlowStatus.load_from_json(str(self.path)), signature)
+            self._models[key] = model
+        return model
+
     def load_research_flow_status(self) -> list[PhaseStatus]:
         """リサーチフローステータス管理JSONからリサーチフローステータスのインスタンスを取得するメソッドです。
 
+        読み込み済みの管理情報の複製を返すため、返り値を変更しても他の呼び出しに影響しません。
+
         Returns:
             list[PhaseStatus]:リサーチフローステータスのリスト
 
         """
-        return ResearchFlowStatus.load_from_json(str(self.path))
+        return copy.deepcopy(self.get_model().phases)
 
-    def update_file(self, research_flow_status: list[PhaseStatus]):
+    def update_file(
+        self, research_flow_status: list[PhaseStatus], model: Optional[ResearchFlowStatusModel] = None
+    ):
         """リサーチフローステータス管理JSONの更新を行うメソッドです。
 
         Args:
             research_flow_status (list[PhaseStatus]): 更新に用いるリサーチフローステータス管理情報
+            model (Optional[ResearchFlowStatusModel]): research_flow_statusを保持する管理情報。
+                指定した場合は複製せずに読み込み済みの管理情報とする. Defaults to None.
 
         """
         # research_flow_statusを基にリサーチフローステータス管理JSONを更新する。
@@ -139,6 +467,25 @@ class ResearchFlowStatusFile(JsonFile):
                 phase_status_data)
         # リサーチフローステータス管理JSONをアップデート
         super().write(research_flow_status_data)
+        # 書き込んだ内容を読み込み済みの管理情報とし、次回の参照でファイルを読み込まないようにする
+        if model is None:
+            model = ResearchFlowStatusModel(copy.deepcopy(research_flow_status))
+        model.signature = self._get_signature()
+        self._models[os.path.abspath(self.path)] = model
+        self.clear_diagram_cache()
+
+    @property
+    def diagram_cache_path(self) -> str:
+        """リサーチフローイメージのキャッシュファイルのパスを返すプロパティです。"""
+        abs_root = path_config.get_abs_root_form_working_dg_file_path(str(self.path))
+        return os.path.join(abs_root, path_config.RESEARCH_FLOW_DIAGRAM_CACHE_PATH)
+
+    def clear_diagram_cache(self):
+        """リサーチフローイメージのキャッシュを削除するメソッドです。"""
+        try:
+            os.remove(self.diagram_cache_path)
+        except FileNotFoundError:
+            pass
 
     def issue_uuidv4(self) -> str:
         """UUIDv4の発行を行うメソッドです。
@@ -167,6 +514,18 @@ class ResearchFlowStatusFile(JsonFile):
                     return True
         return False
 
+    def exist_sub_flow_id(self, target_id: str) -> bool:
+        """読み込み済みの管理情報に同一のサブフローIDが存在するかを索引から確認するメソッドです。
+
+        Args:
+            target_id (str): 確認するサブフローID
+
+        Returns:
+            bool:target_idと一致するサブフローIDが存在するかの判定に用いるフラグ
+
+        """
+        return self.get_model().find_sub_flow(target_id) is not None
+
     def issue_unique_sub_flow_id(self) -> str:
         """固有のサブフローIDを発行するメソッドです。
 
@@ -176,7 +535,8 @@ class ResearchFlowStatusFile(JsonFile):
         """
         while True:
             candidate_id = self.issue_uuidv4()
-            return candidate_id
+            if not self.exist_sub_flow_id(candidate_id):
+                return candidate_id
 
     def is_unique_subflow_name(self, phase_seq_number: int, sub_flow_name: str) -> bool:
         """フェーズ内に同じ名前のサブフローが存在するかの確認を行うメソッドです。
@@ -192,21 +552,10 @@ class ResearchFlowStatusFile(JsonFile):
             Exception:引数で指定したフェーズが存在しない
 
         """
-        exist_phase = False
-        research_flow_status = self.load_research_flow_status()
-        for phase_status in research_flow_status:
-            if phase_status._seq_number == phase_seq_number:
-                exist_phase = True
-                for sub_flow_item in phase_status._sub_flow_data:
-                    if sub_flow_item._name == sub_flow_name:
-                        return False
-            else:
-                continue
-
-        if not exist_phase:
-            raise Exception(f'Not Found phase. target phase seq_number : {phase_seq_number}')
-
-        return True
+        try:
+            return not self.get_model().has_sub_flow_name(phase_seq_number, sub_flow_name)
+        except KeyError:
+            raise Exception(f'Not Found phase. target phase seq_number : {phase_seq_number}') from None
 
     def is_unique_data_dir(self, phase_seq_number: int, data_dir_name: str) -> bool:
         """フェーズ内に同じ名前のデータフォルダが存在するかの確認を行うメソッドです。
@@ -222,39 +571,51 @@ class ResearchFlowStatusFile(JsonFile):
             Exception:一致するフェーズが存在しない
 
         """
-        exist_phase = False
-        research_flow_status = self.load_research_flow_status()
-        for phase_status in research_flow_status:
-            if phase_status._seq_number == phase_seq_number:
-                exist_phase = True
-                for sub_flow_item in phase_status._sub_flow_data:
-                    if sub_flow_item._data_dir == data_dir_name:
-                        return False
-            else:
-                continue
-
-        if not exist_phase:
-            raise Exception(f'Not Found phase. target phase seq_number : {phase_seq_number}')
-
-        return True
+        try:
+            return not self.get_model().has_data_dir(phase_seq_number, data_dir_name)
+        except KeyError:
+            raise Exception(f'Not Found phase. target phase seq_number : {phase_seq_number}') from None
 
 
 class ResearchFlowStatusOperater(ResearchFlowStatusFile):
     """リサーチフローステータスの参照や操作をおこなうクラスです。"""
 
+    def _build_diagram_key(self) -> str:
+        """リサーチフローイメージのキャッシュのキーを作成するメソッドです。
+
+        Returns:
+            str:リサーチフローステータス管理JSONとフェーズの表示名を定義したmessage.iniの内容のハッシュ値
+
+        """
+        hash_ = hashlib.sha256()
+        for file_path in (str(self.path), msg_config.message_ini_path):
+            with open(file_path, 'rb') as f:
+                hash_.update(f.read())
+        return hash_.hexdigest()
+
     def get_svg_of_research_flow_status(self) -> str:
         """リサーチフローイメージのSVGデータを取得するメソッドです。
 
+        リサーチフローステータス管理JSONの内容が前回の描画から変わっていない場合は、
+        描画せずにキャッシュしたSVGデータを返します。
+
         Returns:
             str:リサーチフローイメージのSVGデータ
 
         """
+        key = self._build_diagram_key()
+        cache = load_cache_file(self.diagram_cache_path)
+        if cache.get('key') == key and isinstance(cache.get('svg'), str):
+            return cache['svg']
+
         research_flow_status = self.load_research_flow_status()
         # Update display phase name
         research_flow_status = self.update_display_object(research_flow_status)
         fd = FlowDrawer(research_flow_status=research_flow_status)
         # generate SVG of Research Flow Image
-        return fd.draw()
+        svg_data = fd.draw()
+        save_cache_file(self.diagram_cache_path, {'key': key, 'svg': svg_data})
+        return svg_data
 
     def update_display_object(self, research_flow_status: list[PhaseStatus]) -> list[PhaseStatus]:
         """リサーチフローステータス管理情報を画面表示用に調整するメソッドです。
@@ -315,32 +676,26 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
 
         """
         # リサーチフローステータス管理JSONの更新
-        research_flow_status = self.load_research_flow_status()
-        phase_name = None
-        new_sub_flow_id = None
-        for phase_status in research_flow_status:
-            if phase_status._seq_number == creating_phase_seq_number:
-                phase_name = phase_status._name
-                current_datetime = datetime.now()
-                new_sub_flow_id = self.issue_unique_sub_flow_id()
-                new_subflow_item = SubFlowStatus(
-                    id=new_sub_flow_id,
-                    name=sub_flow_name,
-                    data_dir=data_dir_name,
-                    link=f'./{phase_name}/{new_sub_flow_id}/{path_config.MENU_NOTEBOOK}',
-                    parent_ids=parent_sub_flow_ids,
-                    create_datetime=int(current_datetime.timestamp())
-                )
-                phase_status._sub_flow_data.append(new_subflow_item)
-            else:
-                continue
-
-        if phase_name is None:
+        model = self.get_model().copy()
+        phase_status = model.get_phase_by_seq_number(creating_phase_seq_number)
+        if phase_status is None:
             raise Exception(f'Not Found phase. target phase seq_number : {creating_phase_seq_number}')
+        phase_name = phase_status._name
+        current_datetime = datetime.now()
+        new_sub_flow_id = self.issue_unique_sub_flow_id()
         if new_sub_flow_id is None:
             raise Exception(f'Cannot Issue New Sub Flow ID')
+        new_subflow_item = SubFlowStatus(
+            id=new_sub_flow_id,
+            name=sub_flow_name,
+            data_dir=data_dir_name,
+            link=f'./{phase_name}/{new_sub_flow_id}/{path_config.MENU_NOTEBOOK}',
+            parent_ids=parent_sub_flow_ids,
+            create_datetime=int(current_datetime.timestamp())
+        )
+        model.add_sub_flow(phase_status, new_subflow_item)
         # リサーチフローステータス管理JSONの上書き
-        self.update_file(research_flow_status)
+        self.update_file(model.phases, model)
         return phase_name, new_sub_flow_id
 
     def del_sub_flow_data_by_sub_flow_id(self, sub_flow_id: str):
@@ -353,23 +708,11 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
             NotFoundSubflowDataError:IDが一致するサブフローデータが存在しない
 
         """
-        research_flow_status = self.load_research_flow_status()
-
-        for phase_status in research_flow_status:
-            remove_subflow = None
-            for subflow in phase_status._sub_flow_data:
-                if subflow._id == sub_flow_id:
-                    remove_subflow = subflow
-                    break
-                else:
-                    continue
-            if remove_subflow is not None:
-                phase_status._sub_flow_data.remove(remove_subflow)
-                break
-        else:
+        model = self.get_model().copy()
+        if not model.remove_sub_flow(sub_flow_id):
             raise NotFoundSubflowDataError(f'There Is No Subflow Data to Delete. sub_flow_id : {sub_flow_id}')
         # リサーチフローステータス管理JSONの上書き
-        self.update_file(research_flow_status)
+        self.update_file(model.phases, model)
 
     def relink_sub_flow(self, phase_seq_number: int, sub_flow_id: str, parent_sub_flow_ids: list[str]):
         """親サブフローを変更するメソッドです。
@@ -383,18 +726,13 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
             NotFoundSubflowDataError:IDが一致するサブフローデータが存在しない
 
         """
-        research_flow_status = self.load_research_flow_status()
-        for phase_status in research_flow_status:
-            if phase_status._seq_number != phase_seq_number:
-                continue
-            for sf in phase_status._sub_flow_data:
-                if sf._id == sub_flow_id:
-                    sf._parent_ids = parent_sub_flow_ids
-                    break
-            else:
+        model = self.get_model().copy()
+        if model.get_phase_by_seq_number(phase_seq_number) is not None:
+            sf = model.get_sub_flow_by_seq_number(phase_seq_number, sub_flow_id)
+            if sf is None:
                 raise NotFoundSubflowDataError(f'There Is No Subflow Data to Relink. sub_flow_id : {sub_flow_id}')
-            break
-        self.update_file(research_flow_status)
+            model.relink_sub_flow(sf, parent_sub_flow_ids)
+        self.update_file(model.phases, model)
 
     def rename_sub_flow(
         self, phase_seq_number: int, sub_flow_id: str,
@@ -412,19 +750,13 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
             NotFoundSubflowDataError:IDが一致するサブフローデータが存在しない
 
         """
-        research_flow_status = self.load_research_flow_status()
-        for phase_status in research_flow_status:
-            if phase_status._seq_number != phase_seq_number:
-                continue
-            for sf in phase_status._sub_flow_data:
-                if sf._id == sub_flow_id:
-                    sf._name = sub_flow_name
-                    sf._data_dir = data_dir_name
-                    break
-            else:
+        model = self.get_model().copy()
+        if model.get_phase_by_seq_number(phase_seq_number) is not None:
+            sf = model.get_sub_flow_by_seq_number(phase_seq_number, sub_flow_id)
+            if sf is None:
                 raise NotFoundSubflowDataError(f'There Is No Subflow Data to Rename. sub_flow_id : {sub_flow_id}')
-            break
-        self.update_file(research_flow_status)
+            model.rename_sub_flow(sf, sub_flow_name, data_dir_name)
+        self.update_file(model.phases, model)
 
     def get_flow_name_and_dir_name(self, phase_seq_number: int, id: str) -> tuple[str, str]:
         """指定したサブフローデータのサブフロー名とディレクトリ名を取得するメソッドです。
@@ -441,15 +773,10 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
             NotFoundSubflowDataError:IDが一致するサブフローデータが存在しない
 
         """
-        research_flow_status = self.load_research_flow_status()
-        for phase in research_flow_status:
-            if phase._seq_number != phase_seq_number:
-                continue
-            for sb in phase._sub_flow_data:
-                if sb._id == id:
-                    return sb._name, sb._data_dir
-        else:
+        sb = self.get_model().get_sub_flow_by_seq_number(phase_seq_number, id)
+        if sb is None:
             raise NotFoundSubflowDataError(f'There Is No Data Directory Name. sub_flow_id : {id}')
+        return sb._name, sb._data_dir
 
     def get_data_dir(self, phase_name: str, id: str) -> str:
         """指定したサブフローデータのディレクトリ名を取得するメソッドです。
@@ -465,15 +792,10 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
             NotFoundSubflowDataError:IDが一致するサブフローデータが存在しない
 
         """
-        research_flow_status = self.load_research_flow_status()
-        for phase in research_flow_status:
-            if phase._name != phase_name:
-                continue
-            for sb in phase._sub_flow_data:
-                if sb._id == id:
-                    return sb._data_dir
-        else:
+        sb = self.get_model().get_sub_flow(phase_name, id)
+        if sb is None:
             raise NotFoundSubflowDataError(f'There Is No Data Directory Name. sub_flow_id : {id}')
+        return sb._data_dir
 
     def get_subflow_phase(self, phase_seq_number: int) -> str:
         """指定したフェーズの名前を取得するメソッドです。
@@ -488,12 +810,10 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
             Exception:フェーズシーケンス番号が一致するフェーズが存在しない
 
         """
-        research_flow_status = self.load_research_flow_status()
-        for phase_status in research_flow_status:
-            if phase_status._seq_number == phase_seq_number:
-                return phase_status._name
-        else:
+        phase_status = self.get_model().get_phase_by_seq_number(phase_seq_number)
+        if phase_status is None:
             raise Exception(f'There is no phase. phase_seq_number : {phase_seq_number}')
+        return phase_status._name
 
     def get_subflow_phases(self) -> list[str]:
         """リサーチフローステータスに存在する全てのフェーズ名を取得するメソッドです。
@@ -502,11 +822,7 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
             list[str]:全フェーズ名のリスト
 
         """
-        research_flow_status = self.load_research_flow_status()
-        phase_list = []
-        for phase_status in research_flow_status:
-            phase_list.append(phase_status._name)
-        return phase_list
+        return [phase_status._name for phase_status in self.get_model().phases]
 
     def get_subflow_ids(self, phase_name: str) -> list[str]:
         """指定したフェーズの全サブフローIDを取得するメソッドです。
@@ -518,14 +834,10 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
             list[str]:対象のフェーズに存在する全サブフローIDのリスト
 
         """
-        research_flow_status = self.load_research_flow_status()
-        id_list = []
-        for phase_status in research_flow_status:
-            if phase_status._name != phase_name:
-                continue
-            for subflow_data in phase_status._sub_flow_data:
-                id_list.append(subflow_data._id)
-        return id_list
+        phase_status = self.get_model().get_phase_by_name(phase_name)
+        if phase_status is None:
+            return []
+        return [subflow_data._id for subflow_data in phase_status._sub_flow_data]
 
     def get_phase_subflow_id_name(self):
         """研究準備を除くリサーチフローステータスに存在する全てのフェーズとサブフローID、サブフロー名を取得するメソッドです。
@@ -533,9 +845,8 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
         Returns:
             dict: フェーズとサブフローID、サブフロー名を返す
         """
-        research_flow_status = self.load_research_flow_status()
         sub_flow_dict = {}
-        for phase in research_flow_status:
+        for phase in self.get_model().phases:
             if phase._name != 'plan' and phase._sub_flow_data != []:
                 value = self.get_id_name(phase)
                 sub_flow_dict[phase._name] = value
@@ -569,15 +880,10 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
             NotFoundSubflowDataError:IDが一致するサブフローデータが存在しない
 
         """
-        research_flow_status = self.load_research_flow_status()
-        for phase in research_flow_status:
-            if phase._seq_number != phase_seq_number:
-                continue
-            for sb in phase._sub_flow_data:
-                if sb._id == id:
-                    return sb._parent_ids
-        else:
+        sb = self.get_model().get_sub_flow_by_seq_number(phase_seq_number, id)
+        if sb is None:
             raise NotFoundSubflowDataError(f'There Is No Data Directory Name. sub_flow_id : {id}')
+        return list(sb._parent_ids)
 
     def get_flow_name(self, phase_seq_number: int, id: str) -> str:
         """指定したサブフローデータのサブフロー名を取得するメソッドです。
@@ -593,15 +899,10 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
             NotFoundSubflowDataError:IDが一致するサブフローデータが存在しない
 
         """
-        research_flow_status = self.load_research_flow_status()
-        for phase in research_flow_status:
-            if phase._seq_number != phase_seq_number:
-                continue
-            for sb in phase._sub_flow_data:
-                if sb._id == id:
-                    return sb._name
-        else:
+        sb = self.get_model().get_sub_flow_by_seq_number(phase_seq_number, id)
+        if sb is None:
             raise NotFoundSubflowDataError(f'There Is No Data Directory Name. sub_flow_id : {id}')
+        return sb._name
 
     def get_children_id_and_name(self, phase_seq_number: int, parent_id: str) -> dict:
         """指定されたサブフローを親とする特定のフェーズのサブフローidと名前を取得するメソッドです。
@@ -617,16 +918,11 @@ class ResearchFlowStatusOperater(ResearchFlowStatusFile):
             NotFoundSubflowDataError:IDが一致するサブフローデータが存在しない
 
         """
-        children_subflow = {}
-        research_flow_status = self.load_research_flow_status()
-        for phase in research_flow_status:
-            if phase._seq_number != phase_seq_number:
-                continue
-            for sb in phase._sub_flow_data:
-                if parent_id in sb._parent_ids:
-                    children_subflow[sb._name] = sb._id
+        children_subflow = {
+            sb._name: sb._id for sb in self.get_model().get_children(phase_seq_number, parent_id)
+        }
 
         if children_subflow:
             return children_subflow
         else:
-            raise NotFoundSubflowDataError(f'There Is No Data Directory Name. sub_flow_id : {id}')
+            raise NotFoundSubflowDataError(f'There Is No Data Directory Name. sub_flow_id : {parent_id}')
@@ -1,2 +1,3 @@
-"""AWS S3バケットからディレクトリまたはファイルをダウンロードするための関数が集められたパッケージです。"""
-from .main import download
+"""AWS S3バケットとディレクトリまたはファイルをダウンロード、アップロードするための関数が集められたパッケージです。"""
+from .main import download, upload
+from .models import TransferSummary
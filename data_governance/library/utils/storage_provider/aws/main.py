@@ -1,27 +1,123 @@
-"""AWS S3バケットからディレクトリまたはファイルをダウンロードするための関数が記載されたモジュールです。"""
+"""AWS S3バケットとディレクトリまたはファイルをダウンロード、アップロードするための関数が記載されたモジュールです。"""
+import os
+from typing import Optional
+
 import boto3
+from botocore.config import Config
+
+from .manifest import get_manifest
+from .models import (
+    DOWNLOAD_WORKERS, MULTIPART_CONCURRENCY, UPLOAD_WORKERS, TransferSummary,
+    download_dir, download_file, get_transfer_config, upload_dir, upload_file
+)
+
+
+def get_client(access_key: str, secret_key: str, max_workers: int):
+    """AWS S3にアクセスするためのクライアントを作成する関数です。
+
+    Args:
+        access_key (str):クライアント作成に用いるアクセスキー
+        secret_key (str):クライアント作成に用いるシークレットキー
+        max_workers (int):同時に転送するファイル数
 
-from .models import download_dir, download_file
+    Returns:
+        Any:AWS S3にアクセスするためのクライアントを返す。
+    """
+    return boto3.client(
+        's3',
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        # 並行転送とマルチパートの接続が接続プールの空き待ちにならないようにする
+        config=Config(max_pool_connections=max_workers * MULTIPART_CONCURRENCY)
+    )
 
 
-def download(access_key: str, secret_key: str, bucket_name: str, aws_path: str, local_path: str):
+def download(
+    access_key: str, secret_key: str, bucket_name: str, aws_path: str, local_path: str,
+    max_workers: int = DOWNLOAD_WORKERS, mirror: bool = False, manifest_path: Optional[str] = None,
+    include: Optional[list[str]] = None, exclude: Optional[list[str]] = None
+) -> TransferSummary:
     """AWS S3バケットからディレクトリまたはファイルをダウンロードするための関数です。
 
+    mirrorがTrueの場合は、ダウンロード先が既に存在してもエラーとせず、
+    ETag、サイズ、最終更新日時をマニフェストと比較して新規または変更されたオブジェクトのみをダウンロードします。
+
     Args:
         access_key (str):クライアント作成に用いるアクセスキー
         secret_key (str):クライアント作成に用いるシークレットキー
         bucket_name (str):バケット名
         aws_path (str):ダウンロードするファイル、ディレクトリへのパス
         local_path (str):ダウンロードしたファイル、ディレクトリの保存先を指定するパス
+        max_workers (int):ディレクトリのダウンロードで同時にダウンロードするファイル数. Defaults to DOWNLOAD_WORKERS.
+        mirror (bool):ミラーリングするかどうか. Defaults to False.
+        manifest_path (Optional[str]):ミラーリングに用いるマニフェストファイルのパス.
+            Defaults to None(ホームディレクトリ配下のdata_governance/workingに保存する).
+        include (Optional[list[str]]):ディレクトリのダウンロードで、ダウンロードするファイルを絞り込むglobパターン.
+            Defaults to None.
+        exclude (Optional[list[str]]):ディレクトリのダウンロードで、ダウンロードしないファイルのglobパターン.
+            Defaults to None.
+
+    Returns:
+        TransferSummary:ダウンロードしたファイル数、バイト数、経過時間を返す。
 
     """
-    s3_client = boto3.client(
-        's3',
-        aws_access_key_id=access_key,
-        aws_secret_access_key=secret_key
-    )
+    transfer_config = get_transfer_config()
+    manifest = get_manifest(manifest_path) if mirror else None
+    s3_client = get_client(access_key, secret_key, max_workers)
 
     if aws_path.endswith("/"):
-        download_dir(s3_client, bucket_name, aws_path, local_path)
+        return download_dir(
+            s3_client, bucket_name, aws_path, local_path, max_workers, transfer_config, manifest, include, exclude
+        )
+    else:
+        return download_file(s3_client, bucket_name, aws_path, local_path, transfer_config, manifest)
+
+
+def upload(
+    access_key: str, secret_key: str, bucket_name: str, local_path: str, aws_path: str,
+    max_workers: int = UPLOAD_WORKERS, incremental: bool = True, manifest_path: Optional[str] = None,
+    include: Optional[list[str]] = None, exclude: Optional[list[str]] = None
+) -> TransferSummary:
+    """AWS S3バケットへディレクトリまたはファイルをアップロードするための関数です。
+
+    大きなファイルはマルチパートでアップロードし、アップロード後にサイズとSHA-256チェックサムを確認します。
+    incrementalがTrueの場合は、サイズ、更新日時をマニフェストと比較して新規または変更されたファイルのみをアップロードします。
+    local_pathがディレクトリの場合、aws_pathはアップロード先のディレクトリとして扱います。
+    local_pathがファイルで、aws_pathが"/"で終わるか空文字の場合は、ローカルファイルと同じ名前でアップロードします。
+
+    Args:
+        access_key (str):クライアント作成に用いるアクセスキー
+        secret_key (str):クライアント作成に用いるシークレットキー
+        bucket_name (str):バケット名
+        local_path (str):アップロードするファイル、ディレクトリのパス
+        aws_path (str):アップロード先のパス
+        max_workers (int):ディレクトリのアップロードで同時にアップロードするファイル数. Defaults to UPLOAD_WORKERS.
+        incremental (bool):変更されたファイルのみをアップロードするかどうか. Defaults to True.
+        manifest_path (Optional[str]):差分アップロードに用いるマニフェストファイルのパス.
+            Defaults to None(ホームディレクトリ配下のdata_governance/workingに保存する).
+        include (Optional[list[str]]):ディレクトリのアップロードで、アップロードするファイルを絞り込むglobパターン.
+            Defaults to None.
+        exclude (Optional[list[str]]):ディレクトリのアップロードで、アップロードしないファイルのglobパターン.
+            Defaults to None.
+
+    Returns:
+        TransferSummary:アップロードしたファイル数、バイト数、経過時間を返す。
+
+    Raises:
+        FileNotFoundError:アップロードするファイル、ディレクトリが存在しない
+        ChecksumMismatchError:アップロードしたオブジェクトがローカルファイルと一致しない
+
+    """
+    if not os.path.exists(local_path):
+        raise FileNotFoundError(local_path)
+    transfer_config = get_transfer_config()
+    manifest = get_manifest(manifest_path) if incremental else None
+    s3_client = get_client(access_key, secret_key, max_workers)
+
+    if os.path.isdir(local_path):
+        aws_dir = aws_path if aws_path.endswith("/") or not aws_path else f'{aws_path}/'
+        return upload_dir(
+            s3_client, bucket_name, local_path, aws_dir, max_workers, transfer_config, manifest, include, exclude
+        )
     else:
-        download_file(s3_client, bucket_name, aws_path, local_path)
+        return upload_file(s3_client, bucket_name, local_path, aws_path, transfer_config, manifest)
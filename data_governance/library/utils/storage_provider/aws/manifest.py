@@ -0,0 +1,205 @@
+"""AWS S3バケットとミラーリングしたファイルの情報を管理するモジュールです。
+
+ダウンロード、アップロードしたS3オブジェクトのETag、サイズ、最終更新日時と、ローカルファイルのサイズ、更新日時を記録し、
+再実行時に新規または変更されたファイルのみを転送するために利用します。
+"""
+import json
+import os
+from typing import Optional
+
+from library.utils.config import path_config
+
+
+MANIFEST_VERSION = 2
+
+
+class MirrorManifest:
+    """ミラーリングしたファイルの情報を保持するマニフェストのクラスです。
+
+    マニフェストファイルは以下の形式で保存されます。
+    ダウンロードしたファイルはローカルファイルの絶対パスで、アップロードしたファイルはアップロード先のバケットとキーで記録するため、
+    同じローカルファイルをダウンロードとアップロードの両方に用いても、互いの記録を上書きしません。
+
+        {
+            "version": 2,
+            "objects": {
+                "<ローカルファイルの絶対パス>": {
+                    "bucket": str, "key": str, "etag": str, "size": int, "last_modified": str,
+                    "local_size": int, "local_mtime": int
+                }
+            },
+            "uploads": {
+                "s3://<バケット名>/<キー>": {
+                    "bucket": str, "key": str, "etag": str, "size": int, "last_modified": str,
+                    "local_path": str, "local_size": int, "local_mtime": int
+                }
+            }
+        }
+
+    記録は全てメモリに保持するため、メモリ使用量は記録したファイル数に比例します(1件あたり数百バイト程度)。
+
+    Attributes:
+        instance:
+            manifest_path(str):マニフェストファイルのパス
+            _data(dict):マニフェストファイルの内容
+    """
+
+    def __init__(self, manifest_path: str) -> None:
+        """クラスのインスタンスの初期化処理を実行するメソッドです。
+
+        マニフェストファイルが存在しない、または読み込めない場合は空のマニフェストとして扱います。
+
+        Args:
+            manifest_path (str):マニフェストファイルのパス
+        """
+        self.manifest_path = manifest_path
+        self._data = self._load()
+
+    def _load(self) -> dict:
+        """マニフェストファイルを読み込むメソッドです。
+
+        Returns:
+            dict:マニフェストファイルの内容を返す。
+        """
+        try:
+            with open(self.manifest_path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        if (
+            data.get('version') != MANIFEST_VERSION
+            or not isinstance(data.get('objects'), dict)
+            or not isinstance(data.get('uploads'), dict)
+        ):
+            data = {'version': MANIFEST_VERSION, 'objects': {}, 'uploads': {}}
+        return data
+
+    @staticmethod
+    def _get_upload_key(bucket_name: str, key: str) -> str:
+        """アップロードの記録に用いるキーを取得するメソッドです。
+
+        Args:
+            bucket_name (str):バケット名
+            key (str):アップロード先のキー
+
+        Returns:
+            str:"s3://<バケット名>/<キー>"の形式の文字列を返す。
+        """
+        return f's3://{bucket_name}/{key}'
+
+    @staticmethod
+    def _build_remote(bucket_name: str, s3_object: dict) -> dict:
+        """list_objects_v2のオブジェクト情報から比較に用いる値を取り出すメソッドです。
+
+        Args:
+            bucket_name (str):バケット名
+            s3_object (dict):list_objects_v2のContentsの要素
+
+        Returns:
+            dict:バケット名、キー、ETag、サイズ、最終更新日時を返す。
+        """
+        last_modified = s3_object.get('LastModified')
+        return {
+            'bucket': bucket_name,
+            'key': s3_object['Key'],
+            'etag': s3_object.get('ETag'),
+            'size': s3_object.get('Size'),
+            'last_modified': last_modified.isoformat() if hasattr(last_modified, 'isoformat') else last_modified,
+        }
+
+    def is_up_to_date(self, bucket_name: str, s3_object: dict, local_path: str) -> bool:
+        """ローカルファイルがS3オブジェクトと同じ内容かを判定するメソッドです。
+
+        前回ダウンロードしたときとS3オブジェクトのETag、サイズ、最終更新日時が一致し、
+        ローカルファイルもダウンロード後に変更されていない場合に同じ内容と判定します。
+
+        Args:
+            bucket_name (str):バケット名
+            s3_object (dict):list_objects_v2のContentsの要素
+            local_path (str):ローカルファイルのパス
+
+        Returns:
+            bool:ダウンロードが不要であればTrue、必要であればFalseを返す。
+        """
+        entry = self._data['objects'].get(os.path.abspath(local_path))
+        if entry is None or not os.path.isfile(local_path):
+            return False
+        remote = self._build_remote(bucket_name, s3_object)
+        if any(entry.get(key) != value for key, value in remote.items()):
+            return False
+        stat = os.stat(local_path)
+        return entry.get('local_size') == stat.st_size and entry.get('local_mtime') == stat.st_mtime_ns
+
+    def is_uploaded(self, bucket_name: str, key: str, local_path: str) -> bool:
+        """ローカルファイルが前回のアップロードから変更されていないかを判定するメソッドです。
+
+        同じバケット、キーへ前回アップロードしたファイルと同じパスで、サイズ、更新日時が一致する場合に未変更と判定します。
+
+        Args:
+            bucket_name (str):バケット名
+            key (str):アップロード先のキー
+            local_path (str):ローカルファイルのパス
+
+        Returns:
+            bool:アップロードが不要であればTrue、必要であればFalseを返す。
+        """
+        entry = self._data['uploads'].get(self._get_upload_key(bucket_name, key))
+        if entry is None or entry.get('local_path') != os.path.abspath(local_path):
+            return False
+        stat = os.stat(local_path)
+        return entry.get('local_size') == stat.st_size and entry.get('local_mtime') == stat.st_mtime_ns
+
+    def record(self, bucket_name: str, s3_object: dict, local_path: str) -> None:
+        """ダウンロードが完了したファイルの情報を記録するメソッドです。
+
+        Args:
+            bucket_name (str):バケット名
+            s3_object (dict):list_objects_v2のContentsの要素
+            local_path (str):ダウンロードしたローカルファイルのパス
+        """
+        entry = self._build_remote(bucket_name, s3_object)
+        stat = os.stat(local_path)
+        entry['local_size'] = stat.st_size
+        entry['local_mtime'] = stat.st_mtime_ns
+        self._data['objects'][os.path.abspath(local_path)] = entry
+
+    def record_upload(self, bucket_name: str, s3_object: dict, local_path: str) -> None:
+        """アップロードが完了したファイルの情報を記録するメソッドです。
+
+        Args:
+            bucket_name (str):バケット名
+            s3_object (dict):list_objects_v2のContentsの要素と同じ形式のアップロードしたS3オブジェクトの情報
+            local_path (str):アップロードしたローカルファイルのパス
+        """
+        entry = self._build_remote(bucket_name, s3_object)
+        stat = os.stat(local_path)
+        entry['local_path'] = os.path.abspath(local_path)
+        entry['local_size'] = stat.st_size
+        entry['local_mtime'] = stat.st_mtime_ns
+        self._data['uploads'][self._get_upload_key(bucket_name, s3_object['Key'])] = entry
+
+    def save(self) -> None:
+        """マニフェストファイルを書き込むメソッドです。
+
+        書き込み途中で中断されても既存のマニフェストが壊れないよう、一時ファイルに書き込んでから置き換えます。
+        """
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = f'{self.manifest_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+
+def get_manifest(manifest_path: Optional[str] = None) -> MirrorManifest:
+    """ミラーリングに用いるマニフェストを取得する関数です。
+
+    Args:
+        manifest_path (Optional[str]):マニフェストファイルのパス.
+            Defaults to None(ホームディレクトリ配下のdata_governance/workingに保存する).
+
+    Returns:
+        MirrorManifest:マニフェストを返す。
+    """
+    if manifest_path is None:
+        manifest_path = os.path.join(os.path.expanduser('~'), path_config.S3_MIRROR_MANIFEST_PATH)
+    return MirrorManifest(manifest_path)
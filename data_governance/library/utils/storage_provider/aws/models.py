@@ -1,21 +1,117 @@
-"""AWS S3バケットからディレクトリまたはファイルをダウンロードする関数が記載されたモジュールです。"""
+"""AWS S3バケットとディレクトリまたはファイルをダウンロード、アップロードする関数が記載されたモジュールです。"""
+import base64
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from functools import partial
+import hashlib
 import os
+import posixpath
+from typing import Any, Callable, Iterator, Optional
 
+from boto3.s3.transfer import TransferConfig
+from s3transfer.utils import ChunksizeAdjuster
 
-def download_file(s3_client, bucket_name: str, aws_path: str, local_path: str):
+from library.utils.error import ChecksumMismatchError
+from library.utils.time_tracker import TimeDiff
+from .manifest import MirrorManifest
+
+
+# ディレクトリのダウンロード、アップロードで同時に転送するファイル数の既定値
+DOWNLOAD_WORKERS = 8
+UPLOAD_WORKERS = 8
+# マルチパートで転送するファイルサイズの閾値と1パートの大きさ(バイト)
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+# 1ファイルのマルチパート転送で同時に転送するパート数
+MULTIPART_CONCURRENCY = 4
+# ディレクトリの転送で、同時に転送するファイル数に対して保持する未完了の転送数の倍率
+IN_FLIGHT_FACTOR = 2
+
+
+class TransferSummary:
+    """ ダウンロード、アップロードの結果を集計するクラスです。
+
+    Attributes:
+        instance:
+            files(int): 転送したファイル数
+            bytes(int): 転送したバイト数
+            seconds(float): 転送に要した秒数
+            skipped(int): 前回の転送から変更が無く転送しなかったファイル数
+    """
+
+    def __init__(self, files: int = 0, bytes: int = 0, seconds: float = 0.0, skipped: int = 0) -> None:
+        """ クラスのインスタンスの初期化処理を実行するメソッドです。
+
+        Args:
+            files (int): 転送したファイル数. Defaults to 0.
+            bytes (int): 転送したバイト数. Defaults to 0.
+            seconds (float): 転送に要した秒数. Defaults to 0.0.
+            skipped (int): 前回の転送から変更が無く転送しなかったファイル数. Defaults to 0.
+        """
+        self.files = files
+        self.bytes = bytes
+        self.seconds = seconds
+        self.skipped = skipped
+
+    @property
+    def bytes_per_second(self) -> float:
+        """ 1秒あたりの転送したバイト数を返すプロパティです。"""
+        if self.seconds <= 0:
+            return 0.0
+        return self.bytes / self.seconds
+
+    def __str__(self) -> str:
+        """ 集計結果を表示用の文字列で返すメソッドです。"""
+        return (
+            f'{self.files} files ({self.skipped} skipped), {self.bytes / 1024 / 1024:.1f} MiB, '
+            f'{self.seconds:.1f} s, {self.bytes_per_second / 1024 / 1024:.1f} MiB/s'
+        )
+
+
+def get_transfer_config(max_concurrency: int = MULTIPART_CONCURRENCY) -> TransferConfig:
+    """ 大きなファイルをマルチパートで転送するための転送設定を取得する関数です。
+
+    Args:
+        max_concurrency (int): 1ファイルで同時に転送するパート数. Defaults to MULTIPART_CONCURRENCY.
+
+    Returns:
+        TransferConfig: 転送設定を返す。
+    """
+    return TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=MULTIPART_CHUNKSIZE,
+        max_concurrency=max_concurrency
+    )
+
+
+def download_file(
+    s3_client, bucket_name: str, aws_path: str, local_path: str, transfer_config: Optional[TransferConfig] = None,
+    manifest: Optional[MirrorManifest] = None
+) -> TransferSummary:
     """指定したAWS S3バケットからファイルをダウンロードする関数です。
 
+    manifestを指定した場合はミラーリングとして扱い、ダウンロード先が既に存在してもエラーとせず、
+    前回のダウンロードから変更が無ければダウンロードを省略します。
+
     Args:
         s3_client (Any):AWS S3にアクセスするためのクライアント
         bucket_name (str):バケット名
         aws_path (str):ダウンロードするファイルへのパス
         local_path (str):ダウンロードしたファイルの保存先を指定するパス
+        transfer_config (Optional[TransferConfig]):転送設定. Defaults to None.
+        manifest (Optional[MirrorManifest]):ミラーリングに用いるマニフェスト. Defaults to None.
+
+    Returns:
+        TransferSummary:ダウンロードの結果を返す。
 
     Raises:
         FileNotFoundError:指定したパスのファイルが存在しない
-        FileExistsError:ダウンロード先のローカルパスが既に存在している
+        FileExistsError:ダウンロード先のローカルパスが既に存在している(ミラーリングでない場合)
 
     """
+    timediff = TimeDiff()
+    timediff.start()
     response = s3_client.list_objects_v2(Bucket=bucket_name, Prefix=aws_path)
     try:
         # キーの確認
@@ -23,27 +119,46 @@ def download_file(s3_client, bucket_name: str, aws_path: str, local_path: str):
     except KeyError as e:
         # 転送元が存在しない
         raise FileNotFoundError from e
-    if os.path.exists(local_path):
-        raise FileExistsError
+    s3_object = next((c for c in contents if c['Key'] == aws_path), None)
+    if manifest is None:
+        if os.path.exists(local_path):
+            raise FileExistsError
+    elif s3_object is not None and manifest.is_up_to_date(bucket_name, s3_object, local_path):
+        timediff.end()
+        return TransferSummary(0, 0, timediff.time_diff, skipped=1)
+    if transfer_config is None:
+        transfer_config = get_transfer_config()
     os.makedirs(os.path.dirname(local_path), exist_ok=True)
-    s3_client.download_file(bucket_name, aws_path, local_path)
+    s3_client.download_file(bucket_name, aws_path, local_path, Config=transfer_config)
+    if manifest is not None and s3_object is not None:
+        manifest.record(bucket_name, s3_object, local_path)
+        manifest.save()
+    timediff.end()
+    return TransferSummary(1, os.path.getsize(local_path), timediff.time_diff)
 
 
-def download_dir(s3_client, bucket_name: str, aws_dir: str, local_dir: str):
-    """指定したAWS S3バケットからディレクトリをダウンロードする関数です。
+def iter_objects(
+    s3_client, bucket_name: str, aws_dir: str,
+    include: Optional[list[str]] = None, exclude: Optional[list[str]] = None
+) -> Iterator[dict]:
+    """指定したディレクトリ配下のS3オブジェクトを1ページずつ取得して順に返すジェネレータです。
+
+    保持するのは取得中の1ページ分のみのため、オブジェクト数に関わらずメモリ使用量は一定です。
+    include、excludeはディレクトリからの相対パスに対するglobパターンで、取得しながら絞り込みます。
 
     Args:
         s3_client(Any):AWS S3にアクセスするためのクライアント
         bucket_name(str):バケット名
-        aws_dir(str):ダウンロードするディレクトリへのパス
-        local_dir(str):ダウンロードしたディレクトリの保存先を指定するパス
+        aws_dir(str):ディレクトリへのパス
+        include(Optional[list[str]]):いずれかに一致するオブジェクトのみを返すパターン. Defaults to None.
+        exclude(Optional[list[str]]):いずれかに一致するオブジェクトを除外するパターン. Defaults to None.
+
+    Yields:
+        dict:list_objects_v2のContentsの要素
 
     Raises:
         FileNotFoundError:指定したパスのファイルが存在しない
-        FileExistsError:ダウンロード先のローカルパスが既に存在している
-
     """
-    paths = {}
     next_token = None
     while True:
         if next_token is None:
@@ -65,19 +180,361 @@ def download_dir(s3_client, bucket_name: str, aws_dir: str, local_dir: str):
                 continue
 
             relative_path = os.path.relpath(s3_file_path, aws_dir)
-            local_object_file_path = os.path.join(local_dir, relative_path)
-
-            # ローカル側にディレクトリパスが存在するか確認する
-            if os.path.exists(local_object_file_path):
-                raise FileExistsError
-            paths[s3_file_path] = local_object_file_path
+            if include and not any(fnmatch(relative_path, pattern) for pattern in include):
+                continue
+            if exclude and any(fnmatch(relative_path, pattern) for pattern in exclude):
+                continue
+            yield s3_object_response
 
         if 'NextContinuationToken' in response:
             next_token = response['NextContinuationToken']
         else:
-            next_token = None
             break
 
-    for aws_file, local_file in paths.items():
-        os.makedirs(os.path.dirname(local_file), exist_ok=True)
-        s3_client.download_file(bucket_name, aws_file, local_file)
+
+def _run_transfers(jobs: Iterator[tuple[Callable[[], Any], Callable[[Any], None]]], max_workers: int) -> None:
+    """転送を一定数ずつ並行して実行する関数です。
+
+    jobsは(転送を実行する関数, 完了した転送の結果を受け取る関数)を順に返すイテレータで、
+    未完了の転送はmax_workers * IN_FLIGHT_FACTOR件までしか保持しないため、転送するファイル数に関わらずメモリ使用量は一定です。
+    いずれかの転送に失敗した場合は、未着手の転送を取り消し、完了済みの転送の結果を受け取ってから例外を送出します。
+
+    Args:
+        jobs(Iterator[tuple[Callable[[], Any], Callable[[Any], None]]]):転送を実行する関数と完了時に呼ぶ関数の組
+        max_workers(int):同時に転送するファイル数
+    """
+    # (Future, 完了時に呼ぶ関数)
+    in_flight = deque()
+    # boto3のクライアントはスレッドセーフなため、全てのスレッドで共有する
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for transfer, on_complete in jobs:
+                in_flight.append((executor.submit(transfer), on_complete))
+                # 一覧の取得が転送より先行しすぎないよう、古い転送の完了を待つ
+                while len(in_flight) >= max_workers * IN_FLIGHT_FACTOR:
+                    future, on_complete = in_flight.popleft()
+                    on_complete(future.result())
+            while in_flight:
+                future, on_complete = in_flight.popleft()
+                on_complete(future.result())
+        except BaseException:
+            for future, _ in in_flight:
+                future.cancel()
+            wait([future for future, _ in in_flight])
+            # 途中で失敗した場合も完了したファイルは次回の転送で再送しない
+            for future, on_complete in in_flight:
+                if not future.cancelled() and future.exception() is None:
+                    on_complete(future.result())
+            raise
+
+
+def download_dir(
+    s3_client, bucket_name: str, aws_dir: str, local_dir: str,
+    max_workers: int = DOWNLOAD_WORKERS, transfer_config: Optional[TransferConfig] = None,
+    manifest: Optional[MirrorManifest] = None,
+    include: Optional[list[str]] = None, exclude: Optional[list[str]] = None
+) -> TransferSummary:
+    """指定したAWS S3バケットからディレクトリをダウンロードする関数です。
+
+    オブジェクトの一覧をページ単位で取得しながら、max_workers件ずつ並行してダウンロードします。
+    未完了のダウンロードは一定数までしか保持しないため、転送処理のメモリ使用量はオブジェクト数に関わらず一定です。
+    いずれかのダウンロードに失敗した場合は、未着手のダウンロードを取り消して例外を送出します。
+    manifestを指定した場合はミラーリングとして扱い、ダウンロード先が既に存在してもエラーとせず、
+    新規または前回のダウンロードから変更されたオブジェクトのみをダウンロードします。
+    この場合、マニフェストは過去にミラーリングした全てのファイルの記録(1件あたり数百バイト程度)をメモリに保持するため、
+    メモリ使用量はマニフェストに記録したファイル数に比例します。
+    ミラーリングでない場合に保存先のディレクトリが既に存在するときは、既存のファイルを上書きしないよう、
+    ダウンロードを始める前に一覧を全て取得して確認し、取得した一覧をそのままダウンロードに用いるため、
+    メモリ使用量はオブジェクト数に比例します。
+
+    Args:
+        s3_client(Any):AWS S3にアクセスするためのクライアント
+        bucket_name(str):バケット名
+        aws_dir(str):ダウンロードするディレクトリへのパス
+        local_dir(str):ダウンロードしたディレクトリの保存先を指定するパス
+        max_workers(int):同時にダウンロードするファイル数. Defaults to DOWNLOAD_WORKERS.
+        transfer_config(Optional[TransferConfig]):転送設定. Defaults to None.
+        manifest(Optional[MirrorManifest]):ミラーリングに用いるマニフェスト. Defaults to None.
+        include(Optional[list[str]]):ダウンロードするファイルを絞り込むglobパターン. Defaults to None.
+        exclude(Optional[list[str]]):ダウンロードしないファイルのglobパターン. Defaults to None.
+
+    Returns:
+        TransferSummary:ダウンロードの結果を返す。
+
+    Raises:
+        FileNotFoundError:指定したパスのファイルが存在しない
+        FileExistsError:ダウンロード先のローカルパスが既に存在している(ミラーリングでない場合)
+        ValueError:max_workersが1未満
+
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be 1 or more, got {max_workers}.")
+    timediff = TimeDiff()
+    timediff.start()
+
+    def get_local_path(s3_object: dict) -> str:
+        """S3オブジェクトの保存先のパスを取得する関数です。"""
+        return os.path.join(local_dir, os.path.relpath(s3_object['Key'], aws_dir))
+
+    s3_objects = iter_objects(s3_client, bucket_name, aws_dir, include, exclude)
+    if manifest is None and os.path.exists(local_dir):
+        # 一覧を二度取得しないよう、確認に用いた一覧を保持してダウンロードする
+        s3_objects = list(s3_objects)
+        for s3_object in s3_objects:
+            # ローカル側にディレクトリパスが存在するか確認する
+            if os.path.exists(get_local_path(s3_object)):
+                raise FileExistsError
+
+    if transfer_config is None:
+        transfer_config = get_transfer_config()
+    summary = TransferSummary()
+
+    def complete(s3_object: dict, local_path: str, _) -> None:
+        """完了したダウンロードを集計し、マニフェストに記録する関数です。"""
+        summary.files += 1
+        summary.bytes += s3_object.get('Size', 0)
+        if manifest is not None:
+            manifest.record(bucket_name, s3_object, local_path)
+
+    def iter_jobs() -> Iterator[tuple[Callable[[], Any], Callable[[Any], None]]]:
+        """ダウンロードが必要なオブジェクトのダウンロード処理を順に返すジェネレータです。"""
+        for s3_object in s3_objects:
+            local_path = get_local_path(s3_object)
+            if manifest is not None and manifest.is_up_to_date(bucket_name, s3_object, local_path):
+                summary.skipped += 1
+                continue
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            yield (
+                partial(s3_client.download_file, bucket_name, s3_object['Key'], local_path, Config=transfer_config),
+                partial(complete, s3_object, local_path)
+            )
+
+    try:
+        _run_transfers(iter_jobs(), max_workers)
+    finally:
+        if manifest is not None:
+            manifest.save()
+
+    timediff.end()
+    summary.seconds = timediff.time_diff
+    return summary
+
+
+def get_sha256_checksum(local_path: str, transfer_config: TransferConfig) -> str:
+    """アップロードしたオブジェクトのSHA-256チェックサムとして期待される値を計算する関数です。
+
+    マルチパートでアップロードする場合、S3はパートごとのハッシュ値を連結したもののハッシュ値に
+    パート数を付けた値を返すため、boto3と同じ大きさでパートに分けて計算します。
+
+    Args:
+        local_path(str):ローカルファイルのパス
+        transfer_config(TransferConfig):アップロードに用いる転送設定
+
+    Returns:
+        str:base64エンコードしたチェックサムを返す。
+    """
+    size = os.path.getsize(local_path)
+    if size < transfer_config.multipart_threshold:
+        hash_ = hashlib.sha256()
+        with open(local_path, 'rb') as f:
+            for block in iter(lambda: f.read(MULTIPART_CHUNKSIZE), b''):
+                hash_.update(block)
+        return base64.b64encode(hash_.digest()).decode('ascii')
+
+    chunksize = ChunksizeAdjuster().adjust_chunksize(transfer_config.multipart_chunksize, size)
+    parts = []
+    with open(local_path, 'rb') as f:
+        for block in iter(lambda: f.read(chunksize), b''):
+            parts.append(hashlib.sha256(block).digest())
+    checksum = base64.b64encode(hashlib.sha256(b''.join(parts)).digest()).decode('ascii')
+    return f'{checksum}-{len(parts)}'
+
+
+def upload_and_verify(
+    s3_client, bucket_name: str, local_path: str, key: str, transfer_config: TransferConfig
+) -> dict:
+    """ファイルをアップロードし、アップロードしたオブジェクトのサイズとチェックサムを確認する関数です。
+
+    S3互換のストレージなどでチェックサムが返されない場合は、サイズのみを確認します。
+
+    Args:
+        s3_client(Any):AWS S3にアクセスするためのクライアント
+        bucket_name(str):バケット名
+        local_path(str):アップロードするファイルのパス
+        key(str):アップロード先のキー
+        transfer_config(TransferConfig):転送設定
+
+    Returns:
+        dict:アップロードしたオブジェクトのキー、ETag、サイズ、最終更新日時を返す。
+
+    Raises:
+        ChecksumMismatchError:アップロードしたオブジェクトがローカルファイルと一致しない
+    """
+    s3_client.upload_file(
+        local_path, bucket_name, key, ExtraArgs={'ChecksumAlgorithm': 'SHA256'}, Config=transfer_config
+    )
+    response = s3_client.head_object(Bucket=bucket_name, Key=key, ChecksumMode='ENABLED')
+    size = os.path.getsize(local_path)
+    if response.get('ContentLength') != size:
+        raise ChecksumMismatchError(
+            f'Size mismatch for s3://{bucket_name}/{key}: expected {size}, got {response.get("ContentLength")}.'
+        )
+    remote_checksum = response.get('ChecksumSHA256')
+    if remote_checksum is not None:
+        local_checksum = get_sha256_checksum(local_path, transfer_config)
+        if remote_checksum != local_checksum:
+            raise ChecksumMismatchError(
+                f'Checksum mismatch for s3://{bucket_name}/{key}: expected {local_checksum}, got {remote_checksum}.'
+            )
+    return {
+        'Key': key,
+        'ETag': response.get('ETag'),
+        'Size': response.get('ContentLength'),
+        'LastModified': response.get('LastModified'),
+    }
+
+
+def upload_file(
+    s3_client, bucket_name: str, local_path: str, aws_path: str, transfer_config: Optional[TransferConfig] = None,
+    manifest: Optional[MirrorManifest] = None
+) -> TransferSummary:
+    """指定したAWS S3バケットへファイルをアップロードする関数です。
+
+    aws_pathが"/"で終わる場合はそのディレクトリ配下に、空文字の場合はバケットの直下に、ローカルファイルと同じ名前でアップロードします。
+    manifestを指定した場合は、前回のアップロードからファイルが変更されていなければアップロードを省略します。
+
+    Args:
+        s3_client (Any):AWS S3にアクセスするためのクライアント
+        bucket_name (str):バケット名
+        local_path (str):アップロードするファイルのパス
+        aws_path (str):アップロード先のパス
+        transfer_config (Optional[TransferConfig]):転送設定. Defaults to None.
+        manifest (Optional[MirrorManifest]):差分アップロードに用いるマニフェスト. Defaults to None.
+
+    Returns:
+        TransferSummary:アップロードの結果を返す。
+
+    Raises:
+        FileNotFoundError:アップロードするファイルが存在しない
+        ChecksumMismatchError:アップロードしたオブジェクトがローカルファイルと一致しない
+
+    """
+    timediff = TimeDiff()
+    timediff.start()
+    if not os.path.isfile(local_path):
+        raise FileNotFoundError(local_path)
+    if not aws_path or aws_path.endswith('/'):
+        key = posixpath.join(aws_path, os.path.basename(local_path))
+    else:
+        key = aws_path
+    if manifest is not None and manifest.is_uploaded(bucket_name, key, local_path):
+        timediff.end()
+        return TransferSummary(0, 0, timediff.time_diff, skipped=1)
+    if transfer_config is None:
+        transfer_config = get_transfer_config()
+    s3_object = upload_and_verify(s3_client, bucket_name, local_path, key, transfer_config)
+    if manifest is not None:
+        manifest.record_upload(bucket_name, s3_object, local_path)
+        manifest.save()
+    timediff.end()
+    return TransferSummary(1, s3_object['Size'], timediff.time_diff)
+
+
+def iter_local_files(
+    local_dir: str, include: Optional[list[str]] = None, exclude: Optional[list[str]] = None
+) -> Iterator[tuple[str, str]]:
+    """指定したディレクトリ配下のファイルを順に返すジェネレータです。
+
+    include、excludeはディレクトリからの相対パスに対するglobパターンで、走査しながら絞り込みます。
+
+    Args:
+        local_dir(str):ディレクトリへのパス
+        include(Optional[list[str]]):いずれかに一致するファイルのみを返すパターン. Defaults to None.
+        exclude(Optional[list[str]]):いずれかに一致するファイルを除外するパターン. Defaults to None.
+
+    Yields:
+        tuple[str, str]:(ファイルのパス, "/"区切りのディレクトリからの相対パス)
+    """
+    for dirpath, dirnames, filenames in os.walk(local_dir):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            local_path = os.path.join(dirpath, filename)
+            relative_path = os.path.relpath(local_path, local_dir).replace(os.sep, '/')
+            if include and not any(fnmatch(relative_path, pattern) for pattern in include):
+                continue
+            if exclude and any(fnmatch(relative_path, pattern) for pattern in exclude):
+                continue
+            yield local_path, relative_path
+
+
+def upload_dir(
+    s3_client, bucket_name: str, local_dir: str, aws_dir: str,
+    max_workers: int = UPLOAD_WORKERS, transfer_config: Optional[TransferConfig] = None,
+    manifest: Optional[MirrorManifest] = None,
+    include: Optional[list[str]] = None, exclude: Optional[list[str]] = None
+) -> TransferSummary:
+    """指定したAWS S3バケットへディレクトリをアップロードする関数です。
+
+    ディレクトリを走査しながら、max_workers件ずつ並行してアップロードします。
+    いずれかのアップロードに失敗した場合は、未着手のアップロードを取り消して例外を送出します。
+    manifestを指定した場合は、新規または前回のアップロードから変更されたファイルのみをアップロードします。
+
+    Args:
+        s3_client(Any):AWS S3にアクセスするためのクライアント
+        bucket_name(str):バケット名
+        local_dir(str):アップロードするディレクトリのパス
+        aws_dir(str):アップロード先のディレクトリへのパス
+        max_workers(int):同時にアップロードするファイル数. Defaults to UPLOAD_WORKERS.
+        transfer_config(Optional[TransferConfig]):転送設定. Defaults to None.
+        manifest(Optional[MirrorManifest]):差分アップロードに用いるマニフェスト. Defaults to None.
+        include(Optional[list[str]]):アップロードするファイルを絞り込むglobパターン. Defaults to None.
+        exclude(Optional[list[str]]):アップロードしないファイルのglobパターン. Defaults to None.
+
+    Returns:
+        TransferSummary:アップロードの結果を返す。
+
+    Raises:
+        FileNotFoundError:アップロードするディレクトリが存在しない
+        ChecksumMismatchError:アップロードしたオブジェクトがローカルファイルと一致しない
+        ValueError:max_workersが1未満
+
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be 1 or more, got {max_workers}.")
+    if not os.path.isdir(local_dir):
+        raise FileNotFoundError(local_dir)
+    timediff = TimeDiff()
+    timediff.start()
+
+    if transfer_config is None:
+        transfer_config = get_transfer_config()
+    summary = TransferSummary()
+
+    def complete(local_path: str, s3_object: dict) -> None:
+        """完了したアップロードを集計し、マニフェストに記録する関数です。"""
+        summary.files += 1
+        summary.bytes += s3_object['Size']
+        if manifest is not None:
+            manifest.record_upload(bucket_name, s3_object, local_path)
+
+    def iter_jobs() -> Iterator[tuple[Callable[[], Any], Callable[[Any], None]]]:
+        """アップロードが必要なファイルのアップロード処理を順に返すジェネレータです。"""
+        for local_path, relative_path in iter_local_files(local_dir, include, exclude):
+            key = posixpath.join(aws_dir, relative_path)
+            if manifest is not None and manifest.is_uploaded(bucket_name, key, local_path):
+                summary.skipped += 1
+                continue
+            yield (
+                partial(upload_and_verify, s3_client, bucket_name, local_path, key, transfer_config),
+                partial(complete, local_path)
+            )
+
+    try:
+        _run_transfers(iter_jobs(), max_workers)
+    finally:
+        if manifest is not None:
+            manifest.save()
+
+    timediff.end()
+    summary.seconds = timediff.time_diff
+    return summary
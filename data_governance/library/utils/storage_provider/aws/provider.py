@@ -0,0 +1,191 @@
+"""AWS S3バケットを保存先とするストレージプロバイダのモジュールです。
+
+boto3のクライアントは同期処理のため、転送はイベントループを止めないよう別スレッドで実行します。
+"""
+import asyncio
+import os
+import posixpath
+from typing import AsyncIterator
+
+from botocore.exceptions import ClientError
+
+from ..base import StorageObject, StorageProvider
+from .main import get_client
+from .models import UPLOAD_WORKERS, get_transfer_config, iter_objects, upload_and_verify
+
+
+# streamで一度に読み込むバイト数
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+class S3StorageProvider(StorageProvider):
+    """AWS S3バケットを保存先とするストレージプロバイダのクラスです。
+
+    パスはprefixからの相対パスで指定します。
+
+    Attributes:
+        instance:
+            bucket_name(str):バケット名
+            prefix(str):保存先のディレクトリへのパス
+            s3_client(Any):AWS S3にアクセスするためのクライアント
+            transfer_config(TransferConfig):転送設定
+    """
+
+    def __init__(
+        self, access_key: str, secret_key: str, bucket_name: str, prefix: str = '',
+        max_workers: int = UPLOAD_WORKERS
+    ) -> None:
+        """クラスのインスタンスの初期化処理を実行するメソッドです。
+
+        Args:
+            access_key (str):クライアント作成に用いるアクセスキー
+            secret_key (str):クライアント作成に用いるシークレットキー
+            bucket_name (str):バケット名
+            prefix (str):保存先のディレクトリへのパス. Defaults to ''(バケットのルート).
+            max_workers (int):同時に転送するファイル数. Defaults to UPLOAD_WORKERS.
+        """
+        self.bucket_name = bucket_name
+        self.prefix = prefix.strip('/')
+        self.s3_client = get_client(access_key, secret_key, max_workers)
+        self.transfer_config = get_transfer_config()
+
+    @property
+    def manifest_key(self) -> str:
+        """同期済みファイルのマニフェストで保存先を区別するキーを返すプロパティです。"""
+        return f's3:{self.bucket_name}/{self.prefix}'
+
+    def _get_key(self, path: str) -> str:
+        """相対パスからS3オブジェクトのキーを取得するメソッドです。
+
+        Args:
+            path (str):prefixからの相対パス
+
+        Returns:
+            str:S3オブジェクトのキーを返す。
+        """
+        return posixpath.join(self.prefix, path.strip('/')) if self.prefix else path.strip('/')
+
+    def _build_object(self, key: str, size: int, modified) -> StorageObject:
+        """S3オブジェクトの情報からファイルの情報を作成するメソッドです。
+
+        Args:
+            key (str):S3オブジェクトのキー
+            size (int):S3オブジェクトのサイズ
+            modified (datetime.datetime):S3オブジェクトの最終更新日時
+
+        Returns:
+            StorageObject:ファイルの情報を返す。
+        """
+        path = posixpath.relpath(key, self.prefix) if self.prefix else key
+        return StorageObject(path, size, modified)
+
+    async def list_files(self, path: str = '') -> list[StorageObject]:
+        """ディレクトリ配下のファイルを再帰的に取得するメソッドです。
+
+        Args:
+            path (str):ディレクトリの相対パス. Defaults to ''(prefixのルート).
+
+        Returns:
+            list[StorageObject]:ファイルの情報のリストを返す。
+        """
+        aws_dir = self._get_key(path)
+        aws_dir = f'{aws_dir}/' if aws_dir else ''
+
+        def list_objects() -> list[StorageObject]:
+            """オブジェクトの一覧を取得する関数です。"""
+            try:
+                return [
+                    self._build_object(s3_object['Key'], s3_object.get('Size'), s3_object.get('LastModified'))
+                    for s3_object in iter_objects(self.s3_client, self.bucket_name, aws_dir)
+                ]
+            except FileNotFoundError:
+                return []
+
+        return await asyncio.to_thread(list_objects)
+
+    async def stat(self, path: str) -> StorageObject:
+        """ファイルの情報を取得するメソッドです。
+
+        Args:
+            path (str):ファイルの相対パス
+
+        Returns:
+            StorageObject:ファイルの情報を返す。
+
+        Raises:
+            FileNotFoundError:指定したファイルが存在しない
+        """
+        key = self._get_key(path)
+        try:
+            response = await asyncio.to_thread(self.s3_client.head_object, Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey'):
+                raise FileNotFoundError(f'The specified file (path: {path}) does not exist.') from e
+            raise
+        return self._build_object(key, response.get('ContentLength'), response.get('LastModified'))
+
+    async def get(self, path: str, local_path: str) -> int:
+        """ファイルをローカルのパスにダウンロードするメソッドです。
+
+        Args:
+            path (str):ファイルの相対パス
+            local_path (str):保存先のローカルパス
+
+        Returns:
+            int:ダウンロードしたファイルのサイズを返す。
+
+        Raises:
+            FileNotFoundError:指定したファイルが存在しない
+        """
+        await self.stat(path)
+        os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+        await asyncio.to_thread(
+            self.s3_client.download_file, self.bucket_name, self._get_key(path), local_path,
+            Config=self.transfer_config
+        )
+        return os.path.getsize(local_path)
+
+    async def put(self, local_path: str, path: str) -> None:
+        """ローカルのファイルをアップロードし、サイズとチェックサムを確認するメソッドです。
+
+        Args:
+            local_path (str):アップロードするローカルパス
+            path (str):アップロード先の相対パス
+
+        Raises:
+            ChecksumMismatchError:アップロードしたオブジェクトがローカルファイルと一致しない
+        """
+        await asyncio.to_thread(
+            upload_and_verify, self.s3_client, self.bucket_name, local_path, self._get_key(path),
+            self.transfer_config
+        )
+
+    async def stream(self, path: str) -> AsyncIterator[bytes]:
+        """ファイルの内容を先頭から順に少しずつ取得するメソッドです。
+
+        Args:
+            path (str):ファイルの相対パス
+
+        Yields:
+            bytes:ファイルの内容の一部
+
+        Raises:
+            FileNotFoundError:指定したファイルが存在しない
+        """
+        try:
+            response = await asyncio.to_thread(
+                self.s3_client.get_object, Bucket=self.bucket_name, Key=self._get_key(path)
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey'):
+                raise FileNotFoundError(f'The specified file (path: {path}) does not exist.') from e
+            raise
+        body = response['Body']
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
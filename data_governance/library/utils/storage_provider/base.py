@@ -0,0 +1,205 @@
+""" ストレージプロバイダの共通のインターフェースが記載されたモジュールです。
+
+GRDM、AWS S3、ローカルディレクトリなどの保存先を同じメソッドで扱うための基底クラスです。
+パスは全てプロバイダのルートからの"/"区切りの相対パスで指定します。
+"""
+from abc import ABC, abstractmethod
+import asyncio
+import datetime
+import os
+import time
+from typing import AsyncIterator, Callable, Optional
+
+from .stats import TransferStats
+from library.utils.config import connect as con_config
+
+
+# 同時に転送するファイル数の既定値、全てのプロバイダで共通の値をconnect.iniから読み込む
+TRANSFER_CONCURRENCY = int(con_config.get('GRDM', 'UPLOAD_CONCURRENCY'))
+
+
+class StorageObject:
+    """ ストレージ上のファイルの情報を保持するクラスです。
+
+    Attributes:
+        instance:
+            path(str): プロバイダのルートからの相対パス
+            size(Optional[int]): ファイルサイズ(バイト)
+            modified(Optional[datetime.datetime]): 最終更新日時
+    """
+
+    def __init__(
+        self, path: str, size: Optional[int] = None, modified: Optional[datetime.datetime] = None
+    ) -> None:
+        """ クラスのインスタンスの初期化処理を実行するメソッドです。
+
+        Args:
+            path (str): プロバイダのルートからの相対パス
+            size (Optional[int]): ファイルサイズ(バイト). Defaults to None.
+            modified (Optional[datetime.datetime]): 最終更新日時. Defaults to None.
+        """
+        self.path = path
+        self.size = size
+        self.modified = modified
+
+    def __repr__(self) -> str:
+        """ インスタンスを表示用の文字列で返すメソッドです。"""
+        return f'StorageObject(path={self.path!r}, size={self.size!r}, modified={self.modified!r})'
+
+
+class StorageProvider(ABC):
+    """ ストレージプロバイダの抽象基底クラスです。
+
+    サブクラスはmanifest_key、list_files、stat、get、put、streamを実装します。
+    put_filesは既定ではputを並行して呼び出しますが、まとめて送信できるプロバイダは上書きします。
+    """
+
+    @property
+    @abstractmethod
+    def manifest_key(self) -> str:
+        """ 同期済みファイルのマニフェストで保存先を区別するキーを返すプロパティです。
+
+        保存先が変わった場合に同期済みの記録を引き継がないよう、プロバイダの種類と保存先を含めます。
+        """
+
+    @abstractmethod
+    async def list_files(self, path: str = '') -> list[StorageObject]:
+        """ ディレクトリ配下のファイルを再帰的に取得するメソッドです。
+
+        Args:
+            path (str): ディレクトリの相対パス. Defaults to ''(ルート).
+
+        Returns:
+            list[StorageObject]: ファイルの情報のリストを返す。
+        """
+
+    @abstractmethod
+    async def stat(self, path: str) -> StorageObject:
+        """ ファイルの情報を取得するメソッドです。
+
+        Args:
+            path (str): ファイルの相対パス
+
+        Returns:
+            StorageObject: ファイルの情報を返す。
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+        """
+
+    @abstractmethod
+    async def get(self, path: str, local_path: str) -> int:
+        """ ファイルをローカルのパスにダウンロードするメソッドです。
+
+        Args:
+            path (str): ファイルの相対パス
+            local_path (str): 保存先のローカルパス
+
+        Returns:
+            int: ダウンロードしたファイルのサイズを返す。
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+        """
+
+    @abstractmethod
+    async def put(self, local_path: str, path: str) -> None:
+        """ ローカルのファイルをアップロードするメソッドです。既にファイルが存在する場合は上書きします。
+
+        Args:
+            local_path (str): アップロードするローカルパス
+            path (str): アップロード先の相対パス
+        """
+
+    @abstractmethod
+    def stream(self, path: str) -> AsyncIterator[bytes]:
+        """ ファイルの内容を先頭から順に少しずつ取得する非同期イテレータを返すメソッドです。
+
+        サブクラスでは非同期ジェネレータとして実装します。
+
+        Args:
+            path (str): ファイルの相対パス
+
+        Returns:
+            AsyncIterator[bytes]: ファイルの内容の一部を順に返す非同期イテレータを返す。
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+        """
+
+    async def put_files(
+        self, upload_files: list[tuple[str, str]], max_concurrency: int = TRANSFER_CONCURRENCY,
+        progress: Optional[Callable[[int, int], None]] = None,
+        on_complete: Optional[Callable[[str, str], None]] = None, stats: Optional[TransferStats] = None,
+        synced: Optional[dict[str, dict]] = None
+    ) -> None:
+        """ 複数のファイルをそれぞれの相対パスにアップロードするメソッドです。
+
+        最大max_concurrency個のファイルを並行してアップロードします。
+        syncedに記録があるファイルは、保存先のファイルが記録と一致する場合は送信しません。
+        保存先で削除または置き換えられていた場合は送信し直します。
+        いずれかのアップロードが失敗した場合は残りのアップロードを中断して例外を送出します。
+
+        Args:
+            upload_files (list[tuple[str, str]]): (ローカルパス, アップロード先の相対パス)のリスト
+            max_concurrency (int): 同時にアップロードするファイル数の上限. Defaults to TRANSFER_CONCURRENCY.
+            progress (Callable[[int, int], None]): ファイル1件のアップロード完了ごとに
+                (完了件数, 全件数)で呼び出される関数. Defaults to None.
+            on_complete (Callable[[str, str], None]): ファイル1件のアップロード完了ごとに
+                (ローカルパス, 相対パス)で呼び出される関数. Defaults to None.
+            stats (Optional[TransferStats]): 転送の計測値を記録するインスタンス. Defaults to None.
+            synced (Optional[dict[str, dict]]): 相対パスをキーとする前回の同期で記録したファイルの情報
+                (size、md5). Defaults to None.
+
+        Raises:
+            ValueError: max_concurrencyが1未満
+        """
+        if max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be 1 or more. (max_concurrency: {max_concurrency})')
+        queue = iter(upload_files)
+        total = len(upload_files)
+        done = 0
+
+        async def worker():
+            """ 共有のファイル一覧から順にファイルを取り出してアップロードする関数です。"""
+            nonlocal done
+            for local_path, path in queue:
+                entry = synced.get(path) if synced else None
+                if entry is None or not await self._is_synced(path, entry):
+                    started = time.monotonic()
+                    await self.put(local_path, path)
+                    TransferStats.current().add_file(os.path.getsize(local_path), time.monotonic() - started)
+                done += 1
+                if on_complete is not None:
+                    on_complete(local_path, path)
+                if progress is not None:
+                    progress(done, total)
+
+        with TransferStats.track(stats):
+            # 作成したタスクは計測中のTransferStatsを引き継ぐ
+            tasks = [asyncio.ensure_future(worker()) for _ in range(min(max_concurrency, total))]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _is_synced(self, path: str, entry: dict) -> bool:
+        """ 保存先のファイルが前回の同期で記録した内容のまま残っているかを判定するメソッドです。
+
+        既定ではハッシュ値を取得できないため、ファイルの有無とサイズで判定します。
+
+        Args:
+            path (str): ファイルの相対パス
+            entry (dict): 前回の同期で記録したファイルの情報
+
+        Returns:
+            bool: 記録と一致するファイルが存在すればTrue、無ければFalseを返す。
+        """
+        try:
+            obj = await self.stat(path)
+        except FileNotFoundError:
+            return False
+        return obj.size == entry['size']
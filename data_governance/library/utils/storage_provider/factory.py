@@ -0,0 +1,77 @@
+""" 保存先の種類を指定してストレージプロバイダを作成するモジュールです。
+
+利用しないプロバイダの依存パッケージを読み込まないよう、各プロバイダのモジュールは作成時に読み込みます。
+"""
+import os
+
+from .base import StorageProvider
+from library.utils.config import connect as con_config
+
+
+# 保存先の種類
+PROVIDER_GRDM = 'grdm'
+PROVIDER_S3 = 's3'
+PROVIDER_LOCAL = 'local'
+
+
+def get_storage_provider(kind: str, **options) -> StorageProvider:
+    """ 保存先の種類に応じたストレージプロバイダを作成する関数です。
+
+    optionsには各プロバイダのコンストラクタの引数を指定します。
+
+        grdm: token, base_url, project_id, storage
+        s3: access_key, secret_key, bucket_name, prefix, max_workers
+        local: root_dir
+
+    Args:
+        kind (str): 保存先の種類('grdm', 's3', 'local')
+        **options: プロバイダのコンストラクタに渡す引数
+
+    Returns:
+        StorageProvider: ストレージプロバイダを返す。
+
+    Raises:
+        ValueError: 保存先の種類が不正
+    """
+    if kind == PROVIDER_GRDM:
+        from .grdm.provider import GrdmStorageProvider
+        return GrdmStorageProvider(**options)
+    if kind == PROVIDER_S3:
+        from .aws.provider import S3StorageProvider
+        return S3StorageProvider(**options)
+    if kind == PROVIDER_LOCAL:
+        from .local import LocalStorageProvider
+        return LocalStorageProvider(**options)
+    raise ValueError(f'Unknown storage provider: {kind}')
+
+
+def get_sync_provider(token: str, base_url: str, project_id: str, external=None) -> StorageProvider:
+    """ リサーチフローの同期に用いるストレージプロバイダを作成する関数です。
+
+    保存先の種類はconnect.iniのSTORAGEセクションのPROVIDERで指定します。
+    localの場合は、LOCAL_ROOTで指定したディレクトリ配下にプロジェクトIDごとのディレクトリを保存先とします。
+    localはGRDMに接続せずに同期処理を検証するためのもので、DG-webなどGRDMを直接参照する外部サービスからは
+    ファイルを参照できないため、運用には利用しないでください。
+    s3は認証情報をリサーチフローで扱わないため、同期には利用できません。
+
+    Args:
+        token (str): GRDMのパーソナルアクセストークン
+        base_url (str): GRDMのURL (e.g. https://rdm.nii.ac.jp)
+        project_id (str): プロジェクトID
+        external (Optional[External]): 保存先がgrdmの場合に通信に用いるインスタンス. Defaults to None.
+
+    Returns:
+        StorageProvider: ストレージプロバイダを返す。
+
+    Raises:
+        ValueError: 保存先の種類が不正、または同期に利用できない
+    """
+    kind = con_config.get('STORAGE', 'PROVIDER')
+    if kind == PROVIDER_GRDM:
+        return get_storage_provider(
+            kind, token=token, base_url=base_url, project_id=project_id, external=external
+        )
+    if kind == PROVIDER_LOCAL:
+        root_dir = os.path.join(os.path.expanduser(con_config.get('STORAGE', 'LOCAL_ROOT')), project_id)
+        return get_storage_provider(kind, root_dir=root_dir)
+    raise ValueError(f'Storage provider not available for sync: {kind}')
@@ -0,0 +1,189 @@
+""" GRDMの権限チェックの結果を一定時間保持するモジュールです。
+
+パーソナルアクセストークンの権限やプロジェクトへのアクセス権限のチェック結果を有効期限付きで保持し、
+同じトークンとプロジェクトIDの組み合わせに対するAPIへの問い合わせを省略します。
+トークンそのものは保持せず、SHA-256のハッシュ値をキーとして利用します。
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from library.utils.config import path_config, connect as con_config
+
+
+_auth_cache = None
+_auth_cache_lock = threading.Lock()
+
+
+def token_fingerprint(token: str) -> str:
+    """ パーソナルアクセストークンのハッシュ値を取得する関数です。
+
+    Args:
+        token (str): パーソナルアクセストークン
+
+    Returns:
+        str: 16進数表記のSHA-256ハッシュ値を返す。
+    """
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+class AuthCache:
+    """ 権限チェックに成功した結果を有効期限付きで保持するクラスです。
+
+    チェックに成功した結果のみを保持し、失敗した結果は保持しません。
+    cache_pathを指定した場合はファイルにも保存し、プロセスをまたいで結果を利用します。
+    チェックは別スレッドから並行して実行されるため、保持する結果の更新はロックで保護します。
+    ファイルは以下の形式で保存されます。
+
+        {
+            "<チェックの種類>:<GRDMのURL>:<トークンのハッシュ値>:<プロジェクトID>": <有効期限(UNIX時間)>
+        }
+
+    Attributes:
+        instance:
+            ttl(float): チェック結果の有効期間(秒)
+            cache_path(str): チェック結果を保存するファイルのパス
+            _entries(dict): キーと有効期限の辞書
+            _lock(threading.Lock): _entriesの更新とファイルへの保存を保護するロック
+    """
+
+    def __init__(self, ttl: float, cache_path: Optional[str] = None) -> None:
+        """ クラスのインスタンスの初期化処理を実行するメソッドです。
+
+        Args:
+            ttl (float): チェック結果の有効期間(秒)
+            cache_path (Optional[str]): チェック結果を保存するファイルのパス. Defaults to None.
+        """
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self._entries = self._load()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build_key(kind: str, base_url: str, token: str, project_id: str = '') -> str:
+        """ チェック結果のキーを作成するメソッドです。
+
+        Args:
+            kind (str): チェックの種類
+            base_url (str): GRDMのURL
+            token (str): パーソナルアクセストークン
+            project_id (str): プロジェクトID. Defaults to ''.
+
+        Returns:
+            str: チェック結果のキーを返す。
+        """
+        return f'{kind}:{base_url}:{token_fingerprint(token)}:{project_id}'
+
+    def _load(self) -> dict:
+        """ 保存されたチェック結果を読み込むメソッドです。
+
+        Returns:
+            dict: 有効期限内のチェック結果を返す。
+        """
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        now = time.time()
+        return {
+            key: expires for key, expires in data.items()
+            if isinstance(expires, (int, float)) and expires > now
+        }
+
+    def _save(self) -> None:
+        """ チェック結果をファイルに保存するメソッドです。
+
+        保存に失敗した場合もプロセス内のチェック結果は利用できるため、エラーは無視します。
+        """
+        if not self.cache_path:
+            return
+        tmp_path = f'{self.cache_path}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+    def is_valid(self, kind: str, base_url: str, token: str, project_id: str = '') -> bool:
+        """ 有効期限内のチェック結果が保持されているかを判定するメソッドです。
+
+        Args:
+            kind (str): チェックの種類
+            base_url (str): GRDMのURL
+            token (str): パーソナルアクセストークン
+            project_id (str): プロジェクトID. Defaults to ''.
+
+        Returns:
+            bool: 有効期限内のチェック結果があればTrue、無ければFalseを返す。
+        """
+        key = self._build_key(kind, base_url, token, project_id)
+        with self._lock:
+            expires = self._entries.get(key)
+            if expires is None:
+                return False
+            if expires <= time.time():
+                del self._entries[key]
+                return False
+            return True
+
+    def add(self, kind: str, base_url: str, token: str, project_id: str = '') -> None:
+        """ チェックに成功した結果を保持するメソッドです。
+
+        Args:
+            kind (str): チェックの種類
+            base_url (str): GRDMのURL
+            token (str): パーソナルアクセストークン
+            project_id (str): プロジェクトID. Defaults to ''.
+        """
+        if self.ttl <= 0:
+            return
+        key = self._build_key(kind, base_url, token, project_id)
+        with self._lock:
+            self._entries[key] = time.time() + self.ttl
+            self._save()
+
+    def invalidate(self, token: str) -> None:
+        """ パーソナルアクセストークンに対するチェック結果を全て破棄するメソッドです。
+
+        Args:
+            token (str): パーソナルアクセストークン
+        """
+        fingerprint = token_fingerprint(token)
+        with self._lock:
+            keys = [key for key in self._entries if key.split(':')[-2] == fingerprint]
+            if not keys:
+                return
+            for key in keys:
+                del self._entries[key]
+            self._save()
+
+
+def get_auth_cache() -> AuthCache:
+    """ プロセス内で共有する権限チェック結果のキャッシュを取得する関数です。
+
+    有効期間とファイルへの保存の有無はconnect.iniの[GRDM]セクションで設定します。
+    複数のスレッドから同時に呼び出されても1つだけ作成するよう、作成はロックで保護します。
+
+    Returns:
+        AuthCache: プロセス内で共有するキャッシュを返す。
+    """
+    global _auth_cache
+    if _auth_cache is None:
+        with _auth_cache_lock:
+            if _auth_cache is None:
+                ttl = float(con_config.get('GRDM', 'AUTH_CACHE_TTL'))
+                cache_path = None
+                if con_config.get('GRDM', 'AUTH_CACHE_PERSIST').lower() == 'true':
+                    cache_path = os.path.join(os.path.expanduser('~'), path_config.GRDM_AUTH_CACHE_PATH)
+                _auth_cache = AuthCache(ttl, cache_path)
+    return _auth_cache
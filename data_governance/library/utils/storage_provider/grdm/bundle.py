@@ -0,0 +1,185 @@
+""" 小さなファイルを1つのアーカイブにまとめてGRDMへ同期するモジュールです。
+
+GRDMのストレージにはアップロードしたアーカイブをサーバー側で展開する機能が無いため、
+ディレクトリ配下の小さなファイルをzipファイルにまとめ、収録したファイルの一覧を記載した索引ファイルと共にアップロードします。
+zipファイルは同じパスに上書きするため、GRDMのバージョン管理により過去の内容も参照できます。
+"""
+import datetime
+import json
+import os
+import zipfile
+from typing import Optional
+
+from .manifest import SyncManifest
+
+
+# パックモードでまとめるファイルのサイズの上限(バイト)の既定値
+PACK_FILE_SIZE = 1024 * 1024
+# 同期元ディレクトリ直下に置くアーカイブと索引ファイルの名前
+BUNDLE_NAME = '.dg_bundle.zip'
+BUNDLE_INDEX_NAME = '.dg_bundle.json'
+BUNDLE_INDEX_VERSION = 1
+
+
+class SyncBundle:
+    """ ディレクトリ配下の小さなファイルをまとめたアーカイブを作成するクラスです。
+
+    収録したファイルの情報は通常の同期とは別の名前空間でマニフェストに記録し、
+    収録するファイルの追加、変更、削除があった場合のみアーカイブを作り直します。
+
+    Attributes:
+        instance:
+            abs_source(str): 同期元ディレクトリの絶対パス
+            abs_root(str): リサーチフローのルートディレクトリ
+            local_paths(list[str]): アーカイブに収録するファイルの絶対パス
+            manifest(SyncManifest): 収録したファイルの情報を記録するマニフェスト
+            work_dir(str): アーカイブを作成する作業ディレクトリ
+            remote_dir(str): アーカイブのアップロード先ディレクトリ
+            _entries(dict): 収録するファイルの相対パスをキーとするファイルの情報
+            _uploaded(set[str]): アップロードが完了したアーカイブと索引ファイルの名前
+    """
+
+    def __init__(
+        self, abs_source: str, abs_root: str, local_paths: list[str], manifest: SyncManifest, work_dir: str
+    ) -> None:
+        """ クラスのインスタンスの初期化処理を実行するメソッドです。
+
+        Args:
+            abs_source (str): 同期元ディレクトリの絶対パス
+            abs_root (str): リサーチフローのルートディレクトリ
+            local_paths (list[str]): アーカイブに収録するファイルの絶対パス
+            manifest (SyncManifest): 収録したファイルの情報を記録するマニフェスト
+            work_dir (str): アーカイブを作成する作業ディレクトリ
+        """
+        self.abs_source = abs_source
+        self.abs_root = abs_root
+        self.local_paths = local_paths
+        self.manifest = manifest
+        self.work_dir = work_dir
+        self.remote_dir = os.path.relpath(abs_source, abs_root)
+        self._entries = {}
+        self._uploaded = set()
+
+    @property
+    def bundle_path(self) -> str:
+        """ 作業ディレクトリに作成するアーカイブのパスを返すプロパティです。"""
+        return os.path.join(self.work_dir, self.remote_dir, BUNDLE_NAME)
+
+    @property
+    def index_path(self) -> str:
+        """ 作業ディレクトリに作成する索引ファイルのパスを返すプロパティです。"""
+        return os.path.join(self.work_dir, self.remote_dir, BUNDLE_INDEX_NAME)
+
+    def _get_rel_path(self, local_path: str) -> str:
+        """ ファイルのルートディレクトリからの相対パスを取得するメソッドです。
+
+        Args:
+            local_path (str): ファイルの絶対パス
+
+        Returns:
+            str: ルートディレクトリからの相対パスを返す。
+        """
+        return os.path.relpath(local_path, self.abs_root)
+
+    def is_changed(self, incremental: bool = True) -> bool:
+        """ 前回アップロードしたアーカイブから収録するファイルが変わったかを判定するメソッドです。
+
+        Args:
+            incremental (bool): Falseの場合は常に変更ありと判定する. Defaults to True.
+
+        Returns:
+            bool: アーカイブを作り直す必要があればTrue、無ければFalseを返す。
+        """
+        changed = not incremental
+        self._entries = {}
+        for local_path in self.local_paths:
+            rel_path = self._get_rel_path(local_path)
+            entry = self.manifest.get_changed_entry(local_path, rel_path)
+            if entry is None:
+                entry = self.manifest.get_entry(rel_path)
+            else:
+                changed = True
+            self._entries[rel_path] = entry
+
+        recorded = set(self.manifest.get_rel_paths(self.remote_dir))
+        return changed or recorded != set(self._entries)
+
+    def build(self) -> list[tuple[str, str]]:
+        """ アーカイブと索引ファイルを作成するメソッドです。
+
+        Returns:
+            list[tuple[str, str]]: アップロードする(ローカルパス, リモートパス)のリストを返す。
+        """
+        os.makedirs(os.path.dirname(self.bundle_path), exist_ok=True)
+        files = {}
+        with zipfile.ZipFile(self.bundle_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for local_path in self.local_paths:
+                rel_path = self._get_rel_path(local_path)
+                arcname = os.path.relpath(local_path, self.abs_source)
+                zf.write(local_path, arcname)
+                entry = self._entries[rel_path]
+                files[arcname] = {'size': entry['size'], 'md5': entry['md5']}
+
+        index = {
+            'version': BUNDLE_INDEX_VERSION,
+            'created_at': datetime.datetime.now().isoformat(),
+            'bundle': BUNDLE_NAME,
+            'files': files,
+        }
+        with open(self.index_path, 'w') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+
+        return [
+            (self.bundle_path, os.path.join(self.remote_dir, BUNDLE_NAME)),
+            (self.index_path, os.path.join(self.remote_dir, BUNDLE_INDEX_NAME)),
+        ]
+
+    def on_uploaded(self, remote_path: str) -> None:
+        """ アーカイブまたは索引ファイルのアップロードが完了したときに呼び出すメソッドです。
+
+        アーカイブだけが更新されて索引ファイルが古いまま残ることがないよう、
+        両方のアップロードが完了した時点で収録したファイルの情報をマニフェストに記録します。
+
+        Args:
+            remote_path (str): アップロードが完了したファイルのリモートパス
+        """
+        self._uploaded.add(os.path.basename(remote_path))
+        if self._uploaded >= {BUNDLE_NAME, BUNDLE_INDEX_NAME}:
+            self.record()
+
+    def record(self) -> None:
+        """ アーカイブに収録したファイルの情報をマニフェストに記録するメソッドです。
+
+        前回のアーカイブに収録され、今回収録しなかったファイルの情報は削除します。
+        """
+        for rel_path in self.manifest.get_rel_paths(self.remote_dir):
+            if rel_path not in self._entries:
+                self.manifest.remove(rel_path)
+        for rel_path, entry in self._entries.items():
+            self.manifest.record(rel_path, entry)
+
+    def cleanup(self) -> None:
+        """ 作業ディレクトリに作成したアーカイブと索引ファイルを削除するメソッドです。"""
+        for path in (self.bundle_path, self.index_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def split_pack_files(local_paths: list[str], pack_file_size: Optional[int]) -> tuple[list[str], list[str]]:
+    """ ファイルをアーカイブにまとめるファイルと個別にアップロードするファイルに分ける関数です。
+
+    Args:
+        local_paths (list[str]): ファイルの絶対パスのリスト
+        pack_file_size (Optional[int]): アーカイブにまとめるファイルのサイズの上限(バイト)
+
+    Returns:
+        tuple[list[str], list[str]]: (アーカイブにまとめるファイル, 個別にアップロードするファイル)を返す。
+    """
+    packed = []
+    others = []
+    for local_path in local_paths:
+        if pack_file_size is not None and os.path.getsize(local_path) <= pack_file_size:
+            packed.append(local_path)
+        else:
+            others.append(local_path)
+    return packed, others
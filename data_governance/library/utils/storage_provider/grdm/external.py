@@ -3,24 +3,406 @@
 ファイルの内容を取得し、ファイルまたはフォルダをアップロードします。
 ファイルまたはフォルダをアップロードするメソッドやファイルの内容を取得するメソッドがあります。
 """
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import contextvars
 from http import HTTPStatus
+import math
 import os
-from typing import Optional
+import threading
+import time
+from typing import AsyncIterator, Awaitable, Callable, Iterator, Optional
 from urllib import parse
+import weakref
 
 import aiofiles
-from osfclient.cli import OSF, split_storage
+import httpx
+from osfclient.cli import OSF
 from osfclient.models import File
-from osfclient.utils import norm_remote_path, split_storage, _is_path_matched
+from osfclient.utils import norm_remote_path, split_storage
 from osfclient.exceptions import UnauthorizedException
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 
-from library.utils.error import UnauthorizedError, ProjectNotExist
+from . import osf_compat
+from .auth_cache import get_auth_cache
+from .manifest import file_md5
+from ..base import TRANSFER_CONCURRENCY
+from ..stats import TransferStats
+from library.utils.config import connect as con_config
+from library.utils.error import UnauthorizedError, ProjectNotExist, ChecksumMismatchError
+from library.utils.file import load_cache_file, save_cache_file
+
+
+# 通信エラーでアップロードに失敗したファイルを再送する回数
+UPLOAD_RETRIES = 3
+# 再送までの待ち時間(秒)の初期値、再送するたびに2倍にする
+UPLOAD_RETRY_BACKOFF = 1.0
+# アップロードで一度に読み込むバイト数
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# ストリーミングダウンロードで一度に読み込むバイト数
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# downloadでメモリに読み込むファイルサイズの上限、超える場合はdownload_to_fileを利用する
+DOWNLOAD_MEMORY_LIMIT = 100 * 1024 * 1024
+# 一覧取得APIで1ページに取得する件数(GRDMで指定できる上限)
+PAGE_SIZE = 100
+# 一覧取得APIで同時に先読みするページ数の既定値
+PAGE_CONCURRENCY = 4
+
+
+class RemoteFolder:
+    """ アップロード先のフォルダのURLと、その直下のフォルダとファイルの一覧を保持するクラスです。
+
+    フォルダとファイルはGRDMのファイル一覧APIが返すdataの要素のまま保持します。
+
+    Attributes:
+        instance:
+            new_file_url(str): 直下にファイルを作成するURL
+            new_folder_url(str): 直下にフォルダを作成するURL
+            files_url(Optional[str]): 直下の一覧を取得するURL(作成したばかりのフォルダの場合はNone)
+            folders(dict[str, dict]): 直下のフォルダ名をキーとするフォルダのデータ
+            files(dict[str, dict]): 直下のファイル名をキーとするファイルのデータ
+    """
+
+    def __init__(
+        self, new_file_url: str, new_folder_url: str, files_url: Optional[str], folders: dict, files: dict
+    ) -> None:
+        """ クラスのインスタンスの初期化処理を実行するメソッドです。
+
+        Args:
+            new_file_url (str): 直下にファイルを作成するURL
+            new_folder_url (str): 直下にフォルダを作成するURL
+            files_url (Optional[str]): 直下の一覧を取得するURL
+            folders (dict[str, dict]): 直下のフォルダ名をキーとするフォルダのデータ
+            files (dict[str, dict]): 直下のファイル名をキーとするファイルのデータ
+        """
+        self.new_file_url = new_file_url
+        self.new_folder_url = new_folder_url
+        self.files_url = files_url
+        self.folders = folders
+        self.files = files
+
+    @staticmethod
+    def get_files_url(data: dict) -> Optional[str]:
+        """ ストレージまたはフォルダのデータから直下の一覧を取得するURLを取り出すメソッドです。
+
+        Args:
+            data (dict): ファイル一覧APIが返すdataの要素
+
+        Returns:
+            Optional[str]: 一覧を取得するURL、含まれていない場合はNoneを返す。
+        """
+        related = data.get('relationships', {}).get('files', {}).get('links', {}).get('related')
+        if isinstance(related, dict):
+            return related.get('href')
+        return related
 
 
 class External:
-    """ GRDMのAPI通信への通信、動作確認、データの取得などを行うクラスです。"""
+    """ GRDMのAPI通信への通信、動作確認、データの取得などを行うクラスです。
+
+    GRDMへのリクエストは全てのインスタンスで共有する接続プールを利用し、
+    keep-aliveにより接続を使い回します。
+    共有のセッションとクライアントが受け取ったレスポンスは、計測中のTransferStatsのリクエスト数に数えます。
+    接続プールの大きさとタイムアウトはconnect.iniの[GRDM]セクションで設定します。
+
+    Attributes:
+        class:
+            _local(threading.local): スレッドごとのセッションを保持する
+            _async_clients(weakref.WeakKeyDictionary): イベントループをキーとする非同期処理で共有するクライアント
+    """
+    _local = threading.local()
+    _async_clients = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """ 同期処理で共有するセッションを取得するメソッドです。
+
+        requests.Sessionはスレッドセーフであることが保証されていないため、
+        iter_pagesの先読みなどで複数のスレッドから呼び出される場合に備えてスレッドごとに作成します。
+
+        Returns:
+            requests.Session: 接続プールを持つセッションを返す。
+        """
+        session = getattr(cls._local, 'session', None)
+        if session is None:
+            pool_size = int(con_config.get('GRDM', 'POOL_SIZE'))
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.hooks['response'].append(cls._count_request)
+            cls._local.session = session
+        return session
+
+    @classmethod
+    def get_async_client(cls) -> httpx.AsyncClient:
+        """ 非同期処理で共有するクライアントを取得するメソッドです。
+
+        httpxのクライアントは作成したイベントループでしか利用できないため、イベントループごとに作成します。
+        イベントループが破棄されるとクライアントも破棄され、終了済みのイベントループのクライアントは取得時に取り除きます。
+
+        Returns:
+            httpx.AsyncClient: 接続プールを持つクライアントを返す。
+        """
+        for closed_loop in [loop for loop in cls._async_clients if loop.is_closed()]:
+            cls._async_clients.pop(closed_loop, None)
+
+        loop = asyncio.get_running_loop()
+        client = cls._async_clients.get(loop)
+        if client is None or client.is_closed:
+            pool_size = int(con_config.get('GRDM', 'POOL_SIZE'))
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                timeout=httpx.Timeout(cls.get_read_timeout(), connect=cls.get_connect_timeout()),
+                follow_redirects=True,
+                event_hooks={'response': [cls._count_async_request]}
+            )
+            cls._async_clients[loop] = client
+        return client
+
+    @staticmethod
+    def _count_request(response: requests.Response, *args, **kwargs) -> requests.Response:
+        """ 共有のセッションが受け取ったレスポンスをリクエスト数に数えるメソッドです。
+
+        Args:
+            response (requests.Response): 受け取ったレスポンス
+
+        Returns:
+            requests.Response: 受け取ったレスポンスをそのまま返す。
+        """
+        TransferStats.current().add_request()
+        return response
+
+    @staticmethod
+    async def _count_async_request(response: httpx.Response) -> None:
+        """ 共有のクライアントが受け取ったレスポンスをリクエスト数に数えるメソッドです。
+
+        リダイレクトや再送で複数回送信した場合は、それぞれのレスポンスを数えます。
+
+        Args:
+            response (httpx.Response): 受け取ったレスポンス
+        """
+        TransferStats.current().add_request()
+
+    @staticmethod
+    def get_connect_timeout() -> float:
+        """ 接続のタイムアウト(秒)を取得するメソッドです。
+
+        Returns:
+            float: connect.iniに設定された接続のタイムアウトを返す。
+        """
+        return float(con_config.get('GRDM', 'CONNECT_TIMEOUT'))
+
+    @staticmethod
+    def get_read_timeout() -> float:
+        """ 読み込みのタイムアウト(秒)を取得するメソッドです。
+
+        Returns:
+            float: connect.iniに設定された読み込みのタイムアウトを返す。
+        """
+        return float(con_config.get('GRDM', 'READ_TIMEOUT'))
+
+    @staticmethod
+    def _unauthorized(token: str, message: str) -> UnauthorizedError:
+        """ 認証が通らなかった場合の例外を作成するメソッドです。
+
+        GRDMへのリクエストで認証が通らなかった場合は必ずこのメソッドで例外を作成し、
+        キャッシュしたトークンの権限チェックの結果を破棄します。
+
+        Args:
+            token (str): パーソナルアクセストークン
+            message (str): 例外のメッセージ
+
+        Returns:
+            UnauthorizedError: 送出する例外
+        """
+        get_auth_cache().invalidate(token)
+        return UnauthorizedError(message)
+
+    def _get_json(self, api_url: str, token: str, is_project_api: bool = False) -> dict:
+        """ 共有のセッションでGETリクエストを送りJSONを取得するメソッドです。
+
+        Args:
+            api_url (str): リクエスト先のURL
+            token (str): パーソナルアクセストークン
+            is_project_api (bool): プロジェクトを指定するAPIかどうか. Defaults to False.
+
+        Returns:
+            dict: レスポンスのJSON
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            ProjectNotExist: is_project_apiがTrueで、指定されたプロジェクトIDが存在しない
+            requests.exceptions.RequestException: その他の通信エラー
+        """
+        headers = {
+            'Authorization': f'Bearer {token}'
+        }
+        response = self.get_session().get(
+            url=api_url, headers=headers,
+            timeout=(self.get_connect_timeout(), self.get_read_timeout())
+        )
+        try:
+            response.raise_for_status()
+        except RequestException as e:
+            if response.status_code == HTTPStatus.UNAUTHORIZED:
+                raise self._unauthorized(token, str(e)) from e
+            if is_project_api and response.status_code == HTTPStatus.NOT_FOUND:
+                # 存在しないプロジェクトID
+                raise ProjectNotExist(str(e)) from e
+            if is_project_api and response.status_code == HTTPStatus.GONE:
+                # プロジェクトが消された
+                raise ProjectNotExist(str(e)) from e
+            raise
+        return response.json()
+
+    def iter_pages(
+        self, api_url: str, token: str, is_project_api: bool = False, max_concurrency: int = PAGE_CONCURRENCY
+    ) -> Iterator[dict]:
+        """ 一覧取得APIのレスポンスをページ順に返すジェネレータです。
+
+        1ページ目のレスポンスから総ページ数が分かる場合は、残りのページを最大max_concurrency件まで並行して先読みします。
+        総ページ数が分からない場合はlinks.nextを順にたどります。
+
+        Args:
+            api_url (str): 一覧取得APIのURL
+            token (str): パーソナルアクセストークン
+            is_project_api (bool): プロジェクトを指定するAPIかどうか. Defaults to False.
+            max_concurrency (int): 同時に先読みするページ数の上限. Defaults to PAGE_CONCURRENCY.
+
+        Yields:
+            dict: 各ページのレスポンスのJSON
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            ProjectNotExist: is_project_apiがTrueで、指定されたプロジェクトIDが存在しない
+            requests.exceptions.RequestException: その他の通信エラー
+            ValueError: max_concurrencyが1未満
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be 1 or more, got {max_concurrency}.")
+
+        first_url = self._set_query(api_url, {'page[size]': PAGE_SIZE})
+        page = self._get_json(first_url, token, is_project_api)
+        yield page
+
+        last_page = self._get_last_page(page)
+        if last_page is None:
+            next_url = page.get('links', {}).get('next')
+            while next_url:
+                page = self._get_json(next_url, token, is_project_api)
+                yield page
+                next_url = page.get('links', {}).get('next')
+            return
+
+        page_urls = iter([
+            self._set_query(first_url, {'page': number})
+            for number in range(2, last_page + 1)
+        ])
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            # 計測中のTransferStatsにリクエスト数を記録できるよう、呼び出し元のコンテキストで先読みする
+            futures = deque(
+                executor.submit(contextvars.copy_context().run, self._get_json, url, token, is_project_api)
+                for _, url in zip(range(max_concurrency), page_urls)
+            )
+            try:
+                while futures:
+                    page = futures.popleft().result()
+                    url = next(page_urls, None)
+                    if url is not None:
+                        futures.append(executor.submit(
+                            contextvars.copy_context().run, self._get_json, url, token, is_project_api
+                        ))
+                    yield page
+            finally:
+                # 途中で読み込みをやめた場合や失敗した場合は未着手の先読みを取り消す
+                for future in futures:
+                    future.cancel()
+
+    def iter_data(self, api_url: str, token: str, is_project_api: bool = False) -> Iterator[dict]:
+        """ 一覧取得APIの全ページのdataの要素を順に返すジェネレータです。
+
+        Args:
+            api_url (str): 一覧取得APIのURL
+            token (str): パーソナルアクセストークン
+            is_project_api (bool): プロジェクトを指定するAPIかどうか. Defaults to False.
+
+        Yields:
+            dict: dataの要素
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            ProjectNotExist: is_project_apiがTrueで、指定されたプロジェクトIDが存在しない
+            requests.exceptions.RequestException: その他の通信エラー
+        """
+        for page in self.iter_pages(api_url, token, is_project_api):
+            yield from page['data']
+
+    def _get_all(self, api_url: str, token: str, is_project_api: bool = False) -> dict:
+        """ 一覧取得APIの全ページのdataをまとめて取得するメソッドです。
+
+        Args:
+            api_url (str): 一覧取得APIのURL
+            token (str): パーソナルアクセストークン
+            is_project_api (bool): プロジェクトを指定するAPIかどうか. Defaults to False.
+
+        Returns:
+            dict: 全ページのdataをまとめたdataを持つ辞書
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            ProjectNotExist: is_project_apiがTrueで、指定されたプロジェクトIDが存在しない
+            requests.exceptions.RequestException: その他の通信エラー
+        """
+        return {'data': list(self.iter_data(api_url, token, is_project_api))}
+
+    @staticmethod
+    def _set_query(url: str, params: dict) -> str:
+        """ URLのクエリパラメータを設定するメソッドです。
+
+        Args:
+            url (str): 元のURL
+            params (dict): 設定するクエリパラメータ
+
+        Returns:
+            str: 同名のパラメータを置き換えたURLを返す。
+        """
+        parsed = parse.urlparse(url)
+        query = dict(parse.parse_qsl(parsed.query))
+        query.update({key: str(value) for key, value in params.items()})
+        return parse.urlunparse(parsed._replace(query=parse.urlencode(query)))
+
+    @staticmethod
+    def _get_last_page(page: dict) -> Optional[int]:
+        """ 一覧取得APIのレスポンスから総ページ数を取得するメソッドです。
+
+        links.meta(またはmeta)の総件数と1ページの件数、もしくはlinks.lastのpageパラメータから求めます。
+
+        Args:
+            page (dict): 1ページ目のレスポンスのJSON
+
+        Returns:
+            Optional[int]: 総ページ数、分からない場合はNoneを返す。
+        """
+        links = page.get('links') or {}
+        meta = links.get('meta') or page.get('meta') or {}
+        total = meta.get('total')
+        per_page = meta.get('per_page')
+        if isinstance(total, int) and isinstance(per_page, int) and per_page > 0:
+            return max(1, math.ceil(total / per_page))
+
+        last_url = links.get('last')
+        if last_url:
+            last_page = dict(parse.parse_qsl(parse.urlparse(last_url).query)).get('page')
+            if last_page and last_page.isdigit():
+                return int(last_page)
+        if links.get('next'):
+            return None
+        return 1
 
     def build_api_url(self, base_url: str, endpoint: str = '') -> str:
         """ API用のURLを作成する
@@ -81,17 +463,7 @@ class External:
         """
         endpoint = '/oauth2/profile'
         api_url = self.build_oauth_url(base_url, endpoint)
-        headers = {
-            'Authorization': f'Bearer {token}'
-        }
-        response = requests.get(url=api_url, headers=headers)
-        try:
-            response.raise_for_status()
-        except RequestException as e:
-            if response.status_code == HTTPStatus.UNAUTHORIZED:
-                raise UnauthorizedError(str(e)) from e
-            raise
-        return response.json()
+        return self._get_json(api_url, token)
 
     def get_user_info(self, base_url: str, token: str) -> dict:
         """ tokenで指定したユーザーの情報を取得する
@@ -111,20 +483,14 @@ class External:
         """
         endpoint = '/users/me/'
         api_url = self.build_api_url(base_url, endpoint)
-        headers = {
-            'Authorization': f'Bearer {token}'
-        }
-        response = requests.get(url=api_url, headers=headers)
-        try:
-            response.raise_for_status()
-        except RequestException as e:
-            if response.status_code == HTTPStatus.UNAUTHORIZED:
-                raise UnauthorizedError(str(e)) from e
-            raise
-        return response.json()
+        return self._get_json(api_url, token)
 
     def get_projects(self, base_url: str, token: str) -> dict:
-        """ https://rdm.nii.ac.jp/v2/nodes/
+        """ tokenで指定したユーザーが参加しているプロジェクトを取得する
+
+        https://rdm.nii.ac.jp/v2/users/me/nodes/
+
+        /v2/nodes/は公開プロジェクトも全て返すため、全ページを取得すると件数が膨大になる。
 
         Args:
             base_url (str): GRDMのURL (e.g. https://rdm.nii.ac.jp)
@@ -137,19 +503,9 @@ class External:
             UnauthorizedError: 認証が通らない
             requests.exceptions.RequestException: その他の通信エラー
         """
-        sub_url = 'v2/nodes/'
-        api_url = self.build_api_url(base_url, sub_url)
-        headers = {
-            'Authorization': f'Bearer {token}'
-        }
-        response = requests.get(url=api_url, headers=headers)
-        try:
-            response.raise_for_status()
-        except RequestException as e:
-            if response.status_code == HTTPStatus.UNAUTHORIZED:
-                raise UnauthorizedError(str(e)) from e
-            raise
-        return response.json()
+        endpoint = '/users/me/nodes/'
+        api_url = self.build_api_url(base_url, endpoint)
+        return self._get_all(api_url, token)
 
     def get_project_registrations(self, base_url: str, token: str, project_id: str) -> dict:
         """ プロジェクトメタデータを取得する
@@ -171,23 +527,7 @@ class External:
         """
         endpoint = f'/nodes/{project_id}/registrations/'
         api_url = self.build_api_url(base_url, endpoint)
-        headers = {
-            'Authorization': f'Bearer {token}'
-        }
-        response = requests.get(url=api_url, headers=headers)
-        try:
-            response.raise_for_status()
-        except RequestException as e:
-            if response.status_code == HTTPStatus.UNAUTHORIZED:
-                raise UnauthorizedError(str(e)) from e
-            if response.status_code == HTTPStatus.NOT_FOUND:
-                # 存在しないプロジェクトID
-                raise ProjectNotExist(str(e)) from e
-            if response.status_code == HTTPStatus.GONE:
-                # プロジェクトが消された
-                raise ProjectNotExist(str(e)) from e
-            raise
-        return response.json()
+        return self._get_all(api_url, token, is_project_api=True)
 
     def get_project_collaborators(self, base_url: str, token: str, project_id: str) -> dict:
         """ プロジェクトメンバーの情報を取得する
@@ -209,23 +549,7 @@ class External:
         """
         endpoint = f'/nodes/{project_id}/contributors/'
         api_url = self.build_api_url(base_url, endpoint)
-        headers = {
-            'Authorization': f'Bearer {token}'
-        }
-        response = requests.get(url=api_url, headers=headers)
-        try:
-            response.raise_for_status()
-        except RequestException as e:
-            if response.status_code == HTTPStatus.UNAUTHORIZED:
-                raise UnauthorizedError(str(e)) from e
-            if response.status_code == HTTPStatus.NOT_FOUND:
-                # 存在しないプロジェクトID
-                raise ProjectNotExist(str(e)) from e
-            if response.status_code == HTTPStatus.GONE:
-                # プロジェクトが消された
-                raise ProjectNotExist(str(e)) from e
-            raise
-        return response.json()
+        return self._get_all(api_url, token, is_project_api=True)
 
     def get_project_children(self, base_url: str, token: str, project_id: str) -> dict:
         """ プロジェクトのコンポーネントの情報を取得する
@@ -247,30 +571,20 @@ class External:
         """
         endpoint = f'/nodes/{project_id}/children/'
         api_url = self.build_api_url(base_url, endpoint)
-        headers = {
-            'Authorization': f'Bearer {token}'
-        }
-        response = requests.get(url=api_url, headers=headers)
-        try:
-            response.raise_for_status()
-        except RequestException as e:
-            if response.status_code == HTTPStatus.UNAUTHORIZED:
-                raise UnauthorizedError(str(e)) from e
-            if response.status_code == HTTPStatus.NOT_FOUND:
-                # 存在しないプロジェクトID
-                raise ProjectNotExist(str(e)) from e
-            if response.status_code == HTTPStatus.GONE:
-                # プロジェクトが消された
-                raise ProjectNotExist(str(e)) from e
-            raise
-        return response.json()
+        return self._get_all(api_url, token, is_project_api=True)
 
     async def upload(
         self, token: str, base_url: str, project_id: str, source: str,
-        destination: str, recursive: bool = False, force: bool = False
+        destination: str, recursive: bool = False, force: bool = False,
+        max_concurrency: int = TRANSFER_CONCURRENCY,
+        progress: Optional[Callable[[int, int], None]] = None,
+        stats: Optional[TransferStats] = None
     ) -> None:
         """ ファイルまたはフォルダをアップロードするメソッドです。
 
+        recursiveの場合は最大max_concurrency個のファイルを同一のセッションで並行してアップロードします。
+        statsを指定した場合は、転送したバイト数、リクエスト数、再送回数、ファイルごとの所要時間を記録します。
+
         Args:
             token (str): GRDMのパーソナルアクセストークン
             base_url (str): GRDMのURL (e.g.  https://rdm.nii.ac.jp)
@@ -279,108 +593,835 @@ class External:
             destination (str): 保存先パス
             recursive (bool): 指定したsourceがフォルダかどうか. Defaults to False.
             force (bool): ファイルが存在した場合に上書きするかどうか. Defaults to False.
+            max_concurrency (int): 同時にアップロードするファイル数の上限. Defaults to TRANSFER_CONCURRENCY.
+            progress (Callable[[int, int], None]): ファイル1件のアップロード完了ごとに
+                (完了件数, 全件数)で呼び出される関数. Defaults to None.
+            stats (Optional[TransferStats]): 転送の計測値を記録するインスタンス. Defaults to None.
+            synced (Optional[dict[str, dict]]): リモートパスをキーとする前回の同期で記録したファイルの情報
+                (size、md5). Defaults to None.
 
         Raises:
             KeyError:必要な引数が与えられなかった
-            RuntimeError:タイムアウト、ネットワークのエラー
+            RuntimeError:sourceがフォルダではない、指定したストレージが存在しない
             UnauthorizedError: 認証が通らない
+            ProjectNotExist: 指定されたプロジェクトIDが存在しない
+            httpx.HTTPError: 再送しても解決しない通信エラー
+            ValueError: max_concurrencyが1未満
         """
+        if max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be 1 or more. (max_concurrency: {max_concurrency})')
+        if not token:
+            raise KeyError('To upload a file you need to provide a username and password or token.')
+
         # Falseで固定
         # Trueにすると指定したパスを見つけ出せずにRuntimeErrorが返ってくる
         update = False
-        api_url_grdm = self.build_api_url(base_url,'')
+        storage, remote_path = split_storage(destination)
 
-        osf = OSF(token=token, base_url=api_url_grdm)
-        if not osf.has_auth:
+        if recursive:
+            if not os.path.isdir(source):
+                raise RuntimeError(f"Expected source ({source}) to be a directory when using recursive mode.")
+
+            # local name of the directory that is being uploaded
+            _, dir_name = os.path.split(source)
+
+            upload_files = []
+            for root, _, files in os.walk(source):
+                subdir_path = os.path.relpath(root, source)
+                for fname in files:
+                    local_path = os.path.join(root, fname)
+                    # build the remote path + fname
+                    name = os.path.join(remote_path, dir_name, subdir_path, fname)
+                    upload_files.append((local_path, name))
+        else:
+            upload_files = [(source, remote_path)]
+            max_concurrency = 1
+
+        with TransferStats.track(stats):
+            store = await self._get_storage(token, base_url, project_id, storage)
+            await self._upload_files_concurrently(
+                token, store, upload_files, force, update, max_concurrency, progress=progress
+            )
+
+    async def upload_files(
+        self, token: str, base_url: str, project_id: str, upload_files: list[tuple[str, str]],
+        storage: str = 'osfstorage', force: bool = False, max_concurrency: int = TRANSFER_CONCURRENCY,
+        progress: Optional[Callable[[int, int], None]] = None,
+        on_complete: Optional[Callable[[str, str], None]] = None,
+        stats: Optional[TransferStats] = None, synced: Optional[dict[str, dict]] = None
+    ) -> None:
+        """ 指定した複数のファイルをそれぞれのリモートパスにアップロードするメソッドです。
+
+        最大max_concurrency個のファイルを同一のセッションで並行してアップロードします。
+        syncedに記録があるファイルは、アップロード先の一覧のハッシュ値が記録と一致する場合は送信しません。
+        GRDM上で削除または置き換えられていた場合は、forceに関わらず上書きして送信し直します。
+        statsを指定した場合は、転送したバイト数、リクエスト数、再送回数、ファイルごとの所要時間を記録します。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            base_url (str): GRDMのURL (e.g.  https://rdm.nii.ac.jp)
+            project_id (str): プロジェクトID
+            upload_files (list[tuple[str, str]]): (ローカルパス, ストレージ内のリモートパス)のリスト
+            storage (str): アップロード先のストレージ名. Defaults to 'osfstorage'.
+            force (bool): ファイルが存在した場合に上書きするかどうか. Defaults to False.
+            max_concurrency (int): 同時にアップロードするファイル数の上限. Defaults to TRANSFER_CONCURRENCY.
+            progress (Callable[[int, int], None]): ファイル1件のアップロード完了ごとに
+                (完了件数, 全件数)で呼び出される関数. Defaults to None.
+            on_complete (Callable[[str, str], None]): ファイル1件のアップロード完了ごとに
+                (ローカルパス, リモートパス)で呼び出される関数. Defaults to None.
+            stats (Optional[TransferStats]): 転送の計測値を記録するインスタンス. Defaults to None.
+            synced (Optional[dict[str, dict]]): リモートパスをキーとする前回の同期で記録したファイルの情報
+                (size、md5). Defaults to None.
+
+        Raises:
+            KeyError:必要な引数が与えられなかった
+            RuntimeError:指定したストレージが存在しない
+            UnauthorizedError: 認証が通らない
+            ProjectNotExist: 指定されたプロジェクトIDが存在しない
+            httpx.HTTPError: 再送しても解決しない通信エラー
+            ValueError: max_concurrencyが1未満
+        """
+        if max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be 1 or more. (max_concurrency: {max_concurrency})')
+        if not upload_files:
+            return
+        if not token:
             raise KeyError('To upload a file you need to provide a username and password or token.')
 
+        # uploadメソッドと同様にFalseで固定
+        update = False
+        with TransferStats.track(stats):
+            store = await self._get_storage(token, base_url, project_id, storage)
+            await self._upload_files_concurrently(
+                token, store, upload_files, force, update, max_concurrency, progress=progress,
+                on_complete=on_complete, synced=synced
+            )
+
+    async def _request(self, token: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """ 共有のクライアントでGRDMにリクエストを送るメソッドです。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            method (str): HTTPメソッド
+            url (str): リクエスト先のURL
+            **kwargs: httpx.AsyncClient.requestに渡す引数
+
+        Returns:
+            httpx.Response: レスポンス
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            httpx.TransportError: 通信エラー
+        """
+        headers = {'Authorization': f'Bearer {token}', **kwargs.pop('headers', {})}
+        response = await self.get_async_client().request(method, url, headers=headers, **kwargs)
+        if response.status_code == HTTPStatus.UNAUTHORIZED:
+            raise self._unauthorized(token, f'Unauthorized to {method} {url}.')
+        return response
+
+    async def _iter_remote_children(self, token: str, files_url: str) -> AsyncIterator[dict]:
+        """ GRDMのファイル一覧APIの全ページのdataの要素を順に返す非同期ジェネレータです。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            files_url (str): ファイル一覧APIのURL
+
+        Yields:
+            dict: フォルダまたはファイルのデータ
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            httpx.HTTPError: 通信エラー
+        """
+        url = self._set_query(files_url, {'page[size]': PAGE_SIZE})
+        while url:
+            response = await self._request(token, 'GET', url)
+            response.raise_for_status()
+            page = response.json()
+            for data in page['data']:
+                yield data
+            url = page.get('links', {}).get('next')
+
+    async def _get_storage(self, token: str, base_url: str, project_id: str, storage: str) -> dict:
+        """ プロジェクトのストレージのデータを取得するメソッドです。
+
+        一時的な通信エラーで失敗した場合は再送します。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            base_url (str): GRDMのURL (e.g.  https://rdm.nii.ac.jp)
+            project_id (str): プロジェクトID
+            storage (str): ストレージ名
+
+        Returns:
+            dict: ストレージのデータ
+
+        Raises:
+            RuntimeError: 指定したストレージが存在しない
+            UnauthorizedError: 認証が通らない
+            ProjectNotExist: 指定されたプロジェクトIDが存在しない
+            httpx.HTTPError: 再送しても解決しない通信エラー
+        """
+        storages_url = self.build_api_url(base_url, f'/nodes/{project_id}/files/')
+
+        async def find_storage() -> Optional[dict]:
+            async for data in self._iter_remote_children(token, storages_url):
+                if data['attributes'].get('provider') == storage:
+                    return data
+            return None
+
         try:
-            project = await osf.project(project_id)
-            storage, remote_path = split_storage(destination)
+            store = await self._retry(find_storage)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in (HTTPStatus.NOT_FOUND, HTTPStatus.GONE):
+                raise ProjectNotExist(str(e)) from e
+            raise
+        if store is None:
+            raise RuntimeError(f"Project has no storage provider '{storage}'")
+        return store
 
-            store = await project.storage(storage)
-            if recursive:
-                if not os.path.isdir(source):
-                    raise RuntimeError(f"Expected source ({source}) to be a directory when using recursive mode.")
-
-                # local name of the directory that is being uploaded
-                _, dir_name = os.path.split(source)
-
-                for root, _, files in os.walk(source):
-                    subdir_path = os.path.relpath(root, source)
-                    for fname in files:
-                        local_path = os.path.join(root, fname)
-                        async with aiofiles.open(local_path, 'rb') as fp:
-                            # build the remote path + fname
-                            name = os.path.join(remote_path, dir_name, subdir_path, fname)
-                            await store.create_file(name, fp, force=force, update=update)
+    async def _upload_files_concurrently(
+        self, token: str, store: dict, upload_files: list[tuple[str, str]], force: bool, update: bool,
+        max_concurrency: int, progress: Optional[Callable[[int, int], None]] = None,
+        on_complete: Optional[Callable[[str, str], None]] = None, synced: Optional[dict[str, dict]] = None
+    ) -> None:
+        """ 複数のファイルを同時実行数を制限して並行にアップロードするメソッドです。
 
-            else:
-                async with aiofiles.open(source, 'rb') as fp:
-                    await store.create_file(remote_path, fp, force=force, update=update)
-        except UnauthorizedException as e:
-            raise UnauthorizedError(str(e)) from e
+        max_concurrency個のワーカーが共有のファイル一覧から順にファイルを取り出してアップロードします。
+        アップロード先のフォルダはディレクトリごとに1回だけ作成と一覧取得を行い、
+        既存ファイルの有無から新規作成か更新かを判断して1ファイルにつき1回の書き込みで送信します。
+        syncedに記録があるファイルは、一覧のファイルが記録と一致する場合は送信せずに完了として扱います。
+        ファイルの送信は共有のクライアントで行い、計測中のTransferStatsには実際に送信したファイルのみを記録します。
+        いずれかのアップロードが失敗した場合は残りのワーカーを中断して例外を送出します。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            store (dict): アップロード先のストレージのデータ
+            upload_files (list[tuple[str, str]]): (ローカルパス, リモートパス)のリスト
+            force (bool): ファイルが存在した場合に上書きするかどうか
+            update (bool): ファイルが異なる場合のみ上書きするかどうか
+            max_concurrency (int): 同時にアップロードするファイル数の上限
+            progress (Callable[[int, int], None]): ファイル1件のアップロード完了ごとに
+                (完了件数, 全件数)で呼び出される関数. Defaults to None.
+            on_complete (Callable[[str, str], None]): ファイル1件のアップロード完了ごとに
+                (ローカルパス, リモートパス)で呼び出される関数. Defaults to None.
+            synced (Optional[dict[str, dict]]): リモートパスをキーとする前回の同期で記録したファイルの情報
+                (size、md5). Defaults to None.
+        """
+        synced = synced or {}
+        total = len(upload_files)
+        if total == 0:
+            return
+        stats = TransferStats.current()
+        queue = iter(upload_files)
+        done = 0
+        # key: リモートのディレクトリパス, value: そのディレクトリのRemoteFolderを返すタスク
+        folder_tasks = {}
+
+        def forget_failed(directory: str, task: asyncio.Future) -> None:
+            """ 失敗したタスクを取り除き、次に要求されたときに作成と一覧取得をやり直す関数です。"""
+            if folder_tasks.get(directory) is task and (task.cancelled() or task.exception() is not None):
+                del folder_tasks[directory]
+
+        def resolve_folder(directory: str) -> asyncio.Future:
+            """ ディレクトリのRemoteFolderを返すタスクを取得する関数です。
+
+            同じディレクトリに対する作成と一覧取得は、成功している限り最初に要求されたときの1回だけ実行します。
+            """
+            if directory not in folder_tasks:
+                task = asyncio.ensure_future(self._prefetch_remote_folder(token, store, directory, resolve_folder))
+                task.add_done_callback(lambda t: forget_failed(directory, t))
+                folder_tasks[directory] = task
+            return folder_tasks[directory]
+
+        async def worker():
+            nonlocal done
+            # イベントループ上で実行されるため、共有イテレータからの取り出しは競合しない
+            for local_path, name in queue:
+                directory, fname = os.path.split(norm_remote_path(name))
+                remote = await resolve_folder(directory)
+                entry = synced.get(name)
+                if entry is not None and self._is_synced(remote.files.get(fname), entry):
+                    sent = False
+                else:
+                    started = time.monotonic()
+                    # 記録があるファイルはGRDM上で削除または置き換えられているため上書きする
+                    sent = await self._upload_file_with_retry(
+                        token, remote, local_path, name, fname, force or entry is not None, update
+                    )
+                if sent:
+                    stats.add_file(os.path.getsize(local_path), time.monotonic() - started)
+                done += 1
+                if on_complete is not None:
+                    on_complete(local_path, name)
+                if progress is not None:
+                    progress(done, total)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(max_concurrency, total))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        finally:
+            for task in folder_tasks.values():
+                task.cancel()
+            await asyncio.gather(*folder_tasks.values(), return_exceptions=True)
+
+    async def _prefetch_remote_folder(
+        self, token: str, store: dict, directory: str, resolve_folder: Callable[[str], asyncio.Future]
+    ) -> RemoteFolder:
+        """ アップロード先のフォルダを用意し、直下のフォルダとファイルの一覧を取得するメソッドです。
+
+        フォルダが存在しない場合は作成します。作成したフォルダは空のため一覧取得を行いません。
+        作成と一覧取得は、一時的な通信エラーで失敗した場合に再送します。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            store (dict): アップロード先のストレージのデータ
+            directory (str): ストレージのルートからのディレクトリパス(ルートの場合は'')
+            resolve_folder (Callable[[str], asyncio.Future]): 親ディレクトリのRemoteFolderを取得する関数
+
+        Returns:
+            RemoteFolder: フォルダと直下のフォルダとファイルの一覧を返す。
+        """
+        if not directory:
+            return await self._retry(lambda: self._list_remote_folder(token, store))
+
+        parent_dir, dir_name = os.path.split(directory)
+        parent = await resolve_folder(parent_dir)
+        folder = parent.folders.get(dir_name)
+        if folder is not None:
+            return await self._retry(lambda: self._list_remote_folder(token, folder))
+        return await self._retry(lambda: self._create_remote_folder(token, parent, dir_name))
+
+    async def _list_children(self, token: str, files_url: str) -> tuple[dict, dict]:
+        """ ファイル一覧APIから直下のフォルダとファイルを取得するメソッドです。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            files_url (str): ファイル一覧APIのURL
+
+        Returns:
+            tuple[dict, dict]: 名前をキーとするフォルダのデータとファイルのデータを返す。
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            httpx.HTTPError: 通信エラー
+        """
+        folders = {}
+        files = {}
+        async for data in self._iter_remote_children(token, files_url):
+            children = folders if data['attributes'].get('kind') == 'folder' else files
+            children[data['attributes']['name']] = data
+        return folders, files
+
+    async def _list_remote_folder(self, token: str, folder: dict) -> RemoteFolder:
+        """ ストレージまたはフォルダの直下のフォルダとファイルの一覧を取得するメソッドです。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            folder (dict): ストレージまたはフォルダのデータ
+
+        Returns:
+            RemoteFolder: フォルダと直下のフォルダとファイルの一覧を返す。
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            httpx.HTTPError: 通信エラー
+        """
+        files_url = RemoteFolder.get_files_url(folder)
+        folders, files = await self._list_children(token, files_url)
+        links = folder['links']
+        return RemoteFolder(links['upload'], links['new_folder'], files_url, folders, files)
+
+    async def _create_remote_folder(self, token: str, parent: RemoteFolder, name: str) -> RemoteFolder:
+        """ フォルダを作成するメソッドです。
+
+        一覧の取得後に他の処理で作成されていた場合は、親フォルダの一覧を取り直して既存のフォルダを利用します。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            parent (RemoteFolder): 親フォルダ
+            name (str): 作成するフォルダ名
+
+        Returns:
+            RemoteFolder: 作成したフォルダ(直下は空)を返す。
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            httpx.HTTPError: 通信エラー
+        """
+        response = await self._request(token, 'PUT', parent.new_folder_url, params={'name': name})
+        if response.status_code == HTTPStatus.CONFLICT and parent.files_url:
+            folders, files = await self._list_children(token, parent.files_url)
+            parent.folders.update(folders)
+            parent.files.update(files)
+            if name in parent.folders:
+                return await self._list_remote_folder(token, parent.folders[name])
+        response.raise_for_status()
+        links = response.json()['data']['links']
+        return RemoteFolder(links['upload'], links['new_folder'], None, {}, {})
+
+    async def _upload_file(
+        self, token: str, remote: RemoteFolder, local_path: str, name: str, fname: str, force: bool, update: bool
+    ) -> bool:
+        """ 取得済みの一覧から新規作成か更新かを判断してファイルをアップロードするメソッドです。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            remote (RemoteFolder): アップロード先のフォルダ
+            local_path (str): アップロードするファイルのパス
+            name (str): アップロード先のパス
+            fname (str): アップロード先のファイル名
+            force (bool): ファイルが存在した場合に上書きするかどうか
+            update (bool): ファイルが異なる場合のみ上書きするかどうか
+
+        Returns:
+            bool: ファイルの内容を送信した場合はTrue、リモートのファイルと同じ内容のため送信しなかった場合はFalseを返す。
+
+        Raises:
+            FileExistsError: forceとupdateがFalseで、ファイルが既に存在する
+            UnauthorizedError: 認証が通らない
+            httpx.HTTPError: ファイルを作成または更新できない
+        """
+        file_ = remote.files.get(fname)
+        if file_ is None:
+            response = await self._put_file(token, remote.new_file_url, local_path, params={'name': fname})
+            if response.status_code != HTTPStatus.CONFLICT or not remote.files_url:
+                response.raise_for_status()
+                return True
+            # 一覧の取得後に他の処理で作成された場合は一覧を取り直して上書きする
+            folders, files = await self._list_children(token, remote.files_url)
+            remote.folders.update(folders)
+            remote.files.update(files)
+            file_ = remote.files.get(fname)
+            if file_ is None:
+                response.raise_for_status()
+
+        if not force and not update:
+            raise FileExistsError(name)
+        hashes = file_['attributes'].get('extra', {}).get('hashes') or {}
+        if not force and file_md5(local_path) == hashes.get('md5'):
+            return False
+        response = await self._put_file(token, file_['links']['upload'], local_path)
+        response.raise_for_status()
+        return True
+
+    @staticmethod
+    def _is_synced(file_: Optional[dict], entry: dict) -> bool:
+        """ 一覧のファイルが前回の同期で記録した内容のまま残っているかを判定するメソッドです。
+
+        ハッシュ値が一覧に含まれないストレージでは、ファイルの有無とサイズで判定します。
+
+        Args:
+            file_ (Optional[dict]): ファイル一覧APIが返すファイルのデータ(存在しない場合はNone)
+            entry (dict): 前回の同期で記録したファイルの情報
+
+        Returns:
+            bool: 記録と一致するファイルが存在すればTrue、無ければFalseを返す。
+        """
+        if file_ is None:
+            return False
+        attributes = file_['attributes']
+        md5 = (attributes.get('extra', {}).get('hashes') or {}).get('md5')
+        if md5:
+            return md5 == entry['md5']
+        return attributes.get('size') == entry['size']
+
+    async def _put_file(self, token: str, url: str, local_path: str, params: Optional[dict] = None) -> httpx.Response:
+        """ 共有のクライアントでファイルの内容をPUTリクエストで送信するメソッドです。
+
+        ファイル全体をメモリに読み込まず、UPLOAD_CHUNK_SIZEバイトずつ読み込みながら送信します。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            url (str): 送信先のURL
+            local_path (str): 送信するファイルのパス
+            params (Optional[dict]): クエリパラメータ. Defaults to None.
+
+        Returns:
+            httpx.Response: レスポンス
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            httpx.TransportError: 通信エラー
+        """
+        size = os.path.getsize(local_path)
+
+        async def read_chunks():
+            async with aiofiles.open(local_path, 'rb') as fp:
+                while chunk := await fp.read(UPLOAD_CHUNK_SIZE):
+                    yield chunk
+
+        content = read_chunks() if size > 0 else b''
+        return await self._request(
+            token, 'PUT', url, params=params, headers={'Content-Length': str(size)}, content=content
+        )
+
+    async def _retry(
+        self, operation: Callable[[], Awaitable], retries: int = UPLOAD_RETRIES, backoff: float = UPLOAD_RETRY_BACKOFF
+    ):
+        """ 一時的な通信エラーで失敗した処理を再実行するメソッドです。
+
+        再実行するのは通信エラー(httpx.TransportError)とステータスコードが500以上のエラーのみで、
+        認証エラーなど再実行しても解決しないエラーはそのまま送出します。
+        待ち時間はbackoff秒から再実行するたびに2倍にします。
+
+        Args:
+            operation (Callable[[], Awaitable]): 実行する処理を返す関数
+            retries (int): 再実行する回数の上限. Defaults to UPLOAD_RETRIES.
+            backoff (float): 最初の再実行までの待ち時間(秒). Defaults to UPLOAD_RETRY_BACKOFF.
+
+        Returns:
+            Any: 処理の戻り値を返す。
+        """
+        for attempt in range(retries + 1):
+            try:
+                return await operation()
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if isinstance(e, httpx.HTTPStatusError) and e.response.status_code < HTTPStatus.INTERNAL_SERVER_ERROR:
+                    raise
+                if attempt >= retries:
+                    raise
+                TransferStats.current().add_retry()
+                await asyncio.sleep(backoff * 2 ** attempt)
+
+    async def _upload_file_with_retry(
+        self, token: str, remote: RemoteFolder, local_path: str, name: str, fname: str, force: bool, update: bool,
+        retries: int = UPLOAD_RETRIES, backoff: float = UPLOAD_RETRY_BACKOFF
+    ) -> bool:
+        """ 一時的な通信エラーで失敗したアップロードを再送するメソッドです。
+
+        GRDMは1回のリクエストでファイル全体を受け取るため、再送時はファイルを開き直して先頭から送信します。
+        再送の条件と待ち時間は_retryと同じです。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            remote (RemoteFolder): アップロード先のフォルダ
+            local_path (str): アップロードするファイルのパス
+            name (str): アップロード先のパス
+            fname (str): アップロード先のファイル名
+            force (bool): ファイルが存在した場合に上書きするかどうか
+            update (bool): ファイルが異なる場合のみ上書きするかどうか
+            retries (int): 再送する回数の上限. Defaults to UPLOAD_RETRIES.
+            backoff (float): 最初の再送までの待ち時間(秒). Defaults to UPLOAD_RETRY_BACKOFF.
+
+        Returns:
+            bool: ファイルの内容を送信した場合はTrue、送信しなかった場合はFalseを返す。
+        """
+        return await self._retry(
+            lambda: self._upload_file(token, remote, local_path, name, fname, force, update), retries, backoff
+        )
 
     async def download(
-        self, token: str, base_url: str, project_id: str,
-        remote_path: str, base_path: Optional[str] = None
+        self, token: str, base_url: str, project_id: str, remote_path: str,
+        stats: Optional[TransferStats] = None, max_size: int = DOWNLOAD_MEMORY_LIMIT
     ) -> Optional[bytes]:
         """ ファイルの内容を取得するメソッドです。
 
+        内容を全てメモリに保持するため、設定ファイルなどの小さなファイルの取得に利用します。
+        ファイルサイズがmax_sizeを超える場合は読み込まずにエラーとするため、
+        大きなファイルはdownload_to_fileまたはiter_downloadで取得してください。
+        statsを指定した場合は、転送したバイト数と所要時間を記録します。
+
         Args:
             token (str): GRDMのパーソナルアクセストークン
             base_url (str): GRDMのURL (e.g.  https://rdm.nii.ac.jp)
             project_id (str): プロジェクトID
             remote_path (str): ファイルパス
-            base_path (str): ファイルを探すディレクトリのパス
+            stats (Optional[TransferStats]): 転送の計測値を記録するインスタンス. Defaults to None.
+            max_size (int): メモリに読み込むファイルサイズの上限(バイト). Defaults to DOWNLOAD_MEMORY_LIMIT.
 
         Returns:
-            bytes: 指定したファイルの内容
+            bytes: 指定したファイルの内容(ファイルが存在しない場合はNone)
 
         Raises:
             UnauthorizedError: 認証が通らない
-            requests.exceptions.RequestException: その他の通信エラー
+            ValueError: ファイルサイズがmax_sizeを超えている
+            httpx.HTTPError: その他の通信エラー
+        """
+        with TransferStats.track(stats):
+            started = time.monotonic()
+            try:
+                file_ = await self.get_remote_file(token, base_url, project_id, remote_path)
+            except FileNotFoundError:
+                return None
+            if file_.size is not None and file_.size > max_size:
+                raise ValueError(
+                    f'The file (path: {remote_path}, size: {file_.size}) is too large to load into memory. '
+                    'Use download_to_file or iter_download instead.'
+                )
+
+            file_content = []
+            size = 0
+            async with self._stream_file(token, file_) as response:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_size:
+                        # 一覧のサイズが実際より小さい場合も上限を超えて読み込まない
+                        raise ValueError(
+                            f'The file (path: {remote_path}) is too large to load into memory. '
+                            'Use download_to_file or iter_download instead.'
+                        )
+                    file_content.append(chunk)
+            TransferStats.current().add_file(size, time.monotonic() - started)
+            return b''.join(file_content)
+
+    async def iter_download(
+        self, token: str, base_url: str, project_id: str, remote_path: str
+    ) -> AsyncIterator[bytes]:
+        """ ファイルの内容を先頭から順に少しずつ取得する非同期イテレータを返すメソッドです。
+
+        ファイル全体をメモリに保持しないため、大きなファイルの処理に利用します。
+        転送したバイト数と所要時間は、呼び出し元で計測中のTransferStatsに記録します。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            base_url (str): GRDMのURL (e.g.  https://rdm.nii.ac.jp)
+            project_id (str): プロジェクトID
+            remote_path (str): ファイルパス
+
+        Yields:
+            bytes: ファイルの内容の一部
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+            UnauthorizedError: 認証が通らない
+            httpx.HTTPError: その他の通信エラー
         """
+        stats = TransferStats.current()
+        started = time.monotonic()
+        size = 0
+        file_ = await self.get_remote_file(token, base_url, project_id, remote_path)
+        async with self._stream_file(token, file_) as response:
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                yield chunk
+        stats.add_file(size, time.monotonic() - started)
+
+    async def download_to_file(
+        self, token: str, base_url: str, project_id: str, remote_path: str,
+        local_path: str, resume: bool = True, stats: Optional[TransferStats] = None
+    ) -> int:
+        """ ファイルをローカルのパスに直接ダウンロードするメソッドです。
+
+        受信した内容は<local_path>.partに順次書き込み、完了後にlocal_pathへ置き換えます。
+        そのため使用するメモリ量はファイルサイズに依存せず、
+        中断された場合もlocal_pathに不完全なファイルが残ることはありません。
+        resumeがTrueで<local_path>.partが残っている場合は、その続きから取得します。
+        続きから取得するのは、<local_path>.part.jsonに記録したリモートのファイルのサイズ、更新日時、
+        ハッシュ値が現在のものと一致する場合のみで、一致しない場合は先頭から取得し直します。
+        受信後はリモートのハッシュ値と照合し、続きから取得した内容が一致しない場合は先頭から1回だけ取得し直します。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            base_url (str): GRDMのURL (e.g.  https://rdm.nii.ac.jp)
+            project_id (str): プロジェクトID
+            remote_path (str): ファイルパス
+            local_path (str): 保存先のローカルパス
+            resume (bool): 中断されたダウンロードの続きから取得するかどうか. Defaults to True.
+            stats (Optional[TransferStats]): 転送の計測値を記録するインスタンス. Defaults to None.
+
+        Returns:
+            int: ダウンロードしたファイルのサイズ
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+            UnauthorizedError: 認証が通らない
+            ChecksumMismatchError: ダウンロードしたファイルのハッシュ値がリモートと一致しない
+            httpx.HTTPError: その他の通信エラー
+        """
+        with TransferStats.track(stats):
+            started = time.monotonic()
+            file_ = await self.get_remote_file(token, base_url, project_id, remote_path)
+
+            part_path = f'{local_path}.part'
+            meta_path = f'{part_path}.json'
+            part_meta = {
+                'size': file_.size,
+                'date_modified': file_.date_modified,
+                'md5': (file_.hashes or {}).get('md5'),
+            }
+            offset = 0
+            if resume and os.path.isfile(part_path) and load_cache_file(meta_path) == part_meta:
+                offset = os.path.getsize(part_path)
+                if file_.size is not None and offset > file_.size:
+                    # リモートのファイルが小さくなっているため、途中までの内容は使えない
+                    offset = 0
+            os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+            save_cache_file(meta_path, part_meta)
+
+            received = 0
+            if offset == 0 or file_.size is None or offset < file_.size:
+                received += await self._write_part(token, file_, part_path, offset)
+            if part_meta['md5'] and file_md5(part_path) != part_meta['md5']:
+                if offset > 0:
+                    # 途中までの内容が現在のファイルと異なるため、先頭から取得し直す
+                    received += await self._write_part(token, file_, part_path, 0)
+                if file_md5(part_path) != part_meta['md5']:
+                    os.remove(part_path)
+                    os.remove(meta_path)
+                    raise ChecksumMismatchError(f'The downloaded file does not match the md5 of {remote_path}.')
+
+            os.replace(part_path, local_path)
+            os.remove(meta_path)
+            # 再開した場合は今回受信したバイト数のみを転送量とする
+            TransferStats.current().add_file(received, time.monotonic() - started)
+            return os.path.getsize(local_path)
+
+    async def _write_part(self, token: str, file_: File, part_path: str, offset: int) -> int:
+        """ ダウンロードした内容を途中までのファイルに書き込むメソッドです。
+
+        offsetが0より大きい場合は続きを追記し、サーバーがRangeを受け付けなかった場合は先頭から書き直します。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            file_ (File): ダウンロードするファイル
+            part_path (str): 途中までのファイルのパス
+            offset (int): 取得を開始するバイト位置
 
+        Returns:
+            int: 受信したバイト数
+        """
+        received = 0
+        async with self._stream_file(token, file_, offset) as response:
+            if response.status_code != HTTPStatus.PARTIAL_CONTENT:
+                # Rangeが受け付けられなかった場合は先頭から取得し直す
+                offset = 0
+            mode = 'ab' if offset > 0 else 'wb'
+            async with aiofiles.open(part_path, mode) as fp:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    received += len(chunk)
+                    await fp.write(chunk)
+        return received
+
+    async def get_remote_file(self, token: str, base_url: str, project_id: str, remote_path: str) -> File:
+        """ リモートパスで指定したファイルのオブジェクトを取得するメソッドです。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            base_url (str): GRDMのURL (e.g.  https://rdm.nii.ac.jp)
+            project_id (str): プロジェクトID
+            remote_path (str): ファイルパス
+
+        Returns:
+            File: 指定したファイル
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+            UnauthorizedError: 認証が通らない
+        """
         api_url_grdm = self.build_api_url(base_url,'')
-        storage, remote_path = split_storage(remote_path)
+        storage, path = split_storage(remote_path)
 
         osf = OSF(token=token, base_url=api_url_grdm)
-        if base_path is not None:
-            if base_path.startswith('/'):
-                base_path = base_path[1:]
-            base_file_path = base_path[base_path.index('/'):]
-            if not base_file_path.endswith('/'):
-                base_file_path = base_file_path + '/'
-
-                def path_filter(f): return _is_path_matched(base_file_path, f)
-        else:
-            path_filter = None
         try:
             project = await osf.project(project_id)
             store = await project.storage(storage)
-
-            if path_filter is None:
-                files = store._iter_children(store._files_url, 'file', File, recurse=('links', 'upload'))
-            else:
-                files = store.matched_files(path_filter)
-
-            async for file_ in files:
-                if norm_remote_path(file_.path) == remote_path:
-                    try:
-                        response = await file_._get(file_._download_url)#stream=trueを削除
-                    except UnauthorizedException:
-                        response = await file_._get(file_._upload_url)
-                    response.raise_for_status()
-
-                    file_content = []
-                    async for chunk in response.aiter_bytes():
-                        file_content.append(chunk)
-                    return b''.join(file_content)
+            file_ = await self.find_file(store, path)
         except UnauthorizedException as e:
-            raise UnauthorizedError(str(e)) from e
-        except RequestException as e:
+            raise self._unauthorized(token, str(e)) from e
+        if file_ is None:
+            raise FileNotFoundError(f'The specified file (path: {remote_path}) does not exist.')
+        return file_
+
+    @asynccontextmanager
+    async def _stream_file(self, token: str, file_: File, offset: int = 0):
+        """ ファイルのダウンロードのレスポンスを共有のクライアントでストリーミングで開くメソッドです。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            file_ (File): ダウンロードするファイル
+            offset (int): 取得を開始するバイト位置. Defaults to 0.
+
+        Yields:
+            httpx.Response: 本文を読み込んでいないレスポンス
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            httpx.HTTPStatusError: その他の通信エラー
+        """
+        headers = {'Authorization': f'Bearer {token}'}
+        if offset > 0:
+            headers['Range'] = f'bytes={offset}-'
+        client = self.get_async_client()
+        async with client.stream('GET', osf_compat.get_download_url(file_), headers=headers) as response:
             if response.status_code == HTTPStatus.UNAUTHORIZED:
-                raise UnauthorizedError(str(e)) from e
-            raise
+                raise self._unauthorized(token, f'Unauthorized to download {file_.path}.')
+            response.raise_for_status()
+            yield response
+
+    async def list_files(
+        self, token: str, base_url: str, project_id: str, remote_dir: str = '', storage: str = 'osfstorage'
+    ) -> list[File]:
+        """ フォルダ配下のファイルを再帰的に取得するメソッドです。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            base_url (str): GRDMのURL (e.g.  https://rdm.nii.ac.jp)
+            project_id (str): プロジェクトID
+            remote_dir (str): ストレージ名を除いたフォルダのパス(e.g. .dg). Defaults to ''(ストレージのルート).
+            storage (str): ストレージ名. Defaults to 'osfstorage'.
+
+        Returns:
+            list[File]: フォルダ配下のファイルのリスト(フォルダが存在しない場合は空のリスト)
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+        """
+        api_url_grdm = self.build_api_url(base_url,'')
+
+        osf = OSF(token=token, base_url=api_url_grdm)
+        try:
+            project = await osf.project(project_id)
+            parent = await project.storage(storage)
+            for dir_name in filter(None, remote_dir.strip('/').split('/')):
+                async for folder in osf_compat.iter_folders(parent):
+                    if folder.name == dir_name:
+                        parent = folder
+                        break
+                else:
+                    return []
+
+            files = []
+            folders = [parent]
+            while folders:
+                folder = folders.pop()
+                async for child in osf_compat.iter_folders(folder):
+                    folders.append(child)
+                async for file_ in osf_compat.iter_files(folder):
+                    files.append(file_)
+            return files
+        except UnauthorizedException as e:
+            raise self._unauthorized(token, str(e)) from e
+
+    async def find_file(self, store, remote_path: str) -> Optional[File]:
+        """ ストレージ内のファイルをパスで指定して取得するメソッドです。
+
+        ストレージ全体を再帰的に走査せず、パスに含まれるフォルダを先頭から順にたどります。
+        そのため一覧取得のリクエスト数はストレージ内のファイル数ではなくパスの階層数で決まります。
+
+        Args:
+            store (Storage): 検索対象のストレージ
+            remote_path (str): ストレージ名を除いたファイルパス(e.g. .dg/gov-sheet.json)
+
+        Returns:
+            File: 指定したファイル(存在しない場合はNone)
+        """
+        *dir_names, file_name = remote_path.strip('/').split('/')
+        parent = store
+        for dir_name in dir_names:
+            async for folder in osf_compat.iter_folders(parent):
+                if folder.name == dir_name:
+                    parent = folder
+                    break
+            else:
+                return None
 
+        async for file_ in osf_compat.iter_files(parent):
+            if file_.name == file_name:
+                return file_
+        return None
@@ -4,13 +4,21 @@
 プロジェクトID、プロジェクトの一覧、テキストファイルの中身やjsonファイルの中身、メタデータを取得したり、
 GRDMにアップロードしたり、"URLの権限やアクセス許可のチェックを行います。
 """
+import asyncio
 import json
 import os
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 from urllib import parse
 
+from .auth_cache import get_auth_cache
+from .bundle import BUNDLE_NAME, PACK_FILE_SIZE, SyncBundle, split_pack_files
 from .external import External
+from .manifest import SyncManifest
 from .metadata import Metadata
+from .. import factory
+from ..base import TRANSFER_CONCURRENCY, StorageProvider
+from ..stats import TransferStats
+from library.utils.config import path_config
 from library.utils.error import NotFoundContentsError, UnauthorizedError
 
 
@@ -56,10 +64,14 @@ class Grdm():
         Returns:
             bool: 権限に問題が無ければTrue、問題があればFalseを返す。
         """
+        auth_cache = get_auth_cache()
+        if auth_cache.is_valid('authorization', base_url, token):
+            return True
         try:
             profile = self.external.get_token_profile(base_url=base_url, token=token)
             scope = profile['scope']
             if all(element in scope for element in NEED_TOKEN_SCOPE):
+                auth_cache.add('authorization', base_url, token)
                 return True
         except UnauthorizedError:
             return False
@@ -81,7 +93,9 @@ class Grdm():
         Returns:
             bool:パーミッションに問題なければTrue、問題があればFalseの値を返す。
         """
-
+        auth_cache = get_auth_cache()
+        if auth_cache.is_valid('permission', base_url, token, project_id):
+            return True
         response = self.external.get_user_info(base_url, token)
         user_id = response['data']['id']
         response = self.external.get_project_collaborators(base_url, token, project_id)
@@ -89,9 +103,58 @@ class Grdm():
         for user in data:
             if user['embeds']['users']['data']['id'] == user_id:
                 if user['attributes']['permission'] in ALLOWED_PERMISSION:
+                    auth_cache.add('permission', base_url, token, project_id)
                     return True
         return False
 
+    async def check_authorization_async(self, base_url: str, token: str) -> bool:
+        """ パーソナルアクセストークンの権限のチェックを別スレッドで実行するメソッドです。
+
+        通信の完了を待つ間もイベントループを止めないよう、非同期のコールバックから利用します。
+
+        Args:
+            base_url (str): GRDMのURL (e.g. https://rdm.nii.ac.jp)
+            token (str): パーソナルアクセストークン
+
+        Returns:
+            bool: 権限に問題が無ければTrue、問題があればFalseを返す。
+        """
+        return await asyncio.to_thread(self.check_authorization, base_url, token)
+
+    async def check_permission_async(self, base_url: str, token: str, project_id: str) -> bool:
+        """ リポジトリへのアクセス権限のチェックを別スレッドで実行するメソッドです。
+
+        Args:
+            base_url (str): GRDMのURL (e.g. https://rdm.nii.ac.jp)
+            token (str): パーソナルアクセストークン
+            project_id (str): プロジェクトID
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            ProjectNotExist: 指定されたプロジェクトIDが存在しない
+            requests.exceptions.RequestException: その他の通信エラー
+
+        Returns:
+            bool:パーミッションに問題なければTrue、問題があればFalseの値を返す。
+        """
+        return await asyncio.to_thread(self.check_permission, base_url, token, project_id)
+
+    def get_sync_provider(self, token: str, base_url: str, project_id: str) -> StorageProvider:
+        """ リサーチフローの同期とファイルの取得に用いるストレージプロバイダを作成するメソッドです。
+
+        保存先はconnect.iniのSTORAGEセクションのPROVIDERで指定します。
+        保存先がGRDMの場合は、このインスタンスの通信に用いるExternalを共有します。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            base_url (str): GRDMのURL (e.g. https://rdm.nii.ac.jp)
+            project_id (str): プロジェクトID
+
+        Returns:
+            StorageProvider: ストレージプロバイダを返す。
+        """
+        return factory.get_sync_provider(token, base_url, project_id, external=self.external)
+
     def get_projects_list(self, base_url: str, token: str) -> dict:
         """ プロジェクトの一覧を取得するメソッドです。
 
@@ -110,10 +173,19 @@ class Grdm():
         data = response['data']
         return {d['id']: d['attributes']['title'] for d in data}
 
-    async def sync(self, token: str, base_url: str, project_id: str, abs_source: str, abs_root: str = "/home/jovyan") -> None:
+    async def sync(
+        self, token: str, base_url: str, project_id: str, abs_source: str, abs_root: str = "/home/jovyan",
+        max_concurrency: int = TRANSFER_CONCURRENCY, progress: Optional[Callable[[int, int], None]] = None,
+        incremental: bool = True, pack: bool = False, pack_file_size: int = PACK_FILE_SIZE,
+        provider: Optional[StorageProvider] = None
+    ) -> None:
         """ GRDMにアップロードするメソッドです。
 
         abs_source は絶対パスでなければならない。
+        incrementalがTrueの場合は、<abs_root>/data_governance/working配下のマニフェストと比較して
+        前回の同期から変更されたファイルのみをアップロードします。
+        GRDM上でファイルを直接削除した場合などはincrementalをFalseにして全てのファイルをアップロードしてください。
+        pack、providerの動作はsync_allと同じです。
 
         Args:
             token (str): GRDMのパーソナルアクセストークン
@@ -121,6 +193,14 @@ class Grdm():
             project_id (str): プロジェクトID
             abs_source (str): 同期したいファイルまたはディレクトリ
             abs_root (str): リサーチフローのルートディレクトリ. Defaults to "/home/jovyan".
+            max_concurrency (int): 同時にアップロードするファイル数の上限. Defaults to TRANSFER_CONCURRENCY.
+            progress (Callable[[int, int], None]): ファイル1件のアップロード完了ごとに
+                (完了件数, 全件数)で呼び出される関数. Defaults to None.
+            incremental (bool): 変更されたファイルのみをアップロードするかどうか. Defaults to True.
+            pack (bool): 小さなファイルをアーカイブにまとめて送信するかどうか. Defaults to False.
+            pack_file_size (int): アーカイブにまとめるファイルのサイズの上限(バイト). Defaults to PACK_FILE_SIZE.
+            provider (Optional[StorageProvider]): アップロード先のストレージプロバイダ.
+                Defaults to None(get_sync_providerで作成したプロバイダ).
 
         Raises:
             UnauthorizedError: 認証が通らない
@@ -128,30 +208,156 @@ class Grdm():
             FileNotFoundError: 指定したファイルが存在しないエラー
             ValueError:絶対パスではないエラー
         """
+        await self.sync_all(
+            token, base_url, project_id, [abs_source], abs_root,
+            max_concurrency=max_concurrency, progress=progress, incremental=incremental,
+            pack=pack, pack_file_size=pack_file_size, provider=provider
+        )
 
-        if os.path.isdir(abs_source):
-            recursive = True
-        elif os.path.isfile(abs_source):
-            recursive = False
-        else:
-            raise FileNotFoundError(f"The file or directory '{abs_source}' does not exist.")
+    async def sync_all(
+        self, token: str, base_url: str, project_id: str, abs_sources: list[str], abs_root: str = "/home/jovyan",
+        max_concurrency: int = TRANSFER_CONCURRENCY, progress: Optional[Callable[[int, int], None]] = None,
+        incremental: bool = True, pack: bool = False, pack_file_size: int = PACK_FILE_SIZE,
+        provider: Optional[StorageProvider] = None, stats: Optional[TransferStats] = None
+    ) -> None:
+        """ 複数のファイルまたはディレクトリをまとめてGRDMにアップロードするメソッドです。
+
+        abs_sources は全て絶対パスでなければならない。
+        他のディレクトリの配下にあるパスは重複して送信しないよう除外し、
+        全てのファイルを1回のアップロードでmax_concurrency件ずつ並行して送信します。
+        progressには全てのパスを合計した件数が渡されます。
+
+        packがTrueの場合は、ディレクトリ配下のpack_file_size以下のファイルを個別に送信せず、
+        ディレクトリ直下の.dg_bundle.zipにまとめ、収録したファイルの一覧を.dg_bundle.jsonに記載して送信します。
+        収録したファイルは、アーカイブと索引ファイルの両方のアップロードが完了した時点でマニフェストに記録します。
+        まとめたファイルはGRDM上では個別のファイルとして参照できないため、
+        小さなファイルが大量にある実験データなどの保存にのみ利用してください。
+
+        providerを指定しない場合は、connect.iniで指定した保存先へget_sync_providerで作成したプロバイダを用いてアップロードします。
+        マニフェストはプロバイダのmanifest_keyごとに記録するため、保存先を切り替えた場合は全てのファイルを送信します。
+        incrementalがTrueの場合、前回の同期から変更されていないファイルは同期先のファイルが記録と一致するかを確認し、
+        同期先で削除または置き換えられていたファイルのみを送信し直します。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            base_url (str): GRDMのURL (e.g. https://rdm.nii.ac.jp)
+            project_id (str): プロジェクトID
+            abs_sources (list[str]): 同期したいファイルまたはディレクトリのリスト
+            abs_root (str): リサーチフローのルートディレクトリ. Defaults to "/home/jovyan".
+            max_concurrency (int): 同時にアップロードするファイル数の上限. Defaults to TRANSFER_CONCURRENCY.
+            progress (Callable[[int, int], None]): ファイル1件のアップロード完了ごとに
+                (完了件数, 全件数)で呼び出される関数. Defaults to None.
+            incremental (bool): 変更されたファイルのみをアップロードするかどうか. Defaults to True.
+            pack (bool): 小さなファイルをアーカイブにまとめて送信するかどうか. Defaults to False.
+            pack_file_size (int): アーカイブにまとめるファイルのサイズの上限(バイト). Defaults to PACK_FILE_SIZE.
+            provider (Optional[StorageProvider]): アップロード先のストレージプロバイダ.
+                Defaults to None(get_sync_providerで作成したプロバイダ).
+            stats (Optional[TransferStats]): 転送の計測値を記録するインスタンス. Defaults to None.
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            RuntimeError: RDMClientから上がってくるエラー全般
+            FileNotFoundError: 指定したファイルが存在しないエラー
+            ValueError:絶対パスではないエラー
+        """
+        for abs_source in abs_sources:
+            if not os.path.exists(abs_source):
+                raise FileNotFoundError(f"The file or directory '{abs_source}' does not exist.")
+            if not os.path.isabs(abs_source):
+                raise ValueError(f"The path '{abs_source}' is not an absolute path.")
+
+        if provider is None:
+            provider = self.get_sync_provider(token, base_url, project_id)
+        manifest_path = os.path.join(abs_root, path_config.GRDM_SYNC_MANIFEST_PATH)
+        manifest = SyncManifest(manifest_path, provider.manifest_key)
+        # アーカイブに収録したファイルは個別に送信したファイルと区別して記録する
+        bundle_manifest = manifest.share(f'{provider.manifest_key}:bundle') if pack else None
+        bundle_dir = os.path.join(abs_root, path_config.GRDM_BUNDLE_FOLDER)
+        # key: アーカイブのリモートパス, value: アーカイブ
+        bundles = {}
+        local_paths = []
+        for abs_source in self._remove_nested_paths(abs_sources):
+            if not os.path.isdir(abs_source):
+                local_paths.append(abs_source)
+                continue
+            source_paths = [
+                os.path.join(root, fname)
+                for root, _, files in os.walk(abs_source)
+                for fname in files
+            ]
+            if pack:
+                packed_paths, source_paths = split_pack_files(source_paths, pack_file_size)
+                bundle = SyncBundle(abs_source, abs_root, packed_paths, bundle_manifest, bundle_dir)
+                if packed_paths and bundle.is_changed(incremental):
+                    bundles[os.path.join(bundle.remote_dir, BUNDLE_NAME)] = bundle
+            local_paths.extend(source_paths)
+
+        # key: リモートパス, value: アップロード完了時にマニフェストへ記録する情報
+        pending = {}
+        # key: リモートパス, value: 前回の同期から変更されていないファイルの記録
+        synced = {}
+        # key: アーカイブと索引ファイルのリモートパス, value: アーカイブ
+        bundle_files = {}
+        upload_files = []
+        for bundle in bundles.values():
+            for local_path, remote_path in bundle.build():
+                bundle_files[remote_path] = bundle
+                upload_files.append((local_path, remote_path))
+        for local_path in local_paths:
+            rel_path = os.path.relpath(local_path, abs_root)
+            if incremental:
+                entry = manifest.get_changed_entry(local_path, rel_path)
+                if entry is None:
+                    # 同期先で削除または置き換えられていないかをプロバイダが確認してから送信を省く
+                    entry = synced[rel_path] = manifest.get_entry(rel_path)
+            else:
+                entry = manifest.build_entry(local_path)
+            pending[rel_path] = entry
+            upload_files.append((local_path, rel_path))
+
+        def record(local_path: str, remote_path: str) -> None:
+            """ アップロードが完了したファイルをマニフェストに記録する関数です。"""
+            if remote_path in bundle_files:
+                bundle_files[remote_path].on_uploaded(remote_path)
+            elif remote_path in pending:
+                manifest.record(remote_path, pending[remote_path])
 
-        if not os.path.isabs(abs_source):
-            raise ValueError(f"The path '{abs_source}' is not an absolute path.")
-        if recursive and not abs_source.endswith('/'):
-            abs_source += '/'
+        try:
+            await provider.put_files(
+                upload_files, max_concurrency=max_concurrency, progress=progress, on_complete=record, stats=stats,
+                synced=synced
+            )
+        finally:
+            if stats is not None:
+                stats.finish()
+            # 途中で失敗した場合も完了したファイルは次回の同期で再送しない
+            manifest.save()
+            for bundle in bundles.values():
+                bundle.cleanup()
+
+    @staticmethod
+    def _remove_nested_paths(abs_paths: list[str]) -> list[str]:
+        """ 他のパスの配下にあるパスと重複したパスを除外するメソッドです。
 
-        destination = os.path.relpath(abs_source, abs_root)
+        Args:
+            abs_paths (list[str]): 絶対パスのリスト
 
-        await self.external.upload(
-            token=token, base_url=base_url, project_id=project_id,
-            source=abs_source, destination=destination,
-            recursive=recursive, force=True
-        )
+        Returns:
+            list[str]: 正規化して重複を除いたパスのリストを返す。
+        """
+        result = []
+        for path in sorted({os.path.normpath(p) for p in abs_paths}, key=lambda p: p.split(os.sep)):
+            # パスの要素ごとにソートしているため、配下のパスは親ディレクトリの直後に続く
+            if result and os.path.commonpath([result[-1], path]) == result[-1]:
+                continue
+            result.append(path)
+        return result
 
     async def download_text_file(self, token: str, base_url: str, project_id: str, remote_path: str, encoding = 'utf-8') -> str:
         """ テキストファイルの中身を取得するメソッドです。
 
+        connect.iniで指定した同期先からget_sync_providerで作成したプロバイダを用いて取得します。
+
         Args:
             token (str): GRDMのパーソナルアクセストークン
             base_url (str): GRDMのURL (e.g. https://rdm.nii.ac.jp)
@@ -165,16 +371,42 @@ class Grdm():
         Raises:
             FileNotFoundError: 指定したファイルが存在しない
             UnauthorizedError: 認証が通らない
-            requests.exceptions.RequestException: その他の通信エラー
+            httpx.HTTPError: その他の通信エラー
         """
-        content = await self.external.download(
-            token=token, project_id=project_id, base_url=base_url,
-            remote_path=remote_path
-        )
-        if content is None:
-            raise FileNotFoundError(f'The specified file (path: {remote_path}) does not exist.')
+        provider = self.get_sync_provider(token, base_url, project_id)
+        content = b''.join([chunk async for chunk in provider.stream(remote_path)])
         return content.decode(encoding)
 
+    async def download_file(
+        self, token: str, base_url: str, project_id: str, remote_path: str,
+        local_path: str, resume: bool = True, stats: Optional[TransferStats] = None
+    ) -> int:
+        """ ファイルをローカルのパスにダウンロードするメソッドです。
+
+        ファイルの内容はメモリに保持せずに直接書き込むため、大きなファイルのダウンロードに利用します。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            base_url (str): GRDMのURL (e.g. https://rdm.nii.ac.jp)
+            project_id (str): プロジェクトID
+            remote_path (str): ファイルパス
+            local_path (str): 保存先のローカルパス
+            resume (bool): 中断されたダウンロードの続きから取得するかどうか. Defaults to True.
+            stats (Optional[TransferStats]): 転送の計測値を記録するインスタンス. Defaults to None.
+
+        Returns:
+            int: ダウンロードしたファイルのサイズ
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+            UnauthorizedError: 認証が通らない
+            httpx.HTTPError: その他の通信エラー
+        """
+        return await self.external.download_to_file(
+            token=token, base_url=base_url, project_id=project_id,
+            remote_path=remote_path, local_path=local_path, resume=resume, stats=stats
+        )
+
     async def download_json_file(self, token: str, base_url: str, project_id: str, remote_path: str) -> Union[dict, list]:
         """ jsonファイルの中身を取得するメソッドです。
 
@@ -191,7 +423,7 @@ class Grdm():
             FileNotFoundError: 指定したファイルが存在しない
             json.JSONDecodeError: 変換元文字列がjson形式でなかった
             UnauthorizedError: 認証が通らない
-            requests.exceptions.RequestException: その他の通信エラー
+            httpx.HTTPError: その他の通信エラー
         """
         content =  await self.download_text_file(token, base_url, project_id, remote_path)
         return json.loads(content)
@@ -216,7 +448,7 @@ class Grdm():
         metadata = self.external.get_project_registrations(base_url, token, project_id)
         if len(metadata['data']) < 1:
             raise NotFoundContentsError(f"Metadata doesn't exist for the project with the specified ID {project_id}.")
-        metadata_class = Metadata()
+        metadata_class = Metadata(os.path.join(os.path.expanduser('~'), path_config.GRDM_SCHEMA_CACHE_FOLDER))
         return metadata_class.format_metadata(metadata)
 
     def get_collaborator_list(self, base_url: str, token: str, project_id: str) -> dict:
@@ -0,0 +1,202 @@
+""" GRDMへの同期済みファイルの情報を管理するモジュールです。
+
+同期したファイルのサイズ、更新日時、ハッシュ値をプロジェクトごとにマニフェストファイルへ記録し、
+前回の同期から変更されたファイルを判定します。
+記録したハッシュ値は送信した内容のハッシュ値のため、同期先で削除または置き換えられたファイルの判定にも利用します。
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+
+MANIFEST_VERSION = 1
+# 同期中にマニフェストファイルへ書き込む間隔(秒)
+FLUSH_INTERVAL = 5.0
+
+
+def file_md5(file_path: str, block_size: int = 65536) -> str:
+    """ ファイルのMD5ハッシュ値を取得する関数です。
+
+    Args:
+        file_path (str): ハッシュ値を計算するファイルのパス
+        block_size (int): 一度に読み込むバイト数. Defaults to 65536.
+
+    Returns:
+        str: 16進数表記のMD5ハッシュ値を返す。
+    """
+    hash_ = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            hash_.update(block)
+    return hash_.hexdigest()
+
+
+class SyncManifest:
+    """ 同期済みファイルの情報を保持するマニフェストのクラスです。
+
+    マニフェストファイルは以下の形式で保存されます。
+
+        {
+            "version": 1,
+            "projects": {
+                "<project_id>": {
+                    "<ルートディレクトリからの相対パス>": {"size": int, "mtime": int, "md5": str}
+                }
+            }
+        }
+
+    Attributes:
+        instance:
+            manifest_path(str): マニフェストファイルのパス
+            project_id(str): 同期先のプロジェクトID
+            _data(dict): マニフェストファイルの内容
+            _entries(dict): 同期先プロジェクトの同期済みファイルの情報
+            flush_interval(float): recordでマニフェストファイルへ書き込む間隔(秒)
+            _last_saved(float): 最後にマニフェストファイルへ書き込んだ時刻
+    """
+
+    def __init__(
+        self, manifest_path: str, project_id: str, flush_interval: float = FLUSH_INTERVAL, data: Optional[dict] = None
+    ) -> None:
+        """ クラスのインスタンスの初期化処理を実行するメソッドです。
+
+        マニフェストファイルが存在しない、または読み込めない場合は空のマニフェストとして扱います。
+
+        Args:
+            manifest_path (str): マニフェストファイルのパス
+            project_id (str): 同期先のプロジェクトID
+            flush_interval (float): recordでマニフェストファイルへ書き込む間隔(秒). Defaults to FLUSH_INTERVAL.
+            data (Optional[dict]): 読み込み済みのマニフェストファイルの内容. Defaults to None.
+        """
+        self.manifest_path = manifest_path
+        self.project_id = project_id
+        self._data = self._load() if data is None else data
+        self._entries = self._data['projects'].setdefault(project_id, {})
+        self.flush_interval = flush_interval
+        self._last_saved = time.monotonic()
+
+    def _load(self) -> dict:
+        """ マニフェストファイルを読み込むメソッドです。
+
+        Returns:
+            dict: マニフェストファイルの内容を返す。
+        """
+        try:
+            with open(self.manifest_path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        if data.get('version') != MANIFEST_VERSION or not isinstance(data.get('projects'), dict):
+            data = {'version': MANIFEST_VERSION, 'projects': {}}
+        return data
+
+    def share(self, project_id: str) -> 'SyncManifest':
+        """ 同じマニフェストファイルの別のプロジェクトIDの記録を扱うインスタンスを作成するメソッドです。
+
+        内容を共有するため、どちらのインスタンスでsaveしても互いの記録を上書きしません。
+
+        Args:
+            project_id (str): 記録を扱うプロジェクトID
+
+        Returns:
+            SyncManifest: 内容を共有するインスタンスを返す。
+        """
+        return SyncManifest(self.manifest_path, project_id, self.flush_interval, data=self._data)
+
+    def build_entry(self, abs_path: str) -> dict:
+        """ ファイルの現在のサイズ、更新日時、ハッシュ値を取得するメソッドです。
+
+        Args:
+            abs_path (str): ファイルの絶対パス
+
+        Returns:
+            dict: recordに渡すファイルの情報を返す。
+        """
+        stat = os.stat(abs_path)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'md5': file_md5(abs_path)}
+
+    def get_changed_entry(self, abs_path: str, rel_path: str) -> Optional[dict]:
+        """ 前回の同期から変更されたファイルの情報を取得するメソッドです。
+
+        サイズと更新日時が記録と一致する場合はハッシュ値を計算せずに未変更と判定します。
+        更新日時のみが異なりハッシュ値が一致する場合は、記録の更新日時を更新して未変更と判定します。
+
+        Args:
+            abs_path (str): ファイルの絶対パス
+            rel_path (str): マニフェストのキーとするルートディレクトリからの相対パス
+
+        Returns:
+            Optional[dict]: 変更されていればrecordに渡す新しい情報、未変更であればNoneを返す。
+        """
+        recorded = self._entries.get(rel_path)
+        if recorded is not None:
+            stat = os.stat(abs_path)
+            if recorded['size'] == stat.st_size and recorded['mtime'] == stat.st_mtime_ns:
+                return None
+
+        entry = self.build_entry(abs_path)
+        if recorded is not None and recorded['md5'] == entry['md5']:
+            self._entries[rel_path] = entry
+            return None
+        return entry
+
+    def get_entry(self, rel_path: str) -> Optional[dict]:
+        """ 記録されたファイルの情報を取得するメソッドです。
+
+        Args:
+            rel_path (str): ルートディレクトリからの相対パス
+
+        Returns:
+            Optional[dict]: 記録されたファイルの情報、記録が無ければNoneを返す。
+        """
+        return self._entries.get(rel_path)
+
+    def get_rel_paths(self, rel_dir: str) -> list[str]:
+        """ ディレクトリ配下について記録されたファイルの相対パスを取得するメソッドです。
+
+        Args:
+            rel_dir (str): ルートディレクトリからのディレクトリの相対パス
+
+        Returns:
+            list[str]: 記録されたファイルの相対パスのリストを返す。
+        """
+        if rel_dir in ('', os.curdir):
+            return list(self._entries)
+        prefix = rel_dir.rstrip(os.sep) + os.sep
+        return [rel_path for rel_path in self._entries if rel_path.startswith(prefix)]
+
+    def remove(self, rel_path: str) -> None:
+        """ 記録されたファイルの情報を削除するメソッドです。
+
+        Args:
+            rel_path (str): ルートディレクトリからの相対パス
+        """
+        self._entries.pop(rel_path, None)
+
+    def record(self, rel_path: str, entry: dict) -> None:
+        """ 同期が完了したファイルの情報を記録するメソッドです。
+
+        前回の書き込みからflush_interval秒以上経過していればマニフェストファイルにも書き込み、
+        同期が中断された場合でも完了したファイルを次回の同期で再送しないようにします。
+
+        Args:
+            rel_path (str): ルートディレクトリからの相対パス
+            entry (dict): get_changed_entryで取得したファイルの情報
+        """
+        self._entries[rel_path] = entry
+        if time.monotonic() - self._last_saved >= self.flush_interval:
+            self.save()
+
+    def save(self) -> None:
+        """ マニフェストファイルを書き込むメソッドです。
+
+        書き込み途中で中断されても既存のマニフェストが壊れないよう、一時ファイルに書き込んでから置き換えます。
+        """
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = f'{self.manifest_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+        self._last_saved = time.monotonic()
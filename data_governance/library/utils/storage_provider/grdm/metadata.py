@@ -3,13 +3,41 @@
 このモジュールはメタデータに必要な値を用意します。
 プロジェクトメタデータを整形したり、メタデータのテンプレートを取得したり、メタデータをフォーマットして返却するメソッドがあります。
 """
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import json
-import requests
-from typing import Union
+import os
+from http import HTTPStatus
+from typing import Iterable, Optional, Union
+
+from .external import External
+
+
+# 異なるスキーマを同時に取得する数の上限
+SCHEMA_CONCURRENCY = 4
 
 
 class Metadata():
-    """ 取得したメタデータを表示するためのクラスです。"""
+    """ 取得したメタデータを表示するためのクラスです。
+
+    取得したスキーマはURLごとに全てのインスタンスで共有するメモリ上のキャッシュに保持します。
+    cache_dirを指定した場合はファイルにもETagと共に保存し、次回以降はIf-None-Matchで再検証します。
+
+    Attributes:
+        class:
+            _schema_cache(dict[str, dict]): スキーマのURLをキー、スキーマを値とするキャッシュ
+        instance:
+            cache_dir(str): スキーマを保存するディレクトリ
+    """
+    _schema_cache = {}
+
+    def __init__(self, cache_dir: Optional[str] = None) -> None:
+        """ クラスのインスタンスの初期化処理を実行するメソッドです。
+
+        Args:
+            cache_dir (Optional[str]): スキーマを保存するディレクトリ. Defaults to None.
+        """
+        self.cache_dir = cache_dir
 
     def format_metadata(self, metadata:dict) -> dict[str, list]:
         """ Gakunin RDMから取得したプロジェクトメタデータを整形するメソッドです。
@@ -20,18 +48,22 @@ class Metadata():
         """
 
         datas = metadata['data']
+        schemas = self.get_schemas(
+            data["relationships"]["registration_schema"]["links"]["related"]["href"] for data in datas
+        )
+        indexes = {url: self.build_schema_index(schema) for url, schema in schemas.items()}
         # {'dmp': first_value}
         first_value = []
         for data in datas:
             url = data["relationships"]["registration_schema"]["links"]["related"]["href"]
-            schema = self.get_schema(url)
+            schema_index = indexes[url]
 
             # first_value = [second_layer, ...]
             second_layer = {'title': data['attributes']['title']}
             registration = data['attributes']['registration_responses']
             for key, value in registration.items():
                 if key != 'grdm-files':
-                    second_layer[key] = self.format_display_name(schema, "page1", key, value)
+                    second_layer[key] = self.format_display_name_from_index(schema_index, "page1", key, value)
 
             files = json.loads(registration['grdm-files'])
             # grdm-files > value
@@ -45,15 +77,36 @@ class Metadata():
                 file_datas['metadata'] = file_metadata
                 file_values.append(file_datas)
 
-            second_layer['grdm-files'] = self.format_display_name(schema, "page2", 'grdm-files', file_values)
+            second_layer['grdm-files'] = self.format_display_name_from_index(
+                schema_index, "page2", 'grdm-files', file_values
+            )
             first_value.append(second_layer)
 
         return {'dmp': first_value}
 
+    def get_schemas(self, urls: Iterable[str]) -> dict[str, dict]:
+        """ 複数のスキーマをまとめて取得するメソッドです。
+
+        重複したURLは1回だけ取得し、キャッシュに無いスキーマは並行して取得します。
+
+        Args:
+            urls (Iterable[str]): スキーマのURL
+
+        Returns:
+            dict[str, dict]: URLをキー、スキーマを値とする辞書を返す。
+        """
+        urls = list(dict.fromkeys(urls))
+        missing = [url for url in urls if url not in self._schema_cache]
+        if len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=min(SCHEMA_CONCURRENCY, len(missing))) as executor:
+                list(executor.map(self.get_schema, missing))
+        return {url: self.get_schema(url) for url in urls}
+
     def get_schema(self, url:str) -> dict:
         """ メタデータのプロトコル名を取得するメソッドです。
 
         リクエストされたURLに接続し、その接続に問題がないかを確認してプロトコル名を取得する。
+        キャッシュにあればリクエストせずに返し、ファイルに保存したスキーマはETagで再検証する。
 
         Args:
             url(str):メタデータのURL
@@ -61,9 +114,112 @@ class Metadata():
         Returns:
             dict:メタデータのプロトコル名の値を返す。
         """
-        response = requests.get(url=url)
-        response.raise_for_status()
-        return response.json()
+        schema = self._schema_cache.get(url)
+        if schema is not None:
+            return schema
+
+        cached = self._load_cached_schema(url)
+        headers = {}
+        if cached is not None and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        response = External.get_session().get(
+            url=url, headers=headers,
+            timeout=(External.get_connect_timeout(), External.get_read_timeout())
+        )
+        if cached is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            schema = cached['schema']
+        else:
+            response.raise_for_status()
+            schema = response.json()
+            self._save_cached_schema(url, response.headers.get('ETag'), schema)
+        self._schema_cache[url] = schema
+        return schema
+
+    def _get_cache_path(self, url: str) -> Optional[str]:
+        """ スキーマを保存するファイルのパスを取得するメソッドです。
+
+        Args:
+            url (str): スキーマのURL
+
+        Returns:
+            Optional[str]: ファイルのパス、cache_dirが未指定の場合はNoneを返す。
+        """
+        if not self.cache_dir:
+            return None
+        file_name = hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json'
+        return os.path.join(self.cache_dir, file_name)
+
+    def _load_cached_schema(self, url: str) -> Optional[dict]:
+        """ ファイルに保存したスキーマを読み込むメソッドです。
+
+        Args:
+            url (str): スキーマのURL
+
+        Returns:
+            Optional[dict]: etagとschemaを持つ辞書、保存されていない場合はNoneを返す。
+        """
+        cache_path = self._get_cache_path(url)
+        if cache_path is None:
+            return None
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(cached, dict) or 'schema' not in cached:
+            return None
+        return cached
+
+    def _save_cached_schema(self, url: str, etag: Optional[str], schema: dict) -> None:
+        """ スキーマをファイルに保存するメソッドです。
+
+        ETagが無い場合は再検証できないため保存しません。保存に失敗した場合もエラーは無視します。
+
+        Args:
+            url (str): スキーマのURL
+            etag (Optional[str]): レスポンスのETag
+            schema (dict): スキーマ
+        """
+        cache_path = self._get_cache_path(url)
+        if cache_path is None or not etag:
+            return
+        tmp_path = f'{cache_path}.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump({'url': url, 'etag': etag, 'schema': schema}, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+    def build_schema_index(self, schema: dict) -> dict[tuple[str, str], dict]:
+        """ スキーマから質問と選択肢を引くための索引を作成するメソッドです。
+
+        ページIDまたはqidが重複する場合は、スキーマ内で先に現れたものを採用します。
+
+        Args:
+            schema (dict): メタデータのプロトコル名
+
+        Returns:
+            dict[tuple[str, str], dict]: (ページID, qid)をキー、
+                navと選択肢のtextをキーにtooltipを値とするoptionsを持つ辞書を値とする索引を返す。
+        """
+        index = {}
+        seen_pages = set()
+        for page in schema["data"]["attributes"]["schema"]["pages"]:
+            page_id = page.get("id")
+            if page_id in seen_pages:
+                continue
+            seen_pages.add(page_id)
+            for question in page["questions"]:
+                key = (page_id, question.get("qid"))
+                if key in index:
+                    continue
+                options = {}
+                for option in question.get("options", []):
+                    options.setdefault(option.get("text"), option.get("tooltip"))
+                index[key] = {'nav': question.get("nav"), 'options': options}
+        return index
 
     def format_display_name(self, schema: dict, page_id: str, qid: str, value: Union[str, list, None] = None) -> dict:
         """ メタデータをフォーマットして返却するメソッドです。
@@ -77,29 +233,33 @@ class Metadata():
         Returns:
             dict: フォーマットされたメタデータの値
         """
-        pages = schema["data"]["attributes"]["schema"]["pages"]
+        return self.format_display_name_from_index(self.build_schema_index(schema), page_id, qid, value)
+
+    def format_display_name_from_index(
+        self, schema_index: dict[tuple[str, str], dict], page_id: str, qid: str, value: Union[str, list, None] = None
+    ) -> dict:
+        """ build_schema_indexで作成した索引を使ってメタデータをフォーマットして返却するメソッドです。
+
+        Args:
+            schema_index (dict[tuple[str, str], dict]): build_schema_indexで作成した索引
+            page_id (str): プロジェクトメタデータ("page1")、ファイルメタデータ("page2")
+            qid (str): メタデータのqid
+            value (str, list): メタデータに設定された値. Defaults to None.
+
+        Returns:
+            dict: フォーマットされたメタデータの値
+        """
         items = {}
-        for page in pages:
-            if page.get("id") != page_id:
-                continue
+        question = schema_index.get((page_id, qid))
+        if question is None:
+            return items
 
-            questions = page["questions"]
-            for question in questions:
-                if question.get("qid") != qid:
-                    continue
+        items['label_jp'] = question['nav']
+        if value is None:
+            return items
+        items['value'] = value
 
-                items['label_jp'] = question.get("nav")
-                if value is None:
-                    break
-                items['value'] = value
-
-                options = question.get("options", [])
-                for option in options:
-                    if option.get("text") != value:
-                        continue
-                    items['field_name_jp'] = option.get("tooltip")
-                    break
-                break
-            break
-
-        return items
\ No newline at end of file
+        # 選択肢のtextと比較できるのは文字列の値のみ
+        if isinstance(value, str) and value in question['options']:
+            items['field_name_jp'] = question['options'][value]
+        return items
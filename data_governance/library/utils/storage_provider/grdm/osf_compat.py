@@ -0,0 +1,77 @@
+""" osfclientの非公開の属性とメソッドを利用する処理をまとめたモジュールです。
+
+osfclient(RCOSDP/rdmclient)には、フォルダ直下の一覧を種類ごとに取得するAPIや、
+ファイルのダウンロード先のURLを取得するAPIが公開されていません。
+そのため非公開の属性とメソッドを参照する処理は全てこのモジュールに置き、他のモジュールからは直接参照しません。
+いずれも.binder/Dockerfileで固定したrdmclientのコミットの実装に依存するため、
+rdmclientを更新する際はこのモジュールの動作を確認してください。
+"""
+from typing import AsyncIterator
+
+from osfclient.models import File, Folder
+
+
+async def iter_folders(folder) -> AsyncIterator[Folder]:
+    """ ストレージまたはフォルダの直下のフォルダを順に返す非同期ジェネレータです。
+
+    Args:
+        folder (Union[Storage, Folder]): 一覧を取得するストレージまたはフォルダ
+
+    Yields:
+        Folder: 直下のフォルダ
+    """
+    async for child in folder._iter_children(folder._files_url, 'folder', Folder):
+        yield child
+
+
+async def iter_files(folder) -> AsyncIterator[File]:
+    """ ストレージまたはフォルダの直下のファイルを順に返す非同期ジェネレータです。
+
+    Args:
+        folder (Union[Storage, Folder]): 一覧を取得するストレージまたはフォルダ
+
+    Yields:
+        File: 直下のファイル
+    """
+    async for child in folder._iter_children(folder._files_url, 'file', File):
+        yield child
+
+
+def get_download_url(file_: File) -> str:
+    """ ファイルのダウンロード先のURLを取得する関数です。
+
+    Args:
+        file_ (File): ダウンロードするファイル
+
+    Returns:
+        str: ダウンロード先のURLを返す。
+    """
+    return file_._download_url
+
+
+def get_upload_url(file_: File) -> str:
+    """ ファイルのアップロード先のURLを取得する関数です。
+
+    Args:
+        file_ (File): アップロードするファイル
+
+    Returns:
+        str: アップロード先のURLを返す。
+    """
+    return file_._upload_url
+
+
+async def get(file_: File, url: str):
+    """ osfclientのセッションでGETリクエストを送る関数です。
+
+    Args:
+        file_ (File): セッションを持つファイル
+        url (str): リクエスト先のURL
+
+    Returns:
+        httpx.Response: レスポンスを返す。
+
+    Raises:
+        osfclient.exceptions.UnauthorizedException: 認証が通らない
+    """
+    return await file_._get(url)
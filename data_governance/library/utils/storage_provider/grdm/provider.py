@@ -0,0 +1,192 @@
+""" GRDMのプロジェクトのストレージを保存先とするストレージプロバイダのモジュールです。"""
+import datetime
+from typing import AsyncIterator, Callable, Optional
+
+from osfclient.models import File
+
+from ..base import TRANSFER_CONCURRENCY, StorageObject, StorageProvider
+from ..stats import TransferStats
+from .external import External
+
+
+class GrdmStorageProvider(StorageProvider):
+    """ GRDMのプロジェクトのストレージを保存先とするストレージプロバイダのクラスです。
+
+    パスはストレージ名を除いたストレージのルートからの相対パスで指定します。
+
+    Attributes:
+        instance:
+            token(str): GRDMのパーソナルアクセストークン
+            base_url(str): GRDMのURL
+            project_id(str): プロジェクトID
+            storage(str): ストレージ名
+            external(External): GRDMとの通信に用いるインスタンス
+    """
+
+    def __init__(
+        self, token: str, base_url: str, project_id: str, storage: str = 'osfstorage',
+        external: Optional[External] = None
+    ) -> None:
+        """ クラスのインスタンスの初期化処理を実行するメソッドです。
+
+        Args:
+            token (str): GRDMのパーソナルアクセストークン
+            base_url (str): GRDMのURL (e.g. https://rdm.nii.ac.jp)
+            project_id (str): プロジェクトID
+            storage (str): ストレージ名. Defaults to 'osfstorage'.
+            external (Optional[External]): GRDMとの通信に用いるインスタンス. Defaults to None.
+        """
+        self.token = token
+        self.base_url = base_url
+        self.project_id = project_id
+        self.storage = storage
+        self.external = External() if external is None else external
+
+    @property
+    def manifest_key(self) -> str:
+        """ 同期済みファイルのマニフェストで保存先を区別するキーを返すプロパティです。"""
+        return f"grdm:{self.base_url.rstrip('/')}/{self.project_id}/{self.storage}"
+
+    def _get_remote_path(self, path: str) -> str:
+        """ ストレージ名を含むリモートパスを取得するメソッドです。
+
+        Args:
+            path (str): ストレージのルートからの相対パス
+
+        Returns:
+            str: ストレージ名を含むリモートパスを返す。
+        """
+        return f"{self.storage}/{path.strip('/')}"
+
+    @staticmethod
+    def _build_object(file_: File) -> StorageObject:
+        """ GRDMのファイルからファイルの情報を取得するメソッドです。
+
+        Args:
+            file_ (File): GRDMのファイル
+
+        Returns:
+            StorageObject: ファイルの情報を返す。
+        """
+        modified = getattr(file_, 'date_modified', None)
+        if isinstance(modified, str):
+            try:
+                modified = datetime.datetime.fromisoformat(modified.replace('Z', '+00:00'))
+            except ValueError:
+                modified = None
+        return StorageObject(file_.path.strip('/'), getattr(file_, 'size', None), modified)
+
+    async def list_files(self, path: str = '') -> list[StorageObject]:
+        """ フォルダ配下のファイルを再帰的に取得するメソッドです。
+
+        Args:
+            path (str): フォルダの相対パス. Defaults to ''(ストレージのルート).
+
+        Returns:
+            list[StorageObject]: ファイルの情報のリストを返す。
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+        """
+        files = await self.external.list_files(self.token, self.base_url, self.project_id, path, self.storage)
+        return [self._build_object(file_) for file_ in files]
+
+    async def stat(self, path: str) -> StorageObject:
+        """ ファイルの情報を取得するメソッドです。
+
+        Args:
+            path (str): ファイルの相対パス
+
+        Returns:
+            StorageObject: ファイルの情報を返す。
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+            UnauthorizedError: 認証が通らない
+        """
+        file_ = await self.external.get_remote_file(
+            self.token, self.base_url, self.project_id, self._get_remote_path(path)
+        )
+        return self._build_object(file_)
+
+    async def get(self, path: str, local_path: str) -> int:
+        """ ファイルをローカルのパスにダウンロードするメソッドです。
+
+        Args:
+            path (str): ファイルの相対パス
+            local_path (str): 保存先のローカルパス
+
+        Returns:
+            int: ダウンロードしたファイルのサイズを返す。
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+            UnauthorizedError: 認証が通らない
+        """
+        return await self.external.download_to_file(
+            self.token, self.base_url, self.project_id, self._get_remote_path(path), local_path
+        )
+
+    async def put(self, local_path: str, path: str) -> None:
+        """ ローカルのファイルをアップロードするメソッドです。既にファイルが存在する場合は上書きします。
+
+        Args:
+            local_path (str): アップロードするローカルパス
+            path (str): アップロード先の相対パス
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+        """
+        await self.put_files([(local_path, path)], max_concurrency=1)
+
+    async def stream(self, path: str) -> AsyncIterator[bytes]:
+        """ ファイルの内容を先頭から順に少しずつ取得するメソッドです。
+
+        Args:
+            path (str): ファイルの相対パス
+
+        Yields:
+            bytes: ファイルの内容の一部
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+            UnauthorizedError: 認証が通らない
+        """
+        async for chunk in self.external.iter_download(
+            self.token, self.base_url, self.project_id, self._get_remote_path(path)
+        ):
+            yield chunk
+
+    async def put_files(
+        self, upload_files: list[tuple[str, str]], max_concurrency: int = TRANSFER_CONCURRENCY,
+        progress: Optional[Callable[[int, int], None]] = None,
+        on_complete: Optional[Callable[[str, str], None]] = None, stats: Optional[TransferStats] = None,
+        synced: Optional[dict[str, dict]] = None
+    ) -> None:
+        """ 複数のファイルをそれぞれの相対パスにアップロードするメソッドです。
+
+        フォルダの作成と一覧取得をディレクトリごとに1回にまとめるExternal.upload_filesで送信します。
+        syncedに記録があるファイルは、取得した一覧のハッシュ値が記録と一致する場合は送信しません。
+
+        Args:
+            upload_files (list[tuple[str, str]]): (ローカルパス, アップロード先の相対パス)のリスト
+            max_concurrency (int): 同時にアップロードするファイル数の上限. Defaults to TRANSFER_CONCURRENCY.
+            progress (Callable[[int, int], None]): ファイル1件のアップロード完了ごとに
+                (完了件数, 全件数)で呼び出される関数. Defaults to None.
+            on_complete (Callable[[str, str], None]): ファイル1件のアップロード完了ごとに
+                (ローカルパス, 相対パス)で呼び出される関数. Defaults to None.
+            stats (Optional[TransferStats]): 転送の計測値を記録するインスタンス. Defaults to None.
+            synced (Optional[dict[str, dict]]): 相対パスをキーとする前回の同期で記録したファイルの情報
+                (size、md5). Defaults to None.
+
+        Raises:
+            UnauthorizedError: 認証が通らない
+            RuntimeError: RDMClientから上がってくるエラー全般
+            ValueError: max_concurrencyが1未満
+        """
+        await self.external.upload_files(
+            token=self.token, base_url=self.base_url, project_id=self.project_id,
+            upload_files=upload_files, storage=self.storage, force=True,
+            max_concurrency=max_concurrency, progress=progress, on_complete=on_complete, stats=stats,
+            synced=synced
+        )
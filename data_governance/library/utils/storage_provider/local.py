@@ -0,0 +1,178 @@
+""" ローカルディレクトリを保存先とするストレージプロバイダのモジュールです。
+
+GRDMやAWS S3に接続せずに同期処理のスループットを計測したり、負荷試験を行うために利用します。
+ファイル操作はイベントループを止めないよう、別スレッドで実行します。
+"""
+import asyncio
+import datetime
+import os
+import shutil
+from typing import AsyncIterator
+
+from .base import StorageObject, StorageProvider
+
+
+# streamで一度に読み込むバイト数
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+class LocalStorageProvider(StorageProvider):
+    """ ローカルディレクトリを保存先とするストレージプロバイダのクラスです。
+
+    Attributes:
+        instance:
+            root_dir(str): 保存先のルートディレクトリの絶対パス
+    """
+
+    def __init__(self, root_dir: str) -> None:
+        """ クラスのインスタンスの初期化処理を実行するメソッドです。
+
+        Args:
+            root_dir (str): 保存先のルートディレクトリ
+        """
+        self.root_dir = os.path.abspath(root_dir)
+
+    @property
+    def manifest_key(self) -> str:
+        """ 同期済みファイルのマニフェストで保存先を区別するキーを返すプロパティです。"""
+        return f'local:{self.root_dir}'
+
+    def _get_abs_path(self, path: str) -> str:
+        """ 相対パスをルートディレクトリ配下の絶対パスに変換するメソッドです。
+
+        Args:
+            path (str): "/"区切りの相対パス
+
+        Returns:
+            str: 絶対パスを返す。
+
+        Raises:
+            ValueError: ルートディレクトリの外を指すパス
+        """
+        abs_path = os.path.normpath(os.path.join(self.root_dir, *path.strip('/').split('/')))
+        if os.path.commonpath([self.root_dir, abs_path]) != self.root_dir:
+            raise ValueError(f"The path '{path}' is outside of the root directory.")
+        return abs_path
+
+    def _build_object(self, abs_path: str) -> StorageObject:
+        """ ファイルの情報を取得するメソッドです。
+
+        Args:
+            abs_path (str): ファイルの絶対パス
+
+        Returns:
+            StorageObject: ファイルの情報を返す。
+        """
+        stat = os.stat(abs_path)
+        return StorageObject(
+            os.path.relpath(abs_path, self.root_dir).replace(os.sep, '/'),
+            stat.st_size,
+            datetime.datetime.fromtimestamp(stat.st_mtime, tz=datetime.timezone.utc)
+        )
+
+    async def list_files(self, path: str = '') -> list[StorageObject]:
+        """ ディレクトリ配下のファイルを再帰的に取得するメソッドです。
+
+        Args:
+            path (str): ディレクトリの相対パス. Defaults to ''(ルート).
+
+        Returns:
+            list[StorageObject]: ファイルの情報のリストを返す。
+        """
+        abs_dir = self._get_abs_path(path)
+
+        def walk() -> list[StorageObject]:
+            """ ディレクトリを走査する関数です。"""
+            return [
+                self._build_object(os.path.join(root, fname))
+                for root, _, files in os.walk(abs_dir)
+                for fname in sorted(files)
+            ]
+
+        return await asyncio.to_thread(walk)
+
+    async def stat(self, path: str) -> StorageObject:
+        """ ファイルの情報を取得するメソッドです。
+
+        Args:
+            path (str): ファイルの相対パス
+
+        Returns:
+            StorageObject: ファイルの情報を返す。
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+        """
+        abs_path = self._get_abs_path(path)
+        if not os.path.isfile(abs_path):
+            raise FileNotFoundError(f'The specified file (path: {path}) does not exist.')
+        return await asyncio.to_thread(self._build_object, abs_path)
+
+    @staticmethod
+    def _copy(src: str, dst: str) -> int:
+        """ ファイルを一時ファイルにコピーしてから置き換える関数です。
+
+        Args:
+            src (str): コピー元のパス
+            dst (str): コピー先のパス
+
+        Returns:
+            int: コピーしたファイルのサイズを返す。
+        """
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        part_path = f'{dst}.part'
+        shutil.copyfile(src, part_path)
+        os.replace(part_path, dst)
+        return os.path.getsize(dst)
+
+    async def get(self, path: str, local_path: str) -> int:
+        """ ファイルをローカルのパスにコピーするメソッドです。
+
+        Args:
+            path (str): ファイルの相対パス
+            local_path (str): 保存先のローカルパス
+
+        Returns:
+            int: コピーしたファイルのサイズを返す。
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+        """
+        abs_path = self._get_abs_path(path)
+        if not os.path.isfile(abs_path):
+            raise FileNotFoundError(f'The specified file (path: {path}) does not exist.')
+        return await asyncio.to_thread(self._copy, abs_path, os.path.abspath(local_path))
+
+    async def put(self, local_path: str, path: str) -> None:
+        """ ローカルのファイルをルートディレクトリ配下にコピーするメソッドです。既にファイルが存在する場合は上書きします。
+
+        Args:
+            local_path (str): コピーするローカルパス
+            path (str): コピー先の相対パス
+        """
+        await asyncio.to_thread(self._copy, local_path, self._get_abs_path(path))
+
+    async def stream(self, path: str) -> AsyncIterator[bytes]:
+        """ ファイルの内容を先頭から順に少しずつ取得するメソッドです。
+
+        Args:
+            path (str): ファイルの相対パス
+
+        Yields:
+            bytes: ファイルの内容の一部
+
+        Raises:
+            FileNotFoundError: 指定したファイルが存在しない
+        """
+        abs_path = self._get_abs_path(path)
+        if not os.path.isfile(abs_path):
+            raise FileNotFoundError(f'The specified file (path: {path}) does not exist.')
+        f = await asyncio.to_thread(open, abs_path, 'rb')
+        try:
+            while True:
+                chunk = await asyncio.to_thread(f.read, STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            f.close()
@@ -0,0 +1,143 @@
+""" ファイル転送の計測値を集計するモジュールです。
+
+転送したファイル数、バイト数、APIへのリクエスト数、再送回数とファイルごとの所要時間を記録し、
+保存処理が遅い場合にレイテンシ、帯域、ファイル数のいずれが原因かを判断するために利用します。
+
+計測中のインスタンスはコンテキスト変数で保持するため、転送処理の各メソッドに引数で渡す必要はありません。
+track()で計測を開始した処理と、その中で作成した非同期タスク、asyncio.to_threadで実行した処理に記録されます。
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import math
+import time
+from typing import Iterator, Optional
+
+
+class TransferStats:
+    """ ファイル転送の計測値を集計するクラスです。
+
+    リクエスト数はGRDMとの通信で共有するセッションとクライアントが実際に送信したリクエストの数で、
+    各レスポンスを受け取った時点で数えます。
+    osfclientが内部で送信するリクエストや、AWS S3へのリクエストは含みません。
+
+    Attributes:
+        instance:
+            files(int): 転送したファイル数
+            bytes(int): 転送したバイト数
+            requests(int): APIへのリクエスト数
+            retries(int): 再送した回数
+            latencies(list[float]): ファイルごとの転送の所要時間(秒)
+            _started(float): 計測を開始した時刻
+            _finished(Optional[float]): 計測を終了した時刻
+        class:
+            _current(ContextVar[Optional[TransferStats]]): 計測中のインスタンスを保持するコンテキスト変数
+    """
+
+    _current: ContextVar[Optional['TransferStats']] = ContextVar('transfer_stats', default=None)
+
+    def __init__(self) -> None:
+        """ クラスのインスタンスの初期化処理を実行するメソッドです。"""
+        self.files = 0
+        self.bytes = 0
+        self.requests = 0
+        self.retries = 0
+        self.latencies = []
+        self._started = time.monotonic()
+        self._finished = None
+
+    @classmethod
+    def current(cls) -> 'TransferStats':
+        """ 計測中のインスタンスを取得するメソッドです。
+
+        Returns:
+            TransferStats: 計測中のインスタンスを返す。計測中でない場合は、記録しても集計されない新しいインスタンスを返す。
+        """
+        stats = cls._current.get()
+        return TransferStats() if stats is None else stats
+
+    @classmethod
+    @contextmanager
+    def track(cls, stats: Optional['TransferStats']) -> Iterator[None]:
+        """ withブロックの中で指定したインスタンスに計測値を記録するコンテキストマネージャです。
+
+        statsがNoneの場合は、呼び出し元で計測中のインスタンスをそのまま利用します。
+
+        Args:
+            stats (Optional[TransferStats]): 計測値を記録するインスタンス
+        """
+        if stats is None:
+            yield
+            return
+        token = cls._current.set(stats)
+        try:
+            yield
+        finally:
+            cls._current.reset(token)
+
+    def add_request(self, count: int = 1) -> None:
+        """ APIへのリクエスト数を加算するメソッドです。
+
+        Args:
+            count (int): 加算するリクエスト数. Defaults to 1.
+        """
+        self.requests += count
+
+    def add_retry(self) -> None:
+        """ 再送した回数を加算するメソッドです。"""
+        self.retries += 1
+
+    def add_file(self, size: int, seconds: float) -> None:
+        """ 転送が完了したファイルを記録するメソッドです。
+
+        Args:
+            size (int): ファイルサイズ(バイト)
+            seconds (float): 転送の所要時間(秒)
+        """
+        self.files += 1
+        self.bytes += size
+        self.latencies.append(seconds)
+
+    def finish(self) -> None:
+        """ 計測を終了するメソッドです。"""
+        self._finished = time.monotonic()
+
+    @property
+    def seconds(self) -> float:
+        """ 計測を開始してからの経過秒数を返すプロパティです。"""
+        end = time.monotonic() if self._finished is None else self._finished
+        return end - self._started
+
+    @property
+    def bytes_per_second(self) -> float:
+        """ 1秒あたりの転送したバイト数を返すプロパティです。"""
+        seconds = self.seconds
+        if seconds <= 0:
+            return 0.0
+        return self.bytes / seconds
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """ ファイルごとの所要時間のパーセンタイル値を取得するメソッドです。
+
+        Args:
+            percent (float): パーセンタイル(0〜100)
+
+        Returns:
+            Optional[float]: 所要時間(秒)、ファイルが無い場合はNoneを返す。
+        """
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        # nearest-rank法
+        rank = max(math.ceil(percent / 100 * len(latencies)), 1)
+        return latencies[rank - 1]
+
+    def __str__(self) -> str:
+        """ 集計結果をログ出力用の文字列で返すメソッドです。"""
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        latency = '-' if p50 is None else f'p50 {p50:.2f} s, p95 {p95:.2f} s'
+        return (
+            f'{self.files} files, {self.bytes / 1024 / 1024:.1f} MiB, {self.seconds:.1f} s, '
+            f'{self.bytes_per_second / 1024 / 1024:.2f} MiB/s, '
+            f'{self.requests} requests, {self.retries} retries, latency {latency}'
+        )
@@ -0,0 +1,170 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.subflow.subflowモジュールのテストを行います。
+
+"""
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import nbformat
+
+from data_governance.library.subflow import subflow
+from data_governance.library.subflow.subflow import SubFlowManager
+
+
+def _task(task_id: str, name: str) -> dict:
+    """テスト用のタスクのステータスを作成する関数です。"""
+    return {
+        'id': task_id,
+        'name': name,
+        'is_multiple': False,
+        'is_required': False,
+        'completed_count': 0,
+        'dependent_task_ids': [],
+        'status': 'unexecuted',
+        'execution_environments': [],
+        'active': True,
+    }
+
+
+class SubFlowManagerTestCase(TestCase):
+    """SubFlowManagerクラスのテストで用いるサブフローを準備するクラスです。"""
+
+    def setUp(self):
+        """テスト用のサブフローのステータスファイルとタスクのノートブックを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.status_file = os.path.join(self.tmp_dir.name, 'status.json')
+        with open(self.status_file, 'w') as f:
+            json.dump({
+                'is_completed': False,
+                'order': {'sequence': ['RF000001'], 'whenever': ['RF000002']},
+                'tasks': [_task('RF000001', 'first_task'), _task('RF000002', 'second_task')],
+            }, f)
+        self.task_dir = os.path.join(self.tmp_dir.name, 'task')
+        os.makedirs(self.task_dir)
+        self.write_notebook('first_task', 'About:最初のタスク')
+        self.write_notebook('second_task', '次のタスク')
+
+    def write_notebook(self, name: str, title: str):
+        """見出しにタイトルを持つノートブックを作成するメソッドです。"""
+        nb = nbformat.v4.new_notebook()
+        nb.cells.append(nbformat.v4.new_markdown_cell(f'# {title}\n説明です。'))
+        nbformat.write(nb, os.path.join(self.task_dir, f'{name}.ipynb'))
+
+    def generate(self, svg_data: str = '<svg/>') -> str:
+        """Graphvizを実行せずにダイアグラムを生成するメソッドです。"""
+        manager = SubFlowManager(self.tmp_dir.name, self.status_file, self.task_dir)
+        with patch.object(subflow.DiagManager, 'generate_diagram', return_value=svg_data):
+            return manager.generate()
+
+
+
+class TestSubFlowManagerHeaderIndex(SubFlowManagerTestCase):
+    """data_governance.library.subflow.subflowモジュールのSubFlowManagerクラスのタスクタイトルの索引のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.subflow.test_subflow
+
+    def read_index(self) -> dict:
+        """索引ファイルを読み込むメソッドです。"""
+        with open(os.path.join(self.task_dir, 'task_header_index.json'), 'r') as f:
+            return json.load(f)
+
+    def test_parse_headers(self):
+        """タスクのタイトルとノートブックのパスを取得することをテストするメソッドです。"""
+        manager = SubFlowManager(self.tmp_dir.name, self.status_file, self.task_dir)
+        self.assertEqual(
+            ('最初のタスク', os.path.join(self.task_dir, 'first_task.ipynb')), manager.parse_headers('first_task')
+        )
+
+    def test_generate_saves_index_once(self):
+        """全てのタイトルを取得した後に索引ファイルを1度だけ書き込むことをテストするメソッドです。"""
+        with patch.object(subflow.file, 'save_cache_file', wraps=subflow.file.save_cache_file) as save:
+            self.generate()
+        index_paths = [call.args[0] for call in save.call_args_list if call.args[0].endswith('task_header_index.json')]
+        self.assertEqual(1, len(index_paths))
+        index = self.read_index()
+        self.assertEqual('最初のタスク', index['first_task.ipynb']['title'])
+        self.assertEqual('次のタスク', index['second_task.ipynb']['title'])
+
+    def test_generate_with_index(self):
+        """索引と更新日時が一致する場合はノートブックを読み込まず、索引も書き込まないことをテストするメソッドです。"""
+        self.generate()
+        with patch.object(subflow, 'read_notebook_title') as read_title, \
+                patch.object(SubFlowManager, '_save_header_index') as save_index:
+            self.generate()
+        read_title.assert_not_called()
+        save_index.assert_not_called()
+
+    def test_updated_notebook(self):
+        """更新日時が変わったノートブックのみを読み込み直すことをテストするメソッドです。"""
+        self.generate()
+        self.write_notebook('second_task', '変更したタスク')
+        nb_path = os.path.join(self.task_dir, 'second_task.ipynb')
+        stat = os.stat(nb_path)
+        os.utime(nb_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        with patch.object(subflow, 'read_notebook_title', wraps=subflow.read_notebook_title) as read_title:
+            self.generate()
+        read_title.assert_called_once_with(nb_path)
+        self.assertEqual('変更したタスク', self.read_index()['second_task.ipynb']['title'])
+
+    def test_removed_notebook(self):
+        """存在しなくなったノートブックの情報を索引から取り除くことをテストするメソッドです。"""
+        index = {'removed_task.ipynb': {'mtime': 0, 'title': '削除したタスク'}}
+        with open(os.path.join(self.task_dir, 'task_header_index.json'), 'w') as f:
+            json.dump(index, f)
+        self.generate()
+        self.assertEqual({'first_task.ipynb', 'second_task.ipynb'}, set(self.read_index()))
+
+
+class TestSubFlowManagerDiagramCache(SubFlowManagerTestCase):
+    """data_governance.library.subflow.subflowモジュールのSubFlowManagerクラスのダイアグラムのキャッシュのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.subflow.test_subflow
+
+    def generate_diagram_count(self) -> int:
+        """ダイアグラムを生成し、Graphvizでの描画を行った回数を返すメソッドです。"""
+        manager = SubFlowManager(self.tmp_dir.name, self.status_file, self.task_dir)
+        with patch.object(subflow.DiagManager, 'generate_diagram', return_value='<svg/>') as generate_diagram:
+            manager.generate()
+        return generate_diagram.call_count
+
+    def test_cached(self):
+        """ダイアグラムの内容が変わらない場合はキャッシュしたダイアグラムを返すことをテストするメソッドです。"""
+        self.assertEqual('<svg>1</svg>', self.generate('<svg>1</svg>'))
+        self.assertTrue(os.path.isfile(os.path.join(self.tmp_dir.name, 'diagram_cache.json')))
+        self.assertEqual('<svg>1</svg>', self.generate('<svg>2</svg>'))
+
+    def test_task_status_changed(self):
+        """タスクの状態が変わった場合はダイアグラムを生成し直すことをテストするメソッドです。"""
+        self.assertEqual(1, self.generate_diagram_count())
+        with open(self.status_file, 'r') as f:
+            status = json.load(f)
+        status['tasks'][0]['status'] = 'done'
+        with open(self.status_file, 'w') as f:
+            json.dump(status, f)
+        self.assertEqual(1, self.generate_diagram_count())
+        self.assertEqual(0, self.generate_diagram_count())
+
+    def test_title_changed(self):
+        """タスクのタイトルが変わった場合はダイアグラムを生成し直すことをテストするメソッドです。"""
+        self.assertEqual(1, self.generate_diagram_count())
+        self.write_notebook('first_task', '変更したタスク')
+        nb_path = os.path.join(self.task_dir, 'first_task.ipynb')
+        stat = os.stat(nb_path)
+        os.utime(nb_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(1, self.generate_diagram_count())
+
+    def test_style_changed(self):
+        """ダイアグラムの見た目の設定が変わった場合はダイアグラムを生成し直すことをテストするメソッドです。"""
+        self.assertEqual(1, self.generate_diagram_count())
+        with patch.object(subflow.DiagManager, 'rank_sep', '1.0'):
+            self.assertEqual(1, self.generate_diagram_count())
+
+    def test_broken_cache(self):
+        """キャッシュファイルが読み込めない場合はダイアグラムを生成し直すことをテストするメソッドです。"""
+        with open(os.path.join(self.tmp_dir.name, 'diagram_cache.json'), 'w') as f:
+            f.write('{')
+        self.assertEqual(1, self.generate_diagram_count())
+        self.assertEqual(0, self.generate_diagram_count())
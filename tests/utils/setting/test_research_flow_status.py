@@ -0,0 +1,295 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.utils.setting.research_flow_statusモジュールのテストを行います。
+
+"""
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from data_governance.library.utils.setting import research_flow_status
+from data_governance.library.utils.setting.research_flow_status import ResearchFlowStatusOperater
+# ライブラリ内では library パッケージとして読み込まれるため、送出される例外も同じパッケージから読み込む
+from library.utils.error import NotFoundSubflowDataError
+
+PLAN_ID = '00000000-0000-0000-0000-000000000000'
+
+
+def _sub_flow(sub_flow_id: str, name: str, data_dir: str, parent_ids: list[str]) -> dict:
+    """テスト用のサブフローデータを作成する関数です。"""
+    return {
+        'id': sub_flow_id,
+        'name': name,
+        'data_dir': data_dir,
+        'link': f'./{sub_flow_id}/menu.ipynb',
+        'parent_ids': parent_ids,
+        'create_datetime': 1700000000,
+    }
+
+
+class ResearchFlowStatusTestCase(TestCase):
+    """リサーチフローステータスのテストで用いるリサーチフローステータス管理JSONを準備するクラスです。"""
+
+    def setUp(self):
+        """テスト用のリサーチフローステータス管理JSONを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.abs_root = self.tmp_dir.name
+        os.makedirs(os.path.join(self.abs_root, 'data_governance', 'researchflow'))
+        os.makedirs(os.path.join(self.abs_root, 'data_governance', 'working'))
+        self.status_path = os.path.join(self.abs_root, 'data_governance', 'researchflow', 'research_flow_status.json')
+        self.write_status({
+            'research_flow_pahse_data': [
+                {'seq_number': 1, 'name': 'plan', 'sub_flow_data': [_sub_flow(PLAN_ID, '研究準備', '', [])]},
+                {'seq_number': 2, 'name': 'experiment', 'sub_flow_data': [
+                    _sub_flow('e1', '実験1', 'data1', [PLAN_ID]),
+                    _sub_flow('e2', '実験2', 'data2', [PLAN_ID]),
+                ]},
+                {'seq_number': 3, 'name': 'writing', 'sub_flow_data': [_sub_flow('w1', '論文1', 'paper1', ['e1'])]},
+            ]
+        })
+
+    def write_status(self, data: dict):
+        """リサーチフローステータス管理JSONを書き込むメソッドです。"""
+        with open(self.status_path, 'w') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def read_status(self) -> dict:
+        """リサーチフローステータス管理JSONを読み込むメソッドです。"""
+        with open(self.status_path, 'r') as f:
+            return json.load(f)
+
+    def touch_status(self):
+        """他のプロセスによる書き込みを模して、リサーチフローステータス管理JSONの更新日時を進めるメソッドです。"""
+        stat = os.stat(self.status_path)
+        os.utime(self.status_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestResearchFlowDiagramCache(ResearchFlowStatusTestCase):
+    """data_governance.library.utils.setting.research_flow_statusモジュールのリサーチフローイメージのキャッシュのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.setting.test_research_flow_status
+
+    def setUp(self):
+        """描画を模したFlowDrawerを設定するメソッドです。"""
+        super().setUp()
+        patcher = patch.object(research_flow_status, 'FlowDrawer')
+        self.flow_drawer = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.flow_drawer.return_value.draw.side_effect = lambda: f'<svg>{self.flow_drawer.call_count}</svg>'
+        self.cache_path = os.path.join(self.abs_root, 'data_governance', 'working', 'research_flow_diagram_cache.json')
+
+    def get_svg(self) -> str:
+        """リサーチフローイメージのSVGデータを取得するメソッドです。"""
+        return ResearchFlowStatusOperater(self.status_path).get_svg_of_research_flow_status()
+
+    def test_cached(self):
+        """リサーチフローステータス管理JSONが変わらない場合はキャッシュしたSVGデータを返すことをテストするメソッドです。"""
+        self.assertEqual('<svg>1</svg>', self.get_svg())
+        self.assertTrue(os.path.isfile(self.cache_path))
+        self.assertEqual('<svg>1</svg>', self.get_svg())
+        self.assertEqual(1, self.flow_drawer.call_count)
+
+    def test_update_file(self):
+        """リサーチフローステータス管理JSONを更新した場合はキャッシュを削除して描画し直すことをテストするメソッドです。"""
+        self.get_svg()
+        ResearchFlowStatusOperater(self.status_path).rename_sub_flow(2, 'e1', '実験1改', 'data1')
+        self.assertFalse(os.path.isfile(self.cache_path))
+        self.assertEqual('<svg>2</svg>', self.get_svg())
+
+    def test_status_file_changed(self):
+        """他のプロセスがリサーチフローステータス管理JSONを書き換えた場合は描画し直すことをテストするメソッドです。"""
+        self.get_svg()
+        status = self.read_status()
+        status['research_flow_pahse_data'][1]['sub_flow_data'].pop()
+        self.write_status(status)
+        self.assertEqual('<svg>2</svg>', self.get_svg())
+
+    def test_message_changed(self):
+        """フェーズの表示名を定義したmessage.iniが変わった場合は描画し直すことをテストするメソッドです。"""
+        self.get_svg()
+        message_ini_path = os.path.join(self.abs_root, 'message.ini')
+        shutil.copyfile(research_flow_status.msg_config.message_ini_path, message_ini_path)
+        with open(message_ini_path, 'a') as f:
+            f.write('\n# changed\n')
+        with patch.object(research_flow_status.msg_config, 'message_ini_path', message_ini_path):
+            self.assertEqual('<svg>2</svg>', self.get_svg())
+
+    def test_broken_cache(self):
+        """キャッシュファイルが読み込めない場合は描画し直すことをテストするメソッドです。"""
+        with open(self.cache_path, 'w') as f:
+            f.write('{')
+        self.assertEqual('<svg>1</svg>', self.get_svg())
+        self.assertEqual('<svg>1</svg>', self.get_svg())
+
+
+class TestResearchFlowStatusModel(ResearchFlowStatusTestCase):
+    """data_governance.library.utils.setting.research_flow_statusモジュールの読み込み済みの管理情報のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.setting.test_research_flow_status
+
+    def setUp(self):
+        """リサーチフローステータス管理JSONの読み込み回数を数えるメソッドです。"""
+        super().setUp()
+        load_from_json = research_flow_status.ResearchFlowStatus.load_from_json
+        patcher = patch.object(research_flow_status.ResearchFlowStatus, 'load_from_json', side_effect=load_from_json)
+        self.load_from_json = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_shared_model(self):
+        """ファイルが変わらない場合はインスタンスをまたいで管理情報を共有することをテストするメソッドです。"""
+        model = ResearchFlowStatusOperater(self.status_path).get_model()
+        self.assertIs(model, ResearchFlowStatusOperater(self.status_path).get_model())
+        self.assertEqual(['plan', 'experiment', 'writing'], ResearchFlowStatusOperater(self.status_path).get_subflow_phases())
+        self.assertEqual(1, self.load_from_json.call_count)
+
+    def test_reload_changed_file(self):
+        """他のプロセスがファイルを書き換えた場合は読み込み直すことをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        self.assertEqual('実験1', rf_status.get_flow_name(2, 'e1'))
+        status = self.read_status()
+        status['research_flow_pahse_data'][1]['sub_flow_data'][0]['name'] = '実験A'
+        self.write_status(status)
+        self.touch_status()
+        self.assertEqual('実験A', rf_status.get_flow_name(2, 'e1'))
+        self.assertEqual(2, self.load_from_json.call_count)
+
+    def test_write_through(self):
+        """更新した内容を読み込み済みの管理情報とし、ファイルを読み込み直さないことをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        rf_status.relink_sub_flow(3, 'w1', ['e2'])
+        self.assertEqual(['e2'], rf_status.get_parent_ids(3, 'w1'))
+        self.assertEqual(['e2'], self.read_status()['research_flow_pahse_data'][2]['sub_flow_data'][0]['parent_ids'])
+        self.assertEqual(1, self.load_from_json.call_count)
+
+    def test_load_research_flow_status_copy(self):
+        """取得したリサーチフローステータスを変更しても読み込み済みの管理情報が変わらないことをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        phases = rf_status.load_research_flow_status()
+        phases[1]._sub_flow_data[0]._name = '変更'
+        rf_status.update_display_object(rf_status.load_research_flow_status())
+        self.assertEqual('実験1', rf_status.get_flow_name(2, 'e1'))
+        self.assertEqual('experiment', rf_status.get_subflow_phase(2))
+
+    def test_getters(self):
+        """フェーズとサブフローデータを索引から取得することをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        self.assertEqual('writing', rf_status.get_subflow_phase(3))
+        self.assertEqual(('実験2', 'data2'), rf_status.get_flow_name_and_dir_name(2, 'e2'))
+        self.assertEqual('data1', rf_status.get_data_dir('experiment', 'e1'))
+        self.assertEqual([PLAN_ID], rf_status.get_parent_ids(2, 'e1'))
+        with self.assertRaises(Exception):
+            rf_status.get_subflow_phase(9)
+
+    def test_getters_with_other_phase(self):
+        """他のフェーズのサブフローIDを指定した場合はエラーとなることをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        with self.assertRaises(NotFoundSubflowDataError):
+            rf_status.get_data_dir('writing', 'e1')
+        with self.assertRaises(NotFoundSubflowDataError):
+            rf_status.get_flow_name(3, 'e1')
+
+    def test_is_unique(self):
+        """フェーズ内のサブフロー名とデータフォルダ名の重複を確認することをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        self.assertFalse(rf_status.is_unique_subflow_name(2, '実験1'))
+        self.assertTrue(rf_status.is_unique_subflow_name(3, '実験1'))
+        self.assertFalse(rf_status.is_unique_data_dir(2, 'data2'))
+        self.assertTrue(rf_status.is_unique_data_dir(2, 'data3'))
+        with self.assertRaises(Exception):
+            rf_status.is_unique_subflow_name(9, '実験1')
+        with self.assertRaises(Exception):
+            rf_status.is_unique_data_dir(9, 'data1')
+
+
+class TestResearchFlowStatusIndex(ResearchFlowStatusTestCase):
+    """data_governance.library.utils.setting.research_flow_statusモジュールのサブフローの索引のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.setting.test_research_flow_status
+
+    def assert_index(self, rf_status: ResearchFlowStatusOperater):
+        """更新後の索引がファイルから作り直した索引と一致することを確認するメソッドです。"""
+        model = rf_status.get_model()
+        loaded = research_flow_status.ResearchFlowStatusModel(
+            research_flow_status.ResearchFlowStatus.load_from_json(self.status_path)
+        )
+        self.assertEqual(set(loaded._sub_flow_by_id), set(model._sub_flow_by_id))
+        for seq_number in loaded._names:
+            self.assertEqual(+loaded._names[seq_number], +model._names[seq_number])
+            self.assertEqual(+loaded._data_dirs[seq_number], +model._data_dirs[seq_number])
+        self.assertEqual(
+            {parent_id: [sf._id for _, sf in children] for parent_id, children in loaded._children.items() if children},
+            {parent_id: [sf._id for _, sf in children] for parent_id, children in model._children.items() if children},
+        )
+
+    def test_create(self):
+        """サブフローの作成後に索引から参照できることをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        phase_name, sub_flow_id = rf_status.create_sub_flow(2, '実験3', 'data3', [PLAN_ID])
+        self.assertEqual('experiment', phase_name)
+        self.assertTrue(rf_status.exist_sub_flow_id(sub_flow_id))
+        self.assertEqual(['e1', 'e2', sub_flow_id], rf_status.get_subflow_ids('experiment'))
+        self.assertFalse(rf_status.is_unique_subflow_name(2, '実験3'))
+        self.assertFalse(rf_status.is_unique_data_dir(2, 'data3'))
+        self.assertEqual(
+            {'実験1': 'e1', '実験2': 'e2', '実験3': sub_flow_id}, rf_status.get_children_id_and_name(2, PLAN_ID)
+        )
+        self.assert_index(rf_status)
+
+    def test_delete(self):
+        """サブフローの削除後に索引から取り除かれることをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        rf_status.del_sub_flow_data_by_sub_flow_id('e1')
+        self.assertFalse(rf_status.exist_sub_flow_id('e1'))
+        self.assertEqual(['e2'], rf_status.get_subflow_ids('experiment'))
+        self.assertTrue(rf_status.is_unique_subflow_name(2, '実験1'))
+        self.assertTrue(rf_status.is_unique_data_dir(2, 'data1'))
+        self.assertEqual({'実験2': 'e2'}, rf_status.get_children_id_and_name(2, PLAN_ID))
+        with self.assertRaises(NotFoundSubflowDataError):
+            rf_status.del_sub_flow_data_by_sub_flow_id('e1')
+        self.assert_index(rf_status)
+
+    def test_rename(self):
+        """サブフロー名の変更後に名前の数が更新されることをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        rf_status.rename_sub_flow(2, 'e1', '実験2', 'data2')
+        self.assertTrue(rf_status.is_unique_subflow_name(2, '実験1'))
+        self.assertTrue(rf_status.is_unique_data_dir(2, 'data1'))
+        self.assertEqual(2, rf_status.get_model()._names[2]['実験2'])
+        self.assert_index(rf_status)
+        # 重複した名前の一方を削除しても、もう一方が残っている間は重複として扱う
+        rf_status.del_sub_flow_data_by_sub_flow_id('e2')
+        self.assertFalse(rf_status.is_unique_subflow_name(2, '実験2'))
+        self.assertFalse(rf_status.is_unique_data_dir(2, 'data2'))
+        self.assert_index(rf_status)
+
+    def test_relink(self):
+        """親サブフローの変更後に子サブフローの索引が更新されることをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        self.assertEqual({'論文1': 'w1'}, rf_status.get_children_id_and_name(3, 'e1'))
+        rf_status.relink_sub_flow(3, 'w1', ['e2'])
+        with self.assertRaises(NotFoundSubflowDataError):
+            rf_status.get_children_id_and_name(3, 'e1')
+        self.assertEqual({'論文1': 'w1'}, rf_status.get_children_id_and_name(3, 'e2'))
+        self.assert_index(rf_status)
+
+    def test_get_subflow_ids(self):
+        """フェーズ名からサブフローIDを取得することをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        self.assertEqual(['w1'], rf_status.get_subflow_ids('writing'))
+        self.assertEqual([], rf_status.get_subflow_ids('unknown'))
+
+    def test_exist_sub_flow_id_in_research_flow_status(self):
+        """指定したリサーチフローステータス管理情報からサブフローIDを確認することをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        phases = rf_status.load_research_flow_status()
+        phases[1]._sub_flow_data.pop(0)
+        self.assertFalse(rf_status.exist_sub_flow_id_in_research_flow_status(phases, 'e1'))
+        self.assertTrue(rf_status.exist_sub_flow_id_in_research_flow_status(phases, 'e2'))
+        self.assertTrue(rf_status.exist_sub_flow_id('e1'))
+
+    def test_issue_unique_sub_flow_id(self):
+        """既存のサブフローIDと重複した場合は発行し直すことをテストするメソッドです。"""
+        rf_status = ResearchFlowStatusOperater(self.status_path)
+        with patch.object(rf_status, 'issue_uuidv4', side_effect=['e1', 'w1', 'new']):
+            self.assertEqual('new', rf_status.issue_unique_sub_flow_id())
@@ -0,0 +1,153 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.utils.storage_provider.aws.manifestモジュールのテストを行います。
+
+"""
+from datetime import datetime, timezone
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from data_governance.library.utils.storage_provider.aws.manifest import MirrorManifest, get_manifest
+
+
+class TestMirrorManifest(TestCase):
+    """data_governance.library.utils.storage_provider.aws.manifestモジュールのMirrorManifestクラスのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.aws.test_manifest
+
+    def setUp(self):
+        """テスト用の一時ディレクトリとファイルを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.manifest_path = os.path.join(self.tmp_dir.name, 'working', 'manifest.json')
+        self.file_path = os.path.join(self.tmp_dir.name, 'a.txt')
+        self._write(b'abc', mtime_ns=1_000_000_000)
+        self.s3_object = {
+            'Key': 'dir/a.txt', 'ETag': '"etag1"', 'Size': 3,
+            'LastModified': datetime(2024, 1, 1, tzinfo=timezone.utc),
+        }
+
+    def tearDown(self):
+        """テスト用の一時ディレクトリを削除するメソッドです。"""
+        self.tmp_dir.cleanup()
+
+    def _write(self, content: bytes, mtime_ns: int = None):
+        """テスト用のファイルに書き込み、必要であれば更新日時を設定するメソッドです。"""
+        with open(self.file_path, 'wb') as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(self.file_path, ns=(mtime_ns, mtime_ns))
+
+    def test_new_object_is_not_up_to_date(self):
+        """記録の無いオブジェクトがダウンロード必要と判定されることをテストするメソッドです。"""
+        manifest = MirrorManifest(self.manifest_path)
+        self.assertFalse(manifest.is_up_to_date('bucket', self.s3_object, self.file_path))
+
+    def test_recorded_object_is_up_to_date(self):
+        """記録したオブジェクトとローカルファイルが変わらなければダウンロード不要と判定されることをテストするメソッドです。"""
+        manifest = MirrorManifest(self.manifest_path)
+        manifest.record('bucket', self.s3_object, self.file_path)
+        self.assertTrue(manifest.is_up_to_date('bucket', self.s3_object, self.file_path))
+
+    def test_changed_object(self):
+        """S3オブジェクトのETag、サイズ、最終更新日時、バケットのいずれかが変わるとダウンロード必要と判定されることをテストするメソッドです。"""
+        manifest = MirrorManifest(self.manifest_path)
+        manifest.record('bucket', self.s3_object, self.file_path)
+        changes = {
+            'ETag': '"etag2"',
+            'Size': 4,
+            'LastModified': datetime(2024, 1, 2, tzinfo=timezone.utc),
+        }
+        for key, value in changes.items():
+            with self.subTest(key=key):
+                s3_object = dict(self.s3_object, **{key: value})
+                self.assertFalse(manifest.is_up_to_date('bucket', s3_object, self.file_path))
+        self.assertFalse(manifest.is_up_to_date('other', self.s3_object, self.file_path))
+
+    def test_changed_local_file(self):
+        """ダウンロード後にローカルファイルが変更、削除されるとダウンロード必要と判定されることをテストするメソッドです。"""
+        manifest = MirrorManifest(self.manifest_path)
+        manifest.record('bucket', self.s3_object, self.file_path)
+
+        self._write(b'abc', mtime_ns=2_000_000_000)
+        self.assertFalse(manifest.is_up_to_date('bucket', self.s3_object, self.file_path))
+
+        os.remove(self.file_path)
+        self.assertFalse(manifest.is_up_to_date('bucket', self.s3_object, self.file_path))
+
+    def test_uploaded_file(self):
+        """アップロードしたファイルが、同じキーへのアップロードでのみ未変更と判定されることをテストするメソッドです。"""
+        manifest = MirrorManifest(self.manifest_path)
+        self.assertFalse(manifest.is_uploaded('bucket', 'dir/a.txt', self.file_path))
+        manifest.record_upload('bucket', self.s3_object, self.file_path)
+        self.assertTrue(manifest.is_uploaded('bucket', 'dir/a.txt', self.file_path))
+        self.assertFalse(manifest.is_uploaded('bucket', 'other/a.txt', self.file_path))
+        self.assertFalse(manifest.is_uploaded('other', 'dir/a.txt', self.file_path))
+
+        self._write(b'abcd', mtime_ns=2_000_000_000)
+        self.assertFalse(manifest.is_uploaded('bucket', 'dir/a.txt', self.file_path))
+
+    def test_upload_to_multiple_keys(self):
+        """同じファイルを複数のキーへアップロードしても、互いの記録とダウンロードの記録を上書きしないことをテストするメソッドです。"""
+        manifest = MirrorManifest(self.manifest_path)
+        manifest.record('bucket', self.s3_object, self.file_path)
+        manifest.record_upload('bucket', dict(self.s3_object, Key='copy1/a.txt'), self.file_path)
+        manifest.record_upload('bucket', dict(self.s3_object, Key='copy2/a.txt'), self.file_path)
+
+        self.assertTrue(manifest.is_up_to_date('bucket', self.s3_object, self.file_path))
+        self.assertTrue(manifest.is_uploaded('bucket', 'copy1/a.txt', self.file_path))
+        self.assertTrue(manifest.is_uploaded('bucket', 'copy2/a.txt', self.file_path))
+
+    def test_upload_from_other_file(self):
+        """同じキーへ別のファイルをアップロードする場合にアップロード必要と判定されることをテストするメソッドです。"""
+        other_path = os.path.join(self.tmp_dir.name, 'b.txt')
+        with open(other_path, 'wb') as f:
+            f.write(b'abc')
+        os.utime(other_path, ns=(1_000_000_000, 1_000_000_000))
+        manifest = MirrorManifest(self.manifest_path)
+        manifest.record_upload('bucket', self.s3_object, self.file_path)
+        self.assertFalse(manifest.is_uploaded('bucket', 'dir/a.txt', other_path))
+
+    def test_save_and_load(self):
+        """保存したマニフェストが読み込まれることをテストするメソッドです。"""
+        manifest = MirrorManifest(self.manifest_path)
+        manifest.record('bucket', self.s3_object, self.file_path)
+        manifest.record_upload('bucket', self.s3_object, self.file_path)
+        manifest.save()
+
+        self.assertFalse(os.path.exists(f'{self.manifest_path}.tmp'))
+        loaded = MirrorManifest(self.manifest_path)
+        self.assertTrue(loaded.is_up_to_date('bucket', self.s3_object, self.file_path))
+        self.assertTrue(loaded.is_uploaded('bucket', 'dir/a.txt', self.file_path))
+
+    def test_broken_manifest(self):
+        """読み込めない、または形式の異なるマニフェストファイルが空のマニフェストとして扱われることをテストするメソッドです。"""
+        os.makedirs(os.path.dirname(self.manifest_path))
+        contents = (
+            '{', '{"version": 1, "objects": {}}', '{"version": 2, "objects": [], "uploads": {}}',
+            '{"version": 2, "objects": {}}',
+        )
+        for content in contents:
+            with self.subTest(content=content):
+                with open(self.manifest_path, 'w') as f:
+                    f.write(content)
+                manifest = MirrorManifest(self.manifest_path)
+                self.assertFalse(manifest.is_up_to_date('bucket', self.s3_object, self.file_path))
+                manifest.record('bucket', self.s3_object, self.file_path)
+                self.assertTrue(manifest.is_up_to_date('bucket', self.s3_object, self.file_path))
+
+
+class TestGetManifest(TestCase):
+    """data_governance.library.utils.storage_provider.aws.manifestモジュールのget_manifest関数のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.aws.test_manifest
+
+    def test_manifest_path(self):
+        """指定したパス、または既定のパスのマニフェストを取得することをテストするメソッドです。"""
+        with tempfile.TemporaryDirectory() as home:
+            manifest_path = os.path.join(home, 'manifest.json')
+            self.assertEqual(manifest_path, get_manifest(manifest_path).manifest_path)
+
+            with patch('os.path.expanduser', return_value=home):
+                manifest = get_manifest()
+            self.assertTrue(manifest.manifest_path.startswith(home))
+            self.assertTrue(manifest.manifest_path.endswith('s3_mirror_manifest.json'))
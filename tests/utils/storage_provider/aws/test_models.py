@@ -0,0 +1,223 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.utils.storage_provider.aws.modelsモジュールのテストを行います。
+
+"""
+import base64
+from datetime import datetime, timezone
+import hashlib
+import os
+import tempfile
+from unittest import TestCase
+
+from boto3.s3.transfer import TransferConfig
+
+from data_governance.library.utils.storage_provider.aws.manifest import MirrorManifest
+from data_governance.library.utils.storage_provider.aws.models import (
+    download_dir, get_sha256_checksum, upload_and_verify, upload_file
+)
+# テスト対象のモジュールが送出する例外と同じクラスを用いるため、libraryから読み込む
+from library.utils.error import ChecksumMismatchError
+
+
+class FakeS3Client:
+    """テスト用にlist_objects_v2とdownload_fileのみを実装したS3クライアントのクラスです。"""
+
+    def __init__(self, objects: dict[str, bytes], page_size: int = 2):
+        """クラスのインスタンスの初期化処理を実行するメソッドです。"""
+        self.objects = objects
+        self.page_size = page_size
+        self.list_calls = 0
+        self.downloaded = []
+        self.checksums = {}
+
+    def list_objects_v2(self, Bucket, Prefix, ContinuationToken=None):
+        """オブジェクトの一覧をページ単位で返すメソッドです。"""
+        self.list_calls += 1
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        page = keys[start:start + self.page_size]
+        response = {}
+        if page:
+            response['Contents'] = [
+                {
+                    'Key': key, 'ETag': f'"{key}"', 'Size': len(self.objects[key]),
+                    'LastModified': datetime(2024, 1, 1, tzinfo=timezone.utc),
+                }
+                for key in page
+            ]
+        if start + self.page_size < len(keys):
+            response['NextContinuationToken'] = str(start + self.page_size)
+        return response
+
+    def download_file(self, Bucket, Key, Filename, Config=None):
+        """オブジェクトの内容をファイルに書き込むメソッドです。"""
+        self.downloaded.append(Key)
+        with open(Filename, 'wb') as f:
+            f.write(self.objects[Key])
+
+    def upload_file(self, Filename, Bucket, Key, ExtraArgs=None, Config=None):
+        """ファイルの内容をオブジェクトとして保持するメソッドです。"""
+        with open(Filename, 'rb') as f:
+            self.objects[Key] = f.read()
+        self.checksums[Key] = get_sha256_checksum(Filename, Config)
+
+    def head_object(self, Bucket, Key, ChecksumMode=None):
+        """オブジェクトのサイズとチェックサムを返すメソッドです。"""
+        return {
+            'ETag': f'"{Key}"', 'ContentLength': len(self.objects[Key]),
+            'LastModified': datetime(2024, 1, 1, tzinfo=timezone.utc), 'ChecksumSHA256': self.checksums[Key],
+        }
+
+
+class TestDownloadDir(TestCase):
+    """data_governance.library.utils.storage_provider.aws.modelsモジュールのdownload_dir関数のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.aws.test_models
+
+    def setUp(self):
+        """テスト用の一時ディレクトリとS3クライアントを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.local_dir = os.path.join(self.tmp_dir.name, 'data')
+        self.client = FakeS3Client({'dir/a.txt': b'a', 'dir/b.txt': b'bb', 'dir/sub/c.txt': b'ccc'})
+
+    def tearDown(self):
+        """テスト用の一時ディレクトリを削除するメソッドです。"""
+        self.tmp_dir.cleanup()
+
+    def test_download_to_new_dir(self):
+        """保存先のディレクトリが存在しない場合に、一覧を一度だけ取得して全てダウンロードすることをテストするメソッドです。"""
+        summary = download_dir(self.client, 'bucket', 'dir/', self.local_dir, max_workers=2)
+        self.assertEqual(3, summary.files)
+        self.assertEqual(6, summary.bytes)
+        self.assertEqual(2, self.client.list_calls)
+        with open(os.path.join(self.local_dir, 'sub', 'c.txt'), 'rb') as f:
+            self.assertEqual(b'ccc', f.read())
+
+    def test_download_to_existing_dir(self):
+        """保存先のディレクトリが存在する場合も、一覧を一度だけ取得してダウンロードすることをテストするメソッドです。"""
+        os.makedirs(self.local_dir)
+        summary = download_dir(self.client, 'bucket', 'dir/', self.local_dir, max_workers=2)
+        self.assertEqual(3, summary.files)
+        self.assertEqual(2, self.client.list_calls)
+
+    def test_existing_file(self):
+        """保存先にファイルが存在する場合に、ダウンロードせずにエラーとなることをテストするメソッドです。"""
+        os.makedirs(self.local_dir)
+        with open(os.path.join(self.local_dir, 'b.txt'), 'wb') as f:
+            f.write(b'local')
+        with self.assertRaises(FileExistsError):
+            download_dir(self.client, 'bucket', 'dir/', self.local_dir, max_workers=2)
+        self.assertEqual([], self.client.downloaded)
+
+    def test_mirror(self):
+        """ミラーリングで、前回のダウンロードから変更されたオブジェクトのみをダウンロードすることをテストするメソッドです。"""
+        manifest = MirrorManifest(os.path.join(self.tmp_dir.name, 'manifest.json'))
+        download_dir(self.client, 'bucket', 'dir/', self.local_dir, max_workers=2, manifest=manifest)
+
+        self.client.objects['dir/b.txt'] = b'changed'
+        self.client.downloaded = []
+        summary = download_dir(self.client, 'bucket', 'dir/', self.local_dir, max_workers=2, manifest=manifest)
+        self.assertEqual(['dir/b.txt'], self.client.downloaded)
+        self.assertEqual(1, summary.files)
+        self.assertEqual(2, summary.skipped)
+
+
+class TestGetSha256Checksum(TestCase):
+    """data_governance.library.utils.storage_provider.aws.modelsモジュールのget_sha256_checksum関数のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.aws.test_models
+
+    def setUp(self):
+        """テスト用の一時ディレクトリを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, 'a.bin')
+        self.chunksize = 5 * 1024 * 1024
+        self.transfer_config = TransferConfig(multipart_threshold=self.chunksize, multipart_chunksize=self.chunksize)
+
+    def tearDown(self):
+        """テスト用の一時ディレクトリを削除するメソッドです。"""
+        self.tmp_dir.cleanup()
+
+    def _write(self, content: bytes):
+        """テスト用のファイルに書き込むメソッドです。"""
+        with open(self.file_path, 'wb') as f:
+            f.write(content)
+
+    def test_single_part(self):
+        """マルチパートの閾値未満のファイルでは、ファイル全体のハッシュ値を返すことをテストするメソッドです。"""
+        content = b'abc' * 1000
+        self._write(content)
+        expected = base64.b64encode(hashlib.sha256(content).digest()).decode('ascii')
+        self.assertEqual(expected, get_sha256_checksum(self.file_path, self.transfer_config))
+
+    def test_multipart(self):
+        """マルチパートの閾値以上のファイルでは、パートごとのハッシュ値のハッシュ値にパート数を付けて返すことをテストするメソッドです。"""
+        content = os.urandom(self.chunksize * 2 + 1)
+        self._write(content)
+        parts = [
+            hashlib.sha256(content[start:start + self.chunksize]).digest()
+            for start in range(0, len(content), self.chunksize)
+        ]
+        expected = base64.b64encode(hashlib.sha256(b''.join(parts)).digest()).decode('ascii')
+        self.assertEqual(f'{expected}-3', get_sha256_checksum(self.file_path, self.transfer_config))
+
+
+class TestUpload(TestCase):
+    """data_governance.library.utils.storage_provider.aws.modelsモジュールのアップロードを行う関数のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.aws.test_models
+
+    def setUp(self):
+        """テスト用の一時ディレクトリ、ファイル、S3クライアントを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, 'a.txt')
+        with open(self.file_path, 'wb') as f:
+            f.write(b'abc')
+        self.client = FakeS3Client({})
+        self.transfer_config = TransferConfig()
+
+    def tearDown(self):
+        """テスト用の一時ディレクトリを削除するメソッドです。"""
+        self.tmp_dir.cleanup()
+
+    def test_upload_and_verify(self):
+        """チェックサムが一致する場合に、アップロードしたオブジェクトの情報を返すことをテストするメソッドです。"""
+        s3_object = upload_and_verify(self.client, 'bucket', self.file_path, 'dir/a.txt', self.transfer_config)
+        self.assertEqual('dir/a.txt', s3_object['Key'])
+        self.assertEqual(3, s3_object['Size'])
+
+    def test_checksum_mismatch(self):
+        """アップロードしたオブジェクトのチェックサムが一致しない場合にエラーとなることをテストするメソッドです。"""
+        head_object = self.client.head_object
+        self.client.head_object = lambda **kwargs: dict(head_object(**kwargs), ChecksumSHA256='invalid')
+        with self.assertRaises(ChecksumMismatchError):
+            upload_and_verify(self.client, 'bucket', self.file_path, 'dir/a.txt', self.transfer_config)
+
+    def test_size_mismatch(self):
+        """アップロードしたオブジェクトのサイズが一致しない場合にエラーとなることをテストするメソッドです。"""
+        head_object = self.client.head_object
+        self.client.head_object = lambda **kwargs: dict(head_object(**kwargs), ContentLength=2)
+        with self.assertRaises(ChecksumMismatchError):
+            upload_and_verify(self.client, 'bucket', self.file_path, 'dir/a.txt', self.transfer_config)
+
+    def test_without_checksum(self):
+        """チェックサムが返されない場合はサイズのみを確認することをテストするメソッドです。"""
+        head_object = self.client.head_object
+        self.client.head_object = lambda **kwargs: dict(head_object(**kwargs), ChecksumSHA256=None)
+        s3_object = upload_and_verify(self.client, 'bucket', self.file_path, 'dir/a.txt', self.transfer_config)
+        self.assertEqual(3, s3_object['Size'])
+
+    def test_upload_file_key(self):
+        """アップロード先のパスが"/"で終わるか空文字の場合に、ファイル名をキーに用いることをテストするメソッドです。"""
+        for aws_path, key in (('dir/b.txt', 'dir/b.txt'), ('dir/', 'dir/a.txt'), ('', 'a.txt')):
+            with self.subTest(aws_path=aws_path):
+                upload_file(self.client, 'bucket', self.file_path, aws_path, self.transfer_config)
+                self.assertIn(key, self.client.objects)
+
+    def test_incremental_upload(self):
+        """前回のアップロードから変更の無いファイルのアップロードを省略することをテストするメソッドです。"""
+        manifest = MirrorManifest(os.path.join(self.tmp_dir.name, 'manifest.json'))
+        summary = upload_file(self.client, 'bucket', self.file_path, 'dir/', self.transfer_config, manifest)
+        self.assertEqual(1, summary.files)
+        summary = upload_file(self.client, 'bucket', self.file_path, 'dir/', self.transfer_config, manifest)
+        self.assertEqual(1, summary.skipped)
+        summary = upload_file(self.client, 'bucket', self.file_path, 'other/', self.transfer_config, manifest)
+        self.assertEqual(1, summary.files)
@@ -0,0 +1,5 @@
+"""data_governance.library.utils.storage_provider.grdmモジュールのテストを行うモジュールのパッケージです。
+
+ユニットテストフレームワークを用いてテストを行うモジュールを集めたパッケージとなっています。
+
+"""
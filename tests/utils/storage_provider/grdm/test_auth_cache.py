@@ -0,0 +1,107 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.utils.storage_provider.grdm.auth_cacheモジュールのテストを行います。
+
+"""
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import tempfile
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from data_governance.library.utils.storage_provider.grdm import auth_cache
+from data_governance.library.utils.storage_provider.grdm.auth_cache import AuthCache, token_fingerprint
+
+
+class TestAuthCache(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.auth_cacheモジュールのAuthCacheクラスのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_auth_cache
+
+    def setUp(self):
+        """テスト用の一時ディレクトリを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, 'working', 'auth_cache.json')
+
+    def tearDown(self):
+        """テスト用の一時ディレクトリを削除するメソッドです。"""
+        self.tmp_dir.cleanup()
+
+    def test_add_and_is_valid(self):
+        """保持したチェック結果がトークン、URL、プロジェクトIDごとに判定されることをテストするメソッドです。"""
+        cache = AuthCache(60)
+        cache.add('permission', 'https://rdm.nii.ac.jp', 'token', 'abcde')
+        self.assertTrue(cache.is_valid('permission', 'https://rdm.nii.ac.jp', 'token', 'abcde'))
+        self.assertFalse(cache.is_valid('permission', 'https://rdm.nii.ac.jp', 'token', 'fghij'))
+        self.assertFalse(cache.is_valid('permission', 'https://rdm.nii.ac.jp', 'other', 'abcde'))
+        self.assertFalse(cache.is_valid('authorization', 'https://rdm.nii.ac.jp', 'token'))
+
+    def test_expired(self):
+        """有効期間を過ぎたチェック結果が無効と判定されることをテストするメソッドです。"""
+        cache = AuthCache(60)
+        now = time.time()
+        with patch('time.time', return_value=now):
+            cache.add('authorization', 'https://rdm.nii.ac.jp', 'token')
+        with patch('time.time', return_value=now + 59):
+            self.assertTrue(cache.is_valid('authorization', 'https://rdm.nii.ac.jp', 'token'))
+        with patch('time.time', return_value=now + 60):
+            self.assertFalse(cache.is_valid('authorization', 'https://rdm.nii.ac.jp', 'token'))
+
+    def test_ttl_zero(self):
+        """有効期間が0の場合にチェック結果を保持しないことをテストするメソッドです。"""
+        cache = AuthCache(0)
+        cache.add('authorization', 'https://rdm.nii.ac.jp', 'token')
+        self.assertFalse(cache.is_valid('authorization', 'https://rdm.nii.ac.jp', 'token'))
+
+    def test_invalidate(self):
+        """トークンに対するチェック結果のみが破棄されることをテストするメソッドです。
+
+        URLにポート番号の':'が含まれる場合もキーからトークンのハッシュ値を取り出せることを確認します。
+        """
+        cache = AuthCache(60)
+        base_url = 'https://rdm.example.com:8443'
+        cache.add('authorization', base_url, 'token')
+        cache.add('permission', base_url, 'token', 'abcde')
+        cache.add('permission', base_url, 'other', 'abcde')
+
+        cache.invalidate('token')
+        self.assertFalse(cache.is_valid('authorization', base_url, 'token'))
+        self.assertFalse(cache.is_valid('permission', base_url, 'token', 'abcde'))
+        self.assertTrue(cache.is_valid('permission', base_url, 'other', 'abcde'))
+
+    def test_persist(self):
+        """ファイルに保存したチェック結果がトークンを含まずに保存され、読み込まれることをテストするメソッドです。"""
+        cache = AuthCache(60, self.cache_path)
+        cache.add('permission', 'https://rdm.nii.ac.jp', 'secret-token', 'abcde')
+
+        with open(self.cache_path, 'r') as f:
+            data = json.load(f)
+        self.assertNotIn('secret-token', json.dumps(data))
+        self.assertEqual([f'permission:https://rdm.nii.ac.jp:{token_fingerprint("secret-token")}:abcde'], list(data))
+
+        loaded = AuthCache(60, self.cache_path)
+        self.assertTrue(loaded.is_valid('permission', 'https://rdm.nii.ac.jp', 'secret-token', 'abcde'))
+        loaded.invalidate('secret-token')
+        self.assertFalse(AuthCache(60, self.cache_path).is_valid(
+            'permission', 'https://rdm.nii.ac.jp', 'secret-token', 'abcde'
+        ))
+
+    def test_load_skips_expired_and_broken_entries(self):
+        """読み込み時に有効期限切れや不正な値のチェック結果を除くことをテストするメソッドです。"""
+        os.makedirs(os.path.dirname(self.cache_path))
+        with open(self.cache_path, 'w') as f:
+            json.dump({'a:b:c:': time.time() - 1, 'd:e:f:': 'x', 'g:h:i:': time.time() + 60}, f)
+        self.assertEqual(['g:h:i:'], list(AuthCache(60, self.cache_path)._entries))
+
+
+class TestGetAuthCache(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.auth_cacheモジュールのget_auth_cache関数のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_auth_cache
+
+    def test_shared_instance(self):
+        """複数のスレッドから同時に呼び出しても同じインスタンスが返されることをテストするメソッドです。"""
+        with patch.object(auth_cache, '_auth_cache', None):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                caches = list(executor.map(lambda _: auth_cache.get_auth_cache(), range(32)))
+        self.assertEqual(1, len({id(cache) for cache in caches}))
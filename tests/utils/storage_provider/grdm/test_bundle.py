@@ -0,0 +1,112 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.utils.storage_provider.grdm.bundleモジュールのテストを行います。
+
+"""
+import json
+import os
+import tempfile
+import zipfile
+from unittest import TestCase
+
+from data_governance.library.utils.storage_provider.grdm.bundle import (
+    BUNDLE_INDEX_NAME, BUNDLE_NAME, SyncBundle, split_pack_files
+)
+from data_governance.library.utils.storage_provider.grdm.manifest import SyncManifest
+
+
+class TestSyncBundle(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.bundleモジュールのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_bundle
+
+    def setUp(self):
+        """テスト用の一時ディレクトリとファイルを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.abs_root = self.tmp_dir.name
+        self.abs_source = os.path.join(self.abs_root, 'experiments', 'data')
+        self.work_dir = os.path.join(self.abs_root, 'working', 'bundle')
+        self.manifest = SyncManifest(os.path.join(self.abs_root, 'working', 'manifest.json'), 'proj')
+        self.small = self._write('small.txt', b'a')
+        self.nested = self._write(os.path.join('sub', 'nested.txt'), b'bb')
+        self.large = self._write('large.bin', b'c' * 100)
+
+    def tearDown(self):
+        """テスト用の一時ディレクトリを削除するメソッドです。"""
+        self.tmp_dir.cleanup()
+
+    def _write(self, name: str, content: bytes) -> str:
+        """同期元ディレクトリにファイルを作成するメソッドです。"""
+        path = os.path.join(self.abs_source, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def _bundle(self, local_paths: list[str]) -> SyncBundle:
+        """テスト用のアーカイブを作成するメソッドです。"""
+        return SyncBundle(self.abs_source, self.abs_root, local_paths, self.manifest, self.work_dir)
+
+    def test_split_pack_files(self):
+        """サイズの上限以下のファイルのみがアーカイブにまとめられることをテストするメソッドです。"""
+        packed, others = split_pack_files([self.small, self.nested, self.large], 2)
+        self.assertEqual([self.small, self.nested], packed)
+        self.assertEqual([self.large], others)
+
+        packed, others = split_pack_files([self.small, self.large], None)
+        self.assertEqual([], packed)
+        self.assertEqual([self.small, self.large], others)
+
+    def test_build(self):
+        """アーカイブと索引ファイルに収録したファイルが含まれることをテストするメソッドです。"""
+        bundle = self._bundle([self.small, self.nested])
+        self.assertTrue(bundle.is_changed())
+        upload_files = bundle.build()
+
+        remote_dir = os.path.join('experiments', 'data')
+        self.assertEqual(
+            [os.path.join(remote_dir, BUNDLE_NAME), os.path.join(remote_dir, BUNDLE_INDEX_NAME)],
+            [remote_path for _, remote_path in upload_files]
+        )
+        with zipfile.ZipFile(bundle.bundle_path) as zf:
+            self.assertEqual(b'bb', zf.read('sub/nested.txt'))
+        with open(bundle.index_path) as f:
+            index = json.load(f)
+        self.assertEqual({'small.txt', os.path.join('sub', 'nested.txt')}, set(index['files']))
+
+        bundle.cleanup()
+        self.assertFalse(os.path.exists(bundle.bundle_path))
+        self.assertFalse(os.path.exists(bundle.index_path))
+
+    def test_record_after_both_uploaded(self):
+        """アーカイブと索引ファイルの両方のアップロードが完了した時点で記録されることをテストするメソッドです。"""
+        bundle = self._bundle([self.small, self.nested])
+        bundle.is_changed()
+        (_, bundle_remote), (_, index_remote) = bundle.build()
+
+        bundle.on_uploaded(bundle_remote)
+        self.assertEqual([], self.manifest.get_rel_paths(''))
+        bundle.on_uploaded(index_remote)
+        self.assertEqual(
+            sorted([os.path.relpath(self.small, self.abs_root), os.path.relpath(self.nested, self.abs_root)]),
+            sorted(self.manifest.get_rel_paths(''))
+        )
+        self.assertFalse(self._bundle([self.small, self.nested]).is_changed())
+
+    def test_changed_when_file_removed(self):
+        """前回収録したファイルが無くなった場合に変更ありと判定され、記録から削除されることをテストするメソッドです。"""
+        bundle = self._bundle([self.small, self.nested])
+        bundle.is_changed()
+        bundle.record()
+
+        bundle = self._bundle([self.small])
+        self.assertTrue(bundle.is_changed())
+        bundle.record()
+        self.assertEqual([os.path.relpath(self.small, self.abs_root)], self.manifest.get_rel_paths(''))
+
+    def test_changed_when_not_incremental(self):
+        """incrementalがFalseの場合は常に変更ありと判定されることをテストするメソッドです。"""
+        bundle = self._bundle([self.small])
+        bundle.is_changed()
+        bundle.record()
+        self.assertFalse(self._bundle([self.small]).is_changed())
+        self.assertTrue(self._bundle([self.small]).is_changed(incremental=False))
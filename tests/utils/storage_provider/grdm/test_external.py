@@ -0,0 +1,356 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.utils.storage_provider.grdm.externalモジュールのテストを行います。
+
+"""
+import asyncio
+import inspect
+import os
+import tempfile
+import threading
+from types import SimpleNamespace
+from unittest import TestCase
+from urllib import parse
+
+import httpx
+
+from data_governance.library.utils.config import connect as con_config
+from data_governance.library.utils.storage_provider.base import TRANSFER_CONCURRENCY
+from data_governance.library.utils.storage_provider.grdm.external import External
+from data_governance.library.utils.storage_provider.grdm.manifest import file_md5
+from data_governance.library.utils.storage_provider.stats import TransferStats
+
+
+class PagedExternal(External):
+    """一覧取得APIのレスポンスを通信せずに返すテスト用のクラスです。"""
+
+    def __init__(self, pages: list[dict]) -> None:
+        """テスト用のレスポンスを設定するメソッドです。"""
+        super().__init__()
+        self.pages = pages
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def _get_json(self, api_url: str, token: str, is_project_api: bool = False) -> dict:
+        """URLのpageパラメータに対応するレスポンスを返すメソッドです。"""
+        query = dict(parse.parse_qsl(parse.urlparse(api_url).query))
+        with self._lock:
+            self.requested.append(query)
+        return self.pages[int(query.get('page', 1)) - 1]
+
+
+class TestExternalPaging(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.externalモジュールのExternalクラスのページ取得のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_external
+
+    def test_get_last_page(self):
+        """総件数、links.last、links.nextから総ページ数を求めることをテストするメソッドです。"""
+        self.assertEqual(3, External._get_last_page({'links': {'meta': {'total': 250, 'per_page': 100}}}))
+        self.assertEqual(1, External._get_last_page({'links': {'meta': {'total': 0, 'per_page': 100}}}))
+        self.assertEqual(2, External._get_last_page({'meta': {'total': 200, 'per_page': 100}}))
+        self.assertEqual(5, External._get_last_page({'links': {'last': 'https://api/v2/nodes/?page=5'}}))
+        self.assertIsNone(External._get_last_page({'links': {'next': 'https://api/v2/nodes/?page=2'}}))
+        self.assertEqual(1, External._get_last_page({'links': {'next': None}}))
+
+    def test_iter_pages_with_total(self):
+        """総ページ数が分かる場合に全ページを順番どおりに返すことをテストするメソッドです。"""
+        pages = [
+            {'data': [{'id': str(number)}], 'links': {'meta': {'total': 5, 'per_page': 1}}}
+            for number in range(1, 6)
+        ]
+        external = PagedExternal(pages)
+        data = list(external.iter_data('https://api.rdm.nii.ac.jp/v2/users/me/nodes/?filter[x]=y', 'token'))
+
+        self.assertEqual(['1', '2', '3', '4', '5'], [d['id'] for d in data])
+        self.assertEqual(5, len(external.requested))
+        for query in external.requested:
+            self.assertEqual('100', query['page[size]'])
+            self.assertEqual('y', query['filter[x]'])
+
+    def test_iter_pages_with_next(self):
+        """総ページ数が分からない場合にlinks.nextをたどることをテストするメソッドです。"""
+        pages = [
+            {'data': [{'id': '1'}], 'links': {'next': 'https://api.rdm.nii.ac.jp/v2/nodes/?page=2'}},
+            {'data': [{'id': '2'}], 'links': {'next': None}},
+        ]
+        external = PagedExternal(pages)
+        data = external._get_all('https://api.rdm.nii.ac.jp/v2/nodes/', 'token')
+        self.assertEqual({'data': [{'id': '1'}, {'id': '2'}]}, data)
+
+    def test_iter_pages_invalid_concurrency(self):
+        """先読みするページ数が1未満の場合にValueErrorを送出することをテストするメソッドです。"""
+        with self.assertRaises(ValueError):
+            next(PagedExternal([]).iter_pages('https://api.rdm.nii.ac.jp/v2/nodes/', 'token', max_concurrency=0))
+
+    def test_set_query(self):
+        """同名のクエリパラメータを置き換えることをテストするメソッドです。"""
+        url = External._set_query('https://api.rdm.nii.ac.jp/v2/nodes/?page=1&a=b', {'page': 3})
+        self.assertEqual({'page': '3', 'a': 'b'}, dict(parse.parse_qsl(parse.urlparse(url).query)))
+
+
+class RetryExternal(External):
+    """アップロードの結果を通信せずに返すテスト用のクラスです。"""
+
+    def __init__(self, errors: list) -> None:
+        """アップロードごとに送出する例外を設定するメソッドです。"""
+        super().__init__()
+        self.errors = errors
+        self.calls = 0
+
+    async def _upload_file(self, *args, **kwargs) -> None:
+        """設定された例外を順に送出し、例外が無くなれば成功するメソッドです。"""
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+
+
+class TestExternalUploadRetry(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.externalモジュールのExternalクラスの再送のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_external
+
+    @staticmethod
+    def _status_error(status_code: int) -> httpx.HTTPStatusError:
+        """ステータスコードを持つHTTPStatusErrorを作成するメソッドです。"""
+        request = httpx.Request('PUT', 'https://files.rdm.nii.ac.jp/')
+        response = httpx.Response(status_code, request=request)
+        return httpx.HTTPStatusError(str(status_code), request=request, response=response)
+
+    def _upload(self, external: External, retries: int = 3) -> None:
+        """待ち時間なしで再送付きのアップロードを実行するメソッドです。"""
+        asyncio.run(external._upload_file_with_retry(
+            'token', None, 'a.txt', 'a.txt', 'a.txt', False, False, retries=retries, backoff=0
+        ))
+
+    def test_retry_transient_errors(self):
+        """通信エラーとステータスコード500以上のエラーを再送することをテストするメソッドです。"""
+        external = RetryExternal([httpx.ConnectError('error'), self._status_error(503)])
+        self._upload(external)
+        self.assertEqual(3, external.calls)
+
+    def test_give_up_after_retries(self):
+        """再送回数の上限に達した場合は例外を送出することをテストするメソッドです。"""
+        external = RetryExternal([httpx.ReadTimeout('timeout') for _ in range(3)])
+        with self.assertRaises(httpx.ReadTimeout):
+            self._upload(external, retries=2)
+        self.assertEqual(3, external.calls)
+
+    def test_no_retry_for_other_errors(self):
+        """ステータスコード500未満のエラーやその他の例外は再送しないことをテストするメソッドです。"""
+        for error in (self._status_error(403), RuntimeError('error'), FileExistsError('a.txt')):
+            with self.subTest(error=error):
+                external = RetryExternal([error])
+                with self.assertRaises(type(error)):
+                    self._upload(external)
+                self.assertEqual(1, external.calls)
+
+
+class DownloadExternal(External):
+    """指定した内容をダウンロードするファイルとして返すテスト用のクラスです。"""
+
+    def __init__(self, content: bytes, size: int = None) -> None:
+        """ダウンロードする内容と、一覧が返すファイルサイズを設定するメソッドです。"""
+        super().__init__()
+        self.content = content
+        self.size = len(content) if size is None else size
+
+    async def get_remote_file(self, token, base_url, project_id, remote_path):
+        """GRDMに問い合わせずにファイルのオブジェクトを返すメソッドです。"""
+        if remote_path != 'dir/a.bin':
+            raise FileNotFoundError(remote_path)
+        return SimpleNamespace(path='/dir/a.bin', size=self.size, _download_url='https://files/download/dir/a.bin')
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        """設定した内容を返すクライアントを取得するメソッドです。"""
+        return httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=self.content)))
+
+
+class TestExternalDownload(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.externalモジュールのExternalクラスのdownloadのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_external
+
+    def _download(self, external: External, remote_path: str = 'dir/a.bin', **kwargs):
+        """ファイルの内容を取得するメソッドです。"""
+        return asyncio.run(external.download('token', 'https://rdm.nii.ac.jp', 'abcde', remote_path, **kwargs))
+
+    def test_download(self):
+        """ファイルの内容を取得し、存在しない場合はNoneを返すことをテストするメソッドです。"""
+        stats = TransferStats()
+        self.assertEqual(b'abc', self._download(DownloadExternal(b'abc'), stats=stats))
+        self.assertEqual(3, stats.bytes)
+        self.assertIsNone(self._download(DownloadExternal(b'abc'), 'missing.bin'))
+
+    def test_too_large_file(self):
+        """上限を超えるファイルはメモリに読み込まずにエラーとすることをテストするメソッドです。"""
+        with self.assertRaises(ValueError):
+            self._download(DownloadExternal(b'abcdef'), max_size=5)
+        # 一覧のサイズが実際より小さい場合も受信した内容で判定する
+        with self.assertRaises(ValueError):
+            self._download(DownloadExternal(b'abcdef', size=3), max_size=5)
+
+
+class TestExternalConcurrency(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.externalモジュールの同時実行数の既定値のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_external
+
+    def test_default_concurrency(self):
+        """アップロードの同時実行数の既定値がconnect.iniの値で、接続プールの大きさ以下であることをテストするメソッドです。"""
+        self.assertEqual(int(con_config.get('GRDM', 'UPLOAD_CONCURRENCY')), TRANSFER_CONCURRENCY)
+        self.assertLessEqual(TRANSFER_CONCURRENCY, int(con_config.get('GRDM', 'POOL_SIZE')))
+        for method in (External.upload, External.upload_files):
+            with self.subTest(method=method.__name__):
+                default = inspect.signature(method).parameters['max_concurrency'].default
+                self.assertEqual(TRANSFER_CONCURRENCY, default)
+
+
+class MockApiExternal(External):
+    """GRDMのファイル一覧APIとアップロード先を模したレスポンスを返すテスト用のクラスです。"""
+
+    def __init__(self, failures: int = 0, dir_files: list[dict] = None) -> None:
+        """ストレージ直下の一覧取得を失敗させる回数と、dirフォルダ直下のファイルを設定するメソッドです。"""
+        super().__init__()
+        self.failures = failures
+        self.dir_files = dir_files or []
+        self.requests = []
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        """模したレスポンスを返し、共有のクライアントと同様にレスポンスを数えるクライアントを取得するメソッドです。"""
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(self._handle), event_hooks={'response': [self._count_async_request]}
+        )
+
+    async def _retry(self, operation, retries=3, backoff=1.0):
+        """待ち時間なしで再実行するメソッドです。"""
+        return await super()._retry(operation, retries, 0)
+
+    @staticmethod
+    def _folder(name: str, path: str) -> dict:
+        """フォルダのデータを作成するメソッドです。"""
+        return {
+            'attributes': {'kind': 'folder', 'name': name, 'provider': 'osfstorage'},
+            'links': {'upload': f'https://files/upload{path}', 'new_folder': f'https://files/folder{path}'},
+            'relationships': {'files': {'links': {'related': {'href': f'https://api/list{path}'}}}},
+        }
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        """リクエストに対応するレスポンスを返すメソッドです。"""
+        request.read()
+        url = parse.urlparse(str(request.url))
+        name = dict(parse.parse_qsl(url.query)).get('name')
+        self.requests.append((request.method, url.path, name))
+        if url.path == '/v2/nodes/abcde/files/':
+            return httpx.Response(200, json={'data': [self._folder('osfstorage', '/')], 'links': {}})
+        if url.path == '/list/':
+            if self.failures > 0:
+                self.failures -= 1
+                return httpx.Response(503)
+            return httpx.Response(200, json={'data': [self._folder('dir', '/dir/')], 'links': {}})
+        if url.path == '/list/dir/':
+            return httpx.Response(200, json={'data': self.dir_files, 'links': {}})
+        if url.path.startswith('/folder'):
+            path = url.path[len('/folder'):] + name + '/'
+            return httpx.Response(201, json={'data': self._folder(name, path)})
+        if url.path.startswith('/upload'):
+            return httpx.Response(201)
+        return httpx.Response(404)
+
+
+class TestExternalUploadFiles(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.externalモジュールのExternalクラスのupload_filesのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_external
+
+    def setUp(self):
+        """テスト用の一時ファイルを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.upload_files = []
+        for name in ('dir/a.txt', 'dir/new/b.txt'):
+            local_path = os.path.join(self.tmp_dir.name, name)
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(local_path, 'wb') as f:
+                f.write(b'abc')
+            self.upload_files.append((local_path, name))
+
+    def tearDown(self):
+        """テスト用の一時ディレクトリを削除するメソッドです。"""
+        self.tmp_dir.cleanup()
+
+    def test_upload_files(self):
+        """既存のフォルダは一覧を取得し、存在しないフォルダは作成してからアップロードすることをテストするメソッドです。"""
+        external = MockApiExternal()
+        asyncio.run(external.upload_files('token', 'https://rdm.nii.ac.jp', 'abcde', self.upload_files))
+        self.assertEqual(
+            sorted([
+                ('GET', '/v2/nodes/abcde/files/', None), ('GET', '/list/', None), ('GET', '/list/dir/', None),
+                ('PUT', '/upload/dir/', 'a.txt'), ('PUT', '/folder/dir/', 'new'), ('PUT', '/upload/dir/new/', 'b.txt'),
+            ]),
+            sorted(external.requests)
+        )
+
+    def test_retry_folder_listing(self):
+        """フォルダの一覧取得が一時的なエラーで失敗した場合に再送することをテストするメソッドです。"""
+        external = MockApiExternal(failures=2)
+        asyncio.run(external.upload_files('token', 'https://rdm.nii.ac.jp', 'abcde', self.upload_files))
+        self.assertEqual(3, external.requests.count(('GET', '/list/', None)))
+        self.assertIn(('PUT', '/upload/dir/new/', 'b.txt'), external.requests)
+
+    def test_stats(self):
+        """実際に送信したリクエスト数と再送回数、送信したファイルを記録することをテストするメソッドです。"""
+        external = MockApiExternal(failures=1)
+        stats = TransferStats()
+        asyncio.run(external.upload_files(
+            'token', 'https://rdm.nii.ac.jp', 'abcde', self.upload_files, stats=stats
+        ))
+        self.assertEqual(len(external.requests), stats.requests)
+        self.assertEqual(1, stats.retries)
+        self.assertEqual(2, stats.files)
+        self.assertEqual(6, stats.bytes)
+
+    def test_stats_without_sending_same_file(self):
+        """リモートと同じ内容のため送信しなかったファイルを転送量に含めないことをテストするメソッドです。"""
+        local_path = self.upload_files[0][0]
+        remote_file = {
+            'attributes': {'kind': 'file', 'name': 'a.txt', 'extra': {'hashes': {'md5': file_md5(local_path)}}},
+            'links': {'upload': 'https://files/upload/dir/a.txt'},
+        }
+        external = MockApiExternal(dir_files=[remote_file])
+        stats = TransferStats()
+
+        async def upload():
+            """更新されたファイルのみを上書きするアップロードを実行する関数です。"""
+            with TransferStats.track(stats):
+                store = await external._get_storage('token', 'https://rdm.nii.ac.jp', 'abcde', 'osfstorage')
+                await external._upload_files_concurrently('token', store, self.upload_files, False, True, 2)
+
+        asyncio.run(upload())
+        self.assertNotIn(('PUT', '/upload/dir/a.txt', None), external.requests)
+        self.assertEqual(1, stats.files)
+        self.assertEqual(3, stats.bytes)
+
+    def _remote_file(self, md5: str) -> dict:
+        """dirフォルダ直下のa.txtのデータを作成するメソッドです。"""
+        return {
+            'attributes': {'kind': 'file', 'name': 'a.txt', 'size': 3, 'extra': {'hashes': {'md5': md5}}},
+            'links': {'upload': 'https://files/upload/dir/a.txt'},
+        }
+
+    def test_skip_synced_files(self):
+        """前回の同期の記録と一致するファイルは送信せず、GRDM上に無いファイルは送信し直すことをテストするメソッドです。"""
+        md5 = file_md5(self.upload_files[0][0])
+        external = MockApiExternal(dir_files=[self._remote_file(md5)])
+        synced = {name: {'size': 3, 'md5': md5} for _, name in self.upload_files}
+        completed = []
+        asyncio.run(external.upload_files(
+            'token', 'https://rdm.nii.ac.jp', 'abcde', self.upload_files,
+            on_complete=lambda local_path, name: completed.append(name), synced=synced
+        ))
+        self.assertNotIn(('PUT', '/upload/dir/a.txt', None), external.requests)
+        self.assertIn(('PUT', '/upload/dir/new/', 'b.txt'), external.requests)
+        self.assertEqual(['dir/a.txt', 'dir/new/b.txt'], sorted(completed))
+
+    def test_resend_replaced_file(self):
+        """GRDM上で置き換えられたファイルはforceを指定しなくても上書きすることをテストするメソッドです。"""
+        external = MockApiExternal(dir_files=[self._remote_file('0' * 32)])
+        synced = {'dir/a.txt': {'size': 3, 'md5': file_md5(self.upload_files[0][0])}}
+        asyncio.run(external.upload_files(
+            'token', 'https://rdm.nii.ac.jp', 'abcde', self.upload_files[:1], synced=synced
+        ))
+        self.assertIn(('PUT', '/upload/dir/a.txt', None), external.requests)
@@ -0,0 +1,122 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.utils.storage_provider.grdm.grdmモジュールのテストを行います。
+
+"""
+import asyncio
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from data_governance.library.utils.storage_provider.grdm.grdm import Grdm
+# ライブラリ内では library パッケージとして読み込まれるため、設定を置き換えるモジュールも同じパッケージから読み込む
+from library.utils.storage_provider import factory
+
+
+class TestGrdmRemoveNestedPaths(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.grdmモジュールのGrdmクラスの_remove_nested_pathsのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_grdm
+
+    def test_nested_paths(self):
+        """他のパスの配下にあるパスが除外されることをテストするメソッドです。"""
+        paths = ['/home/jovyan/a/b/c.txt', '/home/jovyan/a', '/home/jovyan/a/b', '/home/jovyan/x']
+        self.assertEqual(['/home/jovyan/a', '/home/jovyan/x'], Grdm._remove_nested_paths(paths))
+
+    def test_similar_prefix(self):
+        """名前の先頭が一致するだけのパスは除外されないことをテストするメソッドです。"""
+        paths = ['/home/jovyan/a/b-c', '/home/jovyan/a/b', '/home/jovyan/a/bc/d', '/home/jovyan/a/b/c']
+        self.assertEqual(
+            ['/home/jovyan/a/b', '/home/jovyan/a/b-c', '/home/jovyan/a/bc/d'], Grdm._remove_nested_paths(paths)
+        )
+
+    def test_duplicated_paths(self):
+        """正規化すると同じになるパスが1つにまとめられることをテストするメソッドです。"""
+        paths = ['/home/jovyan/a/', '/home/jovyan/a', '/home/jovyan/./a']
+        self.assertEqual(['/home/jovyan/a'], Grdm._remove_nested_paths(paths))
+
+    def test_empty(self):
+        """空のリストを渡した場合に空のリストを返すことをテストするメソッドです。"""
+        self.assertEqual([], Grdm._remove_nested_paths([]))
+
+
+class TestGrdmSyncProvider(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.grdmモジュールのGrdmクラスの同期先の切り替えのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_grdm
+
+    def setUp(self):
+        """テスト用のリサーチフローのファイルと同期先のディレクトリを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.abs_root = os.path.join(self.tmp_dir.name, 'home')
+        self.source_dir = os.path.join(self.abs_root, 'data_governance', 'researchflow')
+        os.makedirs(self.source_dir)
+        with open(os.path.join(self.source_dir, 'a.json'), 'w') as f:
+            json.dump({'name': 'a'}, f)
+        self.grdm = Grdm()
+
+    def _set_provider(self, kind: str, local_root: str = ''):
+        """connect.iniのSTORAGEセクションの値を置き換えるメソッドです。"""
+        config = {('STORAGE', 'PROVIDER'): kind, ('STORAGE', 'LOCAL_ROOT'): local_root}
+        patcher = patch.object(
+            factory.con_config, 'get', side_effect=lambda section, option: config[(section, option)]
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _sync(self):
+        """リサーチフローのディレクトリを同期するメソッドです。"""
+        asyncio.run(self.grdm.sync('token', 'https://rdm.example.com', 'abcde', self.source_dir, self.abs_root))
+
+    def test_switch_destination(self):
+        """同期先を切り替えた場合は前回の同期の記録を用いずに全てのファイルを送信することをテストするメソッドです。"""
+        first_root = os.path.join(self.tmp_dir.name, 'first')
+        second_root = os.path.join(self.tmp_dir.name, 'second')
+        remote_path = os.path.join('abcde', 'data_governance', 'researchflow', 'a.json')
+        self._set_provider(factory.PROVIDER_LOCAL, first_root)
+        self._sync()
+        self.assertTrue(os.path.isfile(os.path.join(first_root, remote_path)))
+
+        self._set_provider(factory.PROVIDER_LOCAL, second_root)
+        self._sync()
+        self.assertTrue(os.path.isfile(os.path.join(second_root, remote_path)))
+
+    def test_resend_deleted_file(self):
+        """同期先で削除または置き換えられたファイルのみを次回の同期で送信し直すことをテストするメソッドです。"""
+        storage_root = os.path.join(self.tmp_dir.name, 'storage')
+        remote_dir = os.path.join(storage_root, 'abcde', 'data_governance', 'researchflow')
+        with open(os.path.join(self.source_dir, 'b.json'), 'w') as f:
+            json.dump({'name': 'b'}, f)
+        self._set_provider(factory.PROVIDER_LOCAL, storage_root)
+        self._sync()
+
+        os.remove(os.path.join(remote_dir, 'a.json'))
+        with open(os.path.join(remote_dir, 'b.json'), 'w') as f:
+            f.write('{}')
+        self._sync()
+        for name in ('a.json', 'b.json'):
+            with open(os.path.join(remote_dir, name), 'r') as f:
+                self.assertEqual({'name': name[0]}, json.load(f))
+
+    def test_skip_synced_file(self):
+        """同期先に記録と一致するファイルが残っている場合は送信しないことをテストするメソッドです。"""
+        self._set_provider(factory.PROVIDER_LOCAL, os.path.join(self.tmp_dir.name, 'storage'))
+        self._sync()
+        provider = self.grdm.get_sync_provider('token', 'https://rdm.example.com', 'abcde')
+        with patch.object(type(provider), 'put') as put:
+            asyncio.run(self.grdm.sync(
+                'token', 'https://rdm.example.com', 'abcde', self.source_dir, self.abs_root, provider=provider
+            ))
+        put.assert_not_called()
+
+    def test_download_json_file(self):
+        """同期先からjsonファイルを取得することをテストするメソッドです。"""
+        self._set_provider(factory.PROVIDER_LOCAL, os.path.join(self.tmp_dir.name, 'storage'))
+        self._sync()
+        content = asyncio.run(self.grdm.download_json_file(
+            'token', 'https://rdm.example.com', 'abcde', 'data_governance/researchflow/a.json'
+        ))
+        self.assertEqual({'name': 'a'}, content)
+        with self.assertRaises(FileNotFoundError):
+            asyncio.run(self.grdm.download_json_file('token', 'https://rdm.example.com', 'abcde', 'missing.json'))
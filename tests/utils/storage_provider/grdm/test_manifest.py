@@ -0,0 +1,142 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.utils.storage_provider.grdm.manifestモジュールのテストを行います。
+
+"""
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from data_governance.library.utils.storage_provider.grdm.manifest import SyncManifest, file_md5
+
+
+class TestSyncManifest(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.manifestモジュールのSyncManifestクラスのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_manifest
+
+    def setUp(self):
+        """テスト用の一時ディレクトリとファイルを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.manifest_path = os.path.join(self.tmp_dir.name, 'working', 'manifest.json')
+        self.file_path = os.path.join(self.tmp_dir.name, 'a.txt')
+        self._write(b'abc')
+
+    def tearDown(self):
+        """テスト用の一時ディレクトリを削除するメソッドです。"""
+        self.tmp_dir.cleanup()
+
+    def _write(self, content: bytes, mtime_ns: int = None):
+        """テスト用のファイルに書き込み、必要であれば更新日時を設定するメソッドです。"""
+        with open(self.file_path, 'wb') as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(self.file_path, ns=(mtime_ns, mtime_ns))
+
+    def test_new_file_is_changed(self):
+        """記録の無いファイルが変更ありと判定されることをテストするメソッドです。"""
+        manifest = SyncManifest(self.manifest_path, 'proj')
+        entry = manifest.get_changed_entry(self.file_path, 'a.txt')
+        self.assertEqual(3, entry['size'])
+        self.assertEqual(file_md5(self.file_path), entry['md5'])
+
+    def test_unchanged_file(self):
+        """サイズと更新日時が一致するファイルが未変更と判定されることをテストするメソッドです。"""
+        manifest = SyncManifest(self.manifest_path, 'proj')
+        manifest.record('a.txt', manifest.get_changed_entry(self.file_path, 'a.txt'))
+        self.assertIsNone(manifest.get_changed_entry(self.file_path, 'a.txt'))
+
+    def test_touched_file_with_same_content(self):
+        """更新日時のみが変わったファイルが未変更と判定され、記録の更新日時が更新されることをテストするメソッドです。"""
+        self._write(b'abc', mtime_ns=1_000_000_000)
+        manifest = SyncManifest(self.manifest_path, 'proj')
+        manifest.record('a.txt', manifest.get_changed_entry(self.file_path, 'a.txt'))
+
+        self._write(b'abc', mtime_ns=2_000_000_000)
+        self.assertIsNone(manifest.get_changed_entry(self.file_path, 'a.txt'))
+        self.assertEqual(2_000_000_000, manifest.get_entry('a.txt')['mtime'])
+
+    def test_modified_file(self):
+        """内容が変わったファイルが変更ありと判定されることをテストするメソッドです。"""
+        self._write(b'abc', mtime_ns=1_000_000_000)
+        manifest = SyncManifest(self.manifest_path, 'proj')
+        manifest.record('a.txt', manifest.get_changed_entry(self.file_path, 'a.txt'))
+
+        self._write(b'abd', mtime_ns=2_000_000_000)
+        entry = manifest.get_changed_entry(self.file_path, 'a.txt')
+        self.assertIsNotNone(entry)
+        self.assertEqual(file_md5(self.file_path), entry['md5'])
+
+    def test_save_and_load(self):
+        """保存したマニフェストがプロジェクトごとに読み込まれることをテストするメソッドです。"""
+        manifest = SyncManifest(self.manifest_path, 'proj')
+        manifest.record('a.txt', manifest.get_changed_entry(self.file_path, 'a.txt'))
+        other = manifest.share('other')
+        other.record('b.txt', {'size': 0, 'mtime': 0, 'md5': ''})
+        manifest.save()
+
+        loaded = SyncManifest(self.manifest_path, 'proj')
+        self.assertIsNone(loaded.get_changed_entry(self.file_path, 'a.txt'))
+        self.assertIsNone(loaded.get_entry('b.txt'))
+        self.assertIsNotNone(SyncManifest(self.manifest_path, 'other').get_entry('b.txt'))
+
+    def test_broken_manifest(self):
+        """読み込めないマニフェストファイルが空のマニフェストとして扱われることをテストするメソッドです。"""
+        os.makedirs(os.path.dirname(self.manifest_path))
+        with open(self.manifest_path, 'w') as f:
+            f.write('{')
+        manifest = SyncManifest(self.manifest_path, 'proj')
+        self.assertEqual([], manifest.get_rel_paths(''))
+
+
+class TestSyncManifestJournal(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.manifestモジュールのSyncManifestクラスの途中保存のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_manifest
+
+    def setUp(self):
+        """テスト用の一時ディレクトリを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.manifest_path = os.path.join(self.tmp_dir.name, 'working', 'manifest.json')
+        self.entry = {'size': 1, 'mtime': 1, 'md5': 'x'}
+
+    def tearDown(self):
+        """テスト用の一時ディレクトリを削除するメソッドです。"""
+        self.tmp_dir.cleanup()
+
+    def test_record_flushes_after_interval(self):
+        """前回の書き込みからflush_interval秒以上経過した場合のみrecordで書き込むことをテストするメソッドです。"""
+        path = 'time.monotonic'
+        with patch(path, return_value=100.0):
+            manifest = SyncManifest(self.manifest_path, 'proj', flush_interval=5.0)
+            manifest.record('a.txt', self.entry)
+        self.assertFalse(os.path.exists(self.manifest_path))
+
+        with patch(path, return_value=105.0):
+            manifest.record('b.txt', self.entry)
+        self.assertEqual(['a.txt', 'b.txt'], sorted(SyncManifest(self.manifest_path, 'proj').get_rel_paths('')))
+
+        with patch(path, return_value=106.0):
+            manifest.record('c.txt', self.entry)
+        self.assertIsNone(SyncManifest(self.manifest_path, 'proj').get_entry('c.txt'))
+
+        with patch(path, return_value=110.0):
+            manifest.record('d.txt', self.entry)
+        self.assertEqual(
+            ['a.txt', 'b.txt', 'c.txt', 'd.txt'], sorted(SyncManifest(self.manifest_path, 'proj').get_rel_paths(''))
+        )
+
+    def test_record_without_interval(self):
+        """flush_intervalが0の場合は記録するたびに書き込むことをテストするメソッドです。"""
+        manifest = SyncManifest(self.manifest_path, 'proj', flush_interval=0)
+        manifest.record('a.txt', self.entry)
+        self.assertEqual(self.entry, SyncManifest(self.manifest_path, 'proj').get_entry('a.txt'))
+
+    def test_remove_and_rel_paths(self):
+        """ディレクトリ配下の記録の取得と削除をテストするメソッドです。"""
+        manifest = SyncManifest(self.manifest_path, 'proj')
+        for rel_path in ('a.txt', os.path.join('dir', 'b.txt'), os.path.join('dir2', 'c.txt')):
+            manifest.record(rel_path, self.entry)
+        self.assertEqual([os.path.join('dir', 'b.txt')], manifest.get_rel_paths('dir'))
+        manifest.remove(os.path.join('dir', 'b.txt'))
+        self.assertEqual([], manifest.get_rel_paths('dir'))
+        self.assertEqual(2, len(manifest.get_rel_paths(os.curdir)))
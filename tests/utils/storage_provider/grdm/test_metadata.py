@@ -0,0 +1,84 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.utils.storage_provider.grdm.metadataモジュールのテストを行います。
+
+"""
+from unittest import TestCase
+
+from data_governance.library.utils.storage_provider.grdm.metadata import Metadata
+
+
+def format_display_name_by_scan(schema: dict, page_id: str, qid: str, value=None) -> dict:
+    """索引を使わずにスキーマを走査してメタデータをフォーマットする、索引導入前の処理です。"""
+    items = {}
+    for page in schema["data"]["attributes"]["schema"]["pages"]:
+        if page.get("id") != page_id:
+            continue
+        for question in page["questions"]:
+            if question.get("qid") != qid:
+                continue
+            items['label_jp'] = question.get("nav")
+            if value is None:
+                break
+            items['value'] = value
+            for option in question.get("options", []):
+                if option.get("text") != value:
+                    continue
+                items['field_name_jp'] = option.get("tooltip")
+                break
+            break
+        break
+    return items
+
+
+SCHEMA = {'data': {'attributes': {'schema': {'pages': [
+    {'id': 'page1', 'questions': [
+        {'qid': 'funder', 'nav': '資金配分機関', 'options': [
+            {'text': 'JST', 'tooltip': '科学技術振興機構'},
+            {'text': 'AMED', 'tooltip': '日本医療研究開発機構'},
+            {'text': 'JST', 'tooltip': '重複した選択肢'},
+        ]},
+        {'qid': 'title', 'nav': 'タイトル'},
+        {'qid': 'funder', 'nav': '重複した質問'},
+    ]},
+    {'id': 'page2', 'questions': [
+        {'qid': 'grdm-files', 'nav': 'ファイル'},
+    ]},
+    {'id': 'page1', 'questions': [
+        {'qid': 'only-in-second-page1', 'nav': '重複したページ'},
+    ]},
+]}}}}
+
+
+class TestMetadataSchemaIndex(TestCase):
+    """data_governance.library.utils.storage_provider.grdm.metadataモジュールのスキーマの索引のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.grdm.test_metadata
+
+    def test_same_as_scan(self):
+        """索引を使ったフォーマットが索引導入前の走査と同じ結果になることをテストするメソッドです。"""
+        metadata = Metadata()
+        schema_index = metadata.build_schema_index(SCHEMA)
+        cases = [
+            ('page1', 'funder', 'JST'),
+            ('page1', 'funder', 'AMED'),
+            ('page1', 'funder', 'NONE'),
+            ('page1', 'funder', None),
+            ('page1', 'funder', ['JST']),
+            ('page1', 'title', 'abc'),
+            ('page1', 'unknown', 'abc'),
+            ('page1', 'only-in-second-page1', 'abc'),
+            ('page2', 'grdm-files', [{'path': 'a.txt'}]),
+            ('page3', 'funder', 'JST'),
+        ]
+        for page_id, qid, value in cases:
+            with self.subTest(page_id=page_id, qid=qid, value=value):
+                expected = format_display_name_by_scan(SCHEMA, page_id, qid, value)
+                self.assertEqual(expected, metadata.format_display_name_from_index(schema_index, page_id, qid, value))
+                self.assertEqual(expected, metadata.format_display_name(SCHEMA, page_id, qid, value))
+
+    def test_first_match_wins(self):
+        """質問や選択肢が重複する場合に先に現れたものを採用することをテストするメソッドです。"""
+        items = Metadata().format_display_name(SCHEMA, 'page1', 'funder', 'JST')
+        self.assertEqual(
+            {'label_jp': '資金配分機関', 'value': 'JST', 'field_name_jp': '科学技術振興機構'}, items
+        )
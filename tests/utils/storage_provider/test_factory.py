@@ -0,0 +1,77 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.utils.storage_provider.factoryモジュールのテストを行います。
+
+"""
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from data_governance.library.utils.storage_provider import factory
+from data_governance.library.utils.storage_provider.base import StorageProvider
+from data_governance.library.utils.storage_provider.local import LocalStorageProvider
+
+
+class TestStorageProvider(TestCase):
+    """data_governance.library.utils.storage_provider.baseモジュールのStorageProviderクラスのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.test_factory
+
+    def test_abstract(self):
+        """抽象メソッドを実装していないプロバイダを作成できないことをテストするメソッドです。"""
+        class PartialProvider(StorageProvider):
+            """list_filesのみを実装したプロバイダのクラスです。"""
+
+            async def list_files(self, path: str = ''):
+                """ファイルの一覧を返すメソッドです。"""
+                return []
+
+        with self.assertRaises(TypeError):
+            StorageProvider()
+        with self.assertRaises(TypeError):
+            PartialProvider()
+
+
+class TestGetSyncProvider(TestCase):
+    """data_governance.library.utils.storage_provider.factoryモジュールのget_sync_provider関数のテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.test_factory
+
+    def setUp(self):
+        """テスト用の一時ディレクトリを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """テスト用の一時ディレクトリを削除するメソッドです。"""
+        self.tmp_dir.cleanup()
+
+    def _get_sync_provider(self, kind: str) -> StorageProvider:
+        """connect.iniのSTORAGEセクションの値を置き換えてプロバイダを作成するメソッドです。"""
+        config = {('STORAGE', 'PROVIDER'): kind, ('STORAGE', 'LOCAL_ROOT'): self.tmp_dir.name}
+        with patch.object(factory.con_config, 'get', side_effect=lambda section, option: config[(section, option)]):
+            return factory.get_sync_provider('token', 'https://rdm.example.com', 'abcde')
+
+    def test_grdm(self):
+        """保存先がgrdmの場合にGRDMのプロジェクトを保存先とするプロバイダを作成することをテストするメソッドです。"""
+        provider = self._get_sync_provider(factory.PROVIDER_GRDM)
+        self.assertEqual('GrdmStorageProvider', type(provider).__name__)
+        self.assertEqual('abcde', provider.project_id)
+
+    def test_local(self):
+        """保存先がlocalの場合にプロジェクトIDごとのディレクトリを保存先とするプロバイダを作成することをテストするメソッドです。"""
+        provider = self._get_sync_provider(factory.PROVIDER_LOCAL)
+        self.assertIsInstance(provider, LocalStorageProvider)
+        self.assertEqual(os.path.join(self.tmp_dir.name, 'abcde'), provider.root_dir)
+
+    def test_unavailable(self):
+        """同期に利用できない保存先の種類の場合にエラーとなることをテストするメソッドです。"""
+        for kind in (factory.PROVIDER_S3, 'unknown'):
+            with self.subTest(kind=kind):
+                with self.assertRaises(ValueError):
+                    self._get_sync_provider(kind)
+
+    def test_manifest_key(self):
+        """同じプロジェクトIDでも保存先の種類ごとに異なるマニフェストのキーとなることをテストするメソッドです。"""
+        grdm_key = self._get_sync_provider(factory.PROVIDER_GRDM).manifest_key
+        local_key = self._get_sync_provider(factory.PROVIDER_LOCAL).manifest_key
+        self.assertEqual('grdm:https://rdm.example.com/abcde/osfstorage', grdm_key)
+        self.assertEqual(f"local:{os.path.join(self.tmp_dir.name, 'abcde')}", local_key)
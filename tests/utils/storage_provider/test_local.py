@@ -0,0 +1,68 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.utils.storage_provider.localモジュールのテストを行います。
+
+"""
+import asyncio
+import os
+import tempfile
+from unittest import TestCase
+
+from data_governance.library.utils.storage_provider.local import LocalStorageProvider
+
+
+class TestLocalStorageProvider(TestCase):
+    """data_governance.library.utils.storage_provider.localモジュールのLocalStorageProviderクラスのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.test_local
+
+    def setUp(self):
+        """テスト用の一時ディレクトリを作成するメソッドです。"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.src_dir = os.path.join(self.tmp_dir.name, 'src')
+        os.makedirs(os.path.join(self.src_dir, 'sub'))
+        for name, content in (('a.txt', b'a'), (os.path.join('sub', 'b.txt'), b'bb')):
+            with open(os.path.join(self.src_dir, name), 'wb') as f:
+                f.write(content)
+        self.provider = LocalStorageProvider(os.path.join(self.tmp_dir.name, 'remote'))
+
+    def tearDown(self):
+        """テスト用の一時ディレクトリを削除するメソッドです。"""
+        self.tmp_dir.cleanup()
+
+    def test_put_files_and_list(self):
+        """put_filesでアップロードしたファイルがlist_filesで取得できることをテストするメソッドです。"""
+        completed = []
+        upload_files = [
+            (os.path.join(self.src_dir, 'a.txt'), 'dir/a.txt'),
+            (os.path.join(self.src_dir, 'sub', 'b.txt'), 'dir/sub/b.txt'),
+        ]
+        asyncio.run(self.provider.put_files(
+            upload_files, max_concurrency=2, on_complete=lambda local, remote: completed.append(remote)
+        ))
+        self.assertEqual(['dir/a.txt', 'dir/sub/b.txt'], sorted(completed))
+
+        objects = asyncio.run(self.provider.list_files('dir'))
+        self.assertEqual({'dir/a.txt': 1, 'dir/sub/b.txt': 2}, {o.path: o.size for o in objects})
+
+    def test_get_and_stream(self):
+        """putしたファイルがgetとstreamで同じ内容として取得できることをテストするメソッドです。"""
+        asyncio.run(self.provider.put(os.path.join(self.src_dir, 'sub', 'b.txt'), 'b.txt'))
+        local_path = os.path.join(self.tmp_dir.name, 'download', 'b.txt')
+        self.assertEqual(2, asyncio.run(self.provider.get('b.txt', local_path)))
+        with open(local_path, 'rb') as f:
+            self.assertEqual(b'bb', f.read())
+
+        async def read_all():
+            return b''.join([chunk async for chunk in self.provider.stream('b.txt')])
+
+        self.assertEqual(b'bb', asyncio.run(read_all()))
+
+    def test_missing_file(self):
+        """存在しないファイルを指定した場合にFileNotFoundErrorとなることをテストするメソッドです。"""
+        with self.assertRaises(FileNotFoundError):
+            asyncio.run(self.provider.stat('missing.txt'))
+
+    def test_outside_root(self):
+        """ルートディレクトリの外を指すパスを指定した場合にValueErrorとなることをテストするメソッドです。"""
+        with self.assertRaises(ValueError):
+            asyncio.run(self.provider.put(os.path.join(self.src_dir, 'a.txt'), '../a.txt'))
@@ -0,0 +1,81 @@
+"""このモジュールはユニットテストフレームワークを用いてテストを行うモジュールです。
+
+data_governance.library.utils.storage_provider.statsモジュールのテストを行います。
+
+"""
+import asyncio
+from unittest import TestCase
+
+from data_governance.library.utils.storage_provider.stats import TransferStats
+
+
+class TestTransferStats(TestCase):
+    """data_governance.library.utils.storage_provider.statsモジュールのTransferStatsクラスのテストを行うクラスです。"""
+    # test exec : python -m unittest tests.utils.storage_provider.test_stats
+
+    def test_add(self):
+        """リクエスト数、再送回数、ファイルの記録が集計されることをテストするメソッドです。"""
+        stats = TransferStats()
+        stats.add_request()
+        stats.add_request(2)
+        stats.add_retry()
+        stats.add_file(100, 0.5)
+        stats.add_file(300, 1.5)
+        stats.finish()
+        self.assertEqual(3, stats.requests)
+        self.assertEqual(1, stats.retries)
+        self.assertEqual(2, stats.files)
+        self.assertEqual(400, stats.bytes)
+        seconds = stats.seconds
+        self.assertEqual(seconds, stats.seconds)
+
+    def test_percentile(self):
+        """ファイルごとの所要時間のパーセンタイル値をnearest-rank法で求めることをテストするメソッドです。"""
+        stats = TransferStats()
+        self.assertIsNone(stats.percentile(50))
+        for seconds in (0.4, 0.1, 0.3, 0.2):
+            stats.add_file(1, seconds)
+        self.assertEqual(0.2, stats.percentile(50))
+        self.assertEqual(0.4, stats.percentile(95))
+        self.assertEqual(0.1, stats.percentile(0))
+
+    def test_current_without_tracking(self):
+        """計測中でない場合は記録しても集計されないインスタンスを返すことをテストするメソッドです。"""
+        stats = TransferStats.current()
+        stats.add_request()
+        self.assertIsNot(stats, TransferStats.current())
+        self.assertEqual(0, TransferStats.current().requests)
+
+    def test_track(self):
+        """withブロックの中でのみ指定したインスタンスに記録し、Noneの場合は外側のインスタンスを利用することをテストするメソッドです。"""
+        outer = TransferStats()
+        inner = TransferStats()
+        with TransferStats.track(outer):
+            TransferStats.current().add_request()
+            with TransferStats.track(None):
+                TransferStats.current().add_request()
+            with TransferStats.track(inner):
+                TransferStats.current().add_request()
+            TransferStats.current().add_request()
+        TransferStats.current().add_request()
+        self.assertEqual(3, outer.requests)
+        self.assertEqual(1, inner.requests)
+
+    def test_track_in_tasks(self):
+        """計測中に作成した非同期タスクと別スレッドの処理に記録されることをテストするメソッドです。"""
+        stats = TransferStats()
+
+        async def transfer():
+            """並行して転送を記録する関数です。"""
+            TransferStats.current().add_file(1, 0.1)
+            await asyncio.to_thread(lambda: TransferStats.current().add_request())
+
+        async def main():
+            """計測を開始してタスクを作成する関数です。"""
+            with TransferStats.track(stats):
+                tasks = [asyncio.ensure_future(transfer()) for _ in range(3)]
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        self.assertEqual(3, stats.files)
+        self.assertEqual(3, stats.requests)